@@ -0,0 +1,157 @@
+# ======================================================================================================================================================
+
+# Command line for the 3 parts of the code for the article Manuel Verdú, Óscar Carchano & Jesús Ruiz (2025) Detecting, characterizing, and predicting
+# arbitrage opportunities in international rights issues, Research in International Business and Finance, 74, 102719.
+
+# ======================================================================================================================================================
+
+# Runs one part of the code only for some regions, countries, samples or models, and saves its table of results:
+#   python Verdu_Carchano_Ruiz_2025_CLI.py describe --countries ESP ITA --samples F 1 --output stats.csv
+#   python Verdu_Carchano_Ruiz_2025_CLI.py estimate --regions EUR --output models.json
+#   python Verdu_Carchano_Ruiz_2025_CLI.py estimate --countries ESP ITA --samples F 1 2 3
+#   python Verdu_Carchano_Ruiz_2025_CLI.py estimate --select orders.json
+#   python Verdu_Carchano_Ruiz_2025_CLI.py estimate --regions AFR ASI --bootstrap 999 --permutations 9999
+#   python Verdu_Carchano_Ruiz_2025_CLI.py estimate --regions EUR --bootstrap 999 --method pairs
+#   python Verdu_Carchano_Ruiz_2025_CLI.py estimate --regions EUR --rolling 100 --output rolling.csv
+#   python Verdu_Carchano_Ruiz_2025_CLI.py search --countries ESP --samples F --models LGT
+#   python Verdu_Carchano_Ruiz_2025_CLI.py search --countries ESP ITA --validate forward
+#   python Verdu_Carchano_Ruiz_2025_CLI.py search --countries PAK --engine path --alpha 0.5 --criterion deviance
+
+# Each part of the code (and statsmodels or scipy.stats) is only imported by the command that needs it.
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import os                               # Allows to know the number of available processors.
+import argparse                         # Allows to read the options of the command line.
+
+#################### START OF COMPLEMENTARY FUNCTIONS ####################
+
+def run_describe(DATA, ARGS):
+    """
+    Descriptive statistics and tests of the selected groups and samples (part 1). Without --regions and --countries
+    every group is described, with the total sample.
+    """
+
+    from Verdu_Carchano_Ruiz_2025_Code1 import describe
+
+    total = ARGS.regions is None and ARGS.countries is None
+
+    return describe(DATA, Regions = None if total else ARGS.regions or [], Countries = None if total else ARGS.countries or [],
+                    Samples = ARGS.samples, total = total, state = ARGS.state, workers = ARGS.workers, article_size = ARGS.article_size)
+
+def run_estimate(DATA, ARGS):
+    """
+    OLS, FGLS and FOGLS models of the selected regions (part 2), with their KW tests, and with the ARIMA orders of the
+    article or, with --select, those selected for each region. --bootstrap adds wild (or, with --method pairs, pairs)
+    bootstrap inference and --permutations the permutation KW tests. With --countries or --samples the models of every
+    selected country (or region) and sample are estimated at once, without the KW tests, with --rolling the OLS models
+    of every window of the regions, and with --state only their OLS models, updated from the offerings appended since
+    the last run.
+    """
+
+    import pandas as pd
+    from Verdu_Carchano_Ruiz_2025_Code2 import region_sample, estimate_region, region_table, estimate_groups, select_orders, bootstrap_region, permutation_region, rolling_table, update_accumulators, incremental_table, ORDERS
+    import Verdu_Carchano_Ruiz_2025_Monitor as Monitor
+
+    if ARGS.rolling is not None:
+        return rolling_table(DATA, ARGS.regions or list(ORDERS), window = ARGS.rolling or None)
+
+    if ARGS.state:
+        return incremental_table(update_accumulators(DATA, ARGS.regions or list(ORDERS), 'ARR ~ DIL + IDX + ISC + CAP', ARGS.state))
+
+    if ARGS.countries is not None or ARGS.samples is not None:
+        By, Codes = ('Country', ARGS.countries) if ARGS.countries is not None else ('Region', ARGS.regions)
+        return estimate_groups(DATA[DATA[By].isin(Codes)] if Codes else DATA, By = By, Samples = ARGS.samples or ['F'])
+
+    Regions = ARGS.regions or list(ORDERS)
+    SELECTED = select_orders(DATA, Regions, workers = ARGS.workers, path = ARGS.select) if ARGS.select else {}
+
+    TABLES = []
+
+    for Region in Regions:
+        with Monitor.capture(Region):
+            FITS = estimate_region(region_sample(DATA, Region), Order = ORDERS[Region], rho = SELECTED.get(Region, {}).get('rho'))
+        BOOT = bootstrap_region(FITS, n_bootstrap = ARGS.bootstrap, method = ARGS.method, key = Region, workers = ARGS.workers) if ARGS.bootstrap else None
+        PERM = permutation_region(FITS, n_permutations = ARGS.permutations, key = Region) if ARGS.permutations else None
+        TABLES.append(region_table(Region, FITS, BOOT, PERM))
+
+    return pd.concat(TABLES, ignore_index = True)
+
+def run_search(DATA, ARGS):
+    """
+    Best models of the selected countries, periods and links (part 3), fitting every subset of the terms or, with
+    --engine path, following their elastic-net path; or, with --validate, their in-sample and out-of-sample success,
+    with those of the models selected out of sample.
+    """
+
+    from Verdu_Carchano_Ruiz_2025_Code3 import search_models, validate_models
+
+    Options = {Name: Value for Name, Value in (('Samples', ARGS.samples), ('Models', ARGS.models)) if Value is not None}
+
+    if ARGS.validate:
+        return validate_models(DATA, Countries = ARGS.countries, mode = ARGS.validate, workers = ARGS.workers, **Options)
+
+    if ARGS.engine == 'path':
+        return search_models(DATA, Countries = ARGS.countries, engine = 'path', alpha = ARGS.alpha, criterion = ARGS.criterion, **Options)
+
+    return search_models(DATA, Countries = ARGS.countries, workers = ARGS.workers, cache = ARGS.cache, progress = True, **Options)
+
+def save(TABLE, path):
+    """
+    Saves a table of results as CSV, or as JSON lines if path ends with .json or .jsonl (prints it without a path).
+    """
+
+    if path is None:
+        print(TABLE.to_string(index = False))
+    elif path.endswith(('.json', '.jsonl')):
+        TABLE.to_json(path, orient = 'records', lines = True)
+    else:
+        TABLE.to_csv(path, index = False)
+
+COMMANDS = {'describe': run_describe, 'estimate': run_estimate, 'search': run_search}     # Part of the code run by each command.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
+
+#################### START OF THE CODE ####################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Selective runs of the code of the article.')
+    parser.add_argument('command', choices = list(COMMANDS), help = 'describe (part 1), estimate (part 2) or search (part 3).')
+    parser.add_argument('--data', default = 'Verdu_Carchano_Ruiz_2025_Data.csv', help = 'Data file.')
+    parser.add_argument('--regions', nargs = '+', help = 'Regions to describe or estimate (all by default).')
+    parser.add_argument('--countries', nargs = '+', help = 'Countries to describe, estimate or search (all by default).')
+    parser.add_argument('--samples', nargs = '+', help = 'Samples to describe (F, 1, 2, 3, DIL, nDIL, IDX, nIDX) or periods to search (F, 1, 2, 3).')
+    parser.add_argument('--models', nargs = '+', help = 'Links of the models to search (LGT, PRT).')
+    parser.add_argument('--output', default = None, help = 'File for the table of results (.csv, or .json for JSON lines); printed by default.')
+    parser.add_argument('--workers', type = int, default = os.cpu_count() or 1, help = 'Number of processes.')
+    parser.add_argument('--state', default = None, help = 'State file of the incremental mode of describe (or of the OLS models of estimate).')
+    parser.add_argument('--article-size', action = 'store_true', help = 'Bootstrap resamples of describe as large as the whole cell, as in the article.')
+    parser.add_argument('--select', default = None, help = 'JSON file of the ARIMA orders selected for each region by estimate (the orders of the article by default).')
+    parser.add_argument('--bootstrap', type = int, default = None, help = 'Number of bootstrap replicates of estimate (none by default).')
+    parser.add_argument('--method', default = 'wild', choices = ['wild', 'pairs'], help = 'Bootstrap of estimate: of the residuals (wild) or of the offerings (pairs).')
+    parser.add_argument('--permutations', type = int, default = None, help = 'Number of permutations of the KW tests of estimate (none by default).')
+    parser.add_argument('--validate', default = None, choices = ['kfold', 'forward'], help = 'Cross-validation of search (k folds or PER1 -> PER2 -> PER3).')
+    parser.add_argument('--engine', default = 'subsets', choices = ['subsets', 'path'], help = 'Selection of the models of search: every subset of the terms, or their elastic-net path.')
+    parser.add_argument('--alpha', type = float, default = 1.0, help = 'Mixing of the L1 (1) and L2 (0) penalties of --engine path.')
+    parser.add_argument('--criterion', default = 'suc_p', choices = ['suc_p', 'deviance'], help = 'Point of the path of --engine path: highest success on ARB, or lowest cross-validated deviance.')
+    parser.add_argument('--rolling', type = int, default = None, help = 'Offerings of each window of the rolling OLS models of estimate (0 for expanding windows).')
+    parser.add_argument('--cache', default = None, help = 'SQLite cache of the fitted models of search.')
+    parser.add_argument('--monitor', default = None, help = 'JSON lines file for the instrumentation of the run.')
+    ARGS = parser.parse_args()
+
+    import Verdu_Carchano_Ruiz_2025_Monitor as Monitor
+    from Verdu_Carchano_Ruiz_2025_Store import load_data
+
+    Monitor.enable(ARGS.monitor is not None)
+
+    DATA = load_data(ARGS.data)
+
+    save(COMMANDS[ARGS.command](DATA, ARGS), ARGS.output)
+
+    if ARGS.monitor:
+        Monitor.report(ARGS.monitor)
+
+#################### END OF THE CODE ####################
@@ -17,101 +17,659 @@
 #################### LIBRARIES TO USE ####################
 
 import warnings                         # Allows to ignore certain warnings and get a cleaner output.
+import os                               # Allows to know the number of available processors.
+import zlib                             # Allows to derive stable seeds from the cell keys.
+import json                             # Allows to save the state of the incremental mode.
+import argparse                         # Allows to read the options of the command line.
+
+from concurrent.futures import ProcessPoolExecutor  # Allows to run the cells in parallel processes.
+from multiprocessing import shared_memory           # Allows to share the partition index with the processes.
 
 import numpy as np                      # Allows to work with Series.
 import pandas as pd						# Allows to organize the Data.
 
-from scipy import stats                 # Allows to work with statistical tests and distributions
+
+from Verdu_Carchano_Ruiz_2025_Store import load_data, clean_mask, prefix_hash, REGIONS, COUNTRIES  # Allows to open the data through its typed cache.
+import Verdu_Carchano_Ruiz_2025_Monitor as Monitor                                  # Allows to time the stages and capture the warnings.
 
 warnings.filterwarnings('ignore')
 
 #################### START OF COMPLEMENTARY FUNCTIONS ####################
 
-def sample_description(DATA, S, Code):
+def partition_index(DATA):
     """
-    Runs the description of the sample and the tests.
+    Builds, in a single groupby pass, the row positions of every Region/Country x PER x DIL x IDX cell.
+    For each sample dimension the ARR/ARB columns are laid out once so that every cell is a contiguous slice.
     """
 
-    DATA = DATA[DATA['OUT'] == 0]
-    DATA = DATA[DATA['DIL'] != 0]
-    DATA = DATA[DATA['ISC'] != 0]
-    DATA = DATA[DATA['CAP'] != 0]
-    DATA = DATA.reset_index(drop = True)
+    with Monitor.stage('filter'):
 
-    ### Full Sample ###
-    if S == 'F':
+        DATA = DATA[clean_mask(DATA)]
 
-        OUT = len(DATA[DATA['OUT'] == 1])   # Obtain the number of outliers.
-        tst = calculate_stats(DATA)
-  
-        print(f'==================== {Code} - Full Sample ====================')
-        print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)  - Outliers: {OUT}')
-        print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
-        print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
-        print(f'Maximum: {tst["Maximum"]*100:.2f}% - Minimum: {tst["Minimum"]*100:.2f}% - Skewness: {tst["Skewness"]:.2f} - Kurtosis: {tst["Kurtosis"]:.2f}')
-        print()
+        # Label of every row in each sample dimension ('' when the row belongs to none of its samples).
 
-    ### Sample per Periods ###
+        KEYS = pd.DataFrame({
+            'Region': DATA['Region'].to_numpy(),
+            'Country': DATA['Country'].to_numpy(),
+            'PER': DATA['PER'].to_numpy(),
+            'DIL': np.select([DATA['DIL'] >= 0.5, DATA['DIL'] < 0.5], ['DIL', 'nDIL'], ''),
+            'IDX': np.select([DATA['IDX'] == 1, DATA['IDX'] == 0], ['IDX', 'nIDX'], '')
+            })
 
-    elif S == '1' or S == '2' or S == '3':
+        CELLS = KEYS.groupby(['Region', 'Country', 'PER', 'DIL', 'IDX'], dropna = False, sort = False).indices
 
-        tst = calculate_stats(DATA[DATA['PER'] == f'PER{S}'])
-        print(f'==================== {Code} - PER{S} ====================')
-        print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)')
-        print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
-        print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
-        print()
+        ARR = DATA['ARR'].to_numpy(dtype = float)
+        ARB = DATA['ARB'].to_numpy()
 
-    ### Dilutive Equity Offerings ###
-    
-    elif S  == 'DIL':
+        INDEX = {'ARR': {}, 'ARB': {}, 'Pos': {}, 'Spans': {}}
 
-        tst = calculate_stats(DATA[DATA['DIL'] >= 0.5])
-        print(f'==================== {Code} - DIL ====================')
-        print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)')
-        print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
-        print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
-        print()
+        for Dim, Pos in (('F', None), ('PER', 2), ('DIL', 3), ('IDX', 4)):
 
-    ### Non-Dilutive Equity Offerings ###
-    
-    elif S  == 'nDIL':
+            # Cells sorted by (sample, Region, Country), so each group of a given sample is a block of consecutive cells.
 
-        tst = calculate_stats(DATA[DATA['DIL'] < 0.5])
-        print(f'==================== {Code} - nDIL ====================')
-        print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)')
-        print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
-        print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
-        print()
+            label = (lambda key: 'F') if Pos is None else (lambda key, Pos=Pos: str(key[Pos]))
+            Keys = sorted(CELLS, key = lambda key: (label(key), str(key[0]), str(key[1])))
 
-    ### Companies listed in the main Stock Index of their country ###
-    
-    elif S  == 'IDX':
+            order = np.concatenate([CELLS[key] for key in Keys]) if Keys else np.empty(0, dtype = int)
+            INDEX['ARR'][Dim] = ARR[order]
+            INDEX['ARB'][Dim] = ARB[order]
+            INDEX['Pos'][Dim] = order
 
-        tst = calculate_stats(DATA[DATA['IDX'] == 1])
-        print(f'==================== {Code} - IDX ====================')
-        print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)')
-        print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
-        print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
-        print()
+            start = 0
+            for key in Keys:
+                stop = start + len(CELLS[key])
+                for Group in (('Total', 'Total'), ('Region', str(key[0])), ('Country', str(key[1]))):
+                    Spans = INDEX['Spans'].setdefault(Group + (Dim, label(key)), [])
+                    if Spans and Spans[-1][1] == start:
+                        Spans[-1] = (Spans[-1][0], stop)
+                    else:
+                        Spans.append((start, stop))
+                start = stop
 
-    ### Companies not listed in the main Stock Index of their country ###
-    
-    elif S  == 'nIDX':
+    return INDEX
+
+def index_cell(INDEX, Level, Code, S):
+    """
+    Returns the ARR and ARB values of a cell, and their row positions in the data,
+    as views of the partition index whenever the cell is contiguous.
+    """
+
+    Dim, Value = Sample_Cells[S]
+    Spans = INDEX['Spans'].get((Level, Code, Dim, Value), [])
+
+    if len(Spans) == 1:
+        start, stop = Spans[0]
+        return INDEX['ARR'][Dim][start:stop], INDEX['ARB'][Dim][start:stop], INDEX['Pos'][Dim][start:stop]
+
+    cell = np.concatenate([np.arange(start, stop) for start, stop in Spans]) if Spans else np.empty(0, dtype = int)
+    return INDEX['ARR'][Dim][cell], INDEX['ARB'][Dim][cell], INDEX['Pos'][Dim][cell]
+
+def outlier_counts(DATA, legacy = True):
+    """
+    Obtains the number of outliers of the total sample, of each region and of each country. With legacy = True they are
+    counted, as in the article, among the offerings left once the outliers are removed (so they are 0); otherwise they
+    are the offerings with OUT == 1.
+    """
+
+    OUT = DATA[DATA['OUT'] == 1] if not legacy else DATA.iloc[:0]
+
+    return {'Total': {'Total': len(OUT)}, 'Region': OUT['Region'].value_counts().to_dict(), 'Country': OUT['Country'].value_counts().to_dict()}
+
+def describe(DATA, Regions = None, Countries = None, Samples = None, total = True, state = None, workers = 1, **options):
+    """
+    Obtains the statistics of the cells of the given regions, countries and samples (all of them by default),
+    and of the total sample if total is True. Only the offerings of those groups are read, unless the cells are
+    updated incrementally from a state file (see update_grid). The options are those of describe_grid.
+    """
+
+    Regions = REGIONS if Regions is None else list(Regions)
+    Countries = COUNTRIES if Countries is None else list(Countries)
+    Samples = list(Sample_Cells) if Samples is None else list(Samples)
+
+    if state:
+        return update_grid(DATA, Regions, Countries, Samples, state, total = total, **options)
+
+    if not total:
+        DATA = DATA[DATA['Region'].isin(Regions) | DATA['Country'].isin(Countries)]
+
+    return describe_grid(DATA, Regions, Countries, Samples, total = total, workers = workers, **options)
+
+def describe_grid(DATA, Regions, Countries, Samples, n_bootstrap = 999, seed = 42, legacy = True, article_size = False, workers = 1, total = True):
+    """
+    Obtains the statistics of every (group x sample) cell in a tidy DataFrame (without the total sample if total is False).
+    With workers > 1 the cells run in a process pool that reads the partition index from shared memory.
+    """
+
+    INDEX = partition_index(DATA)
+
+    Groups = [('Total', 'Total')] * total + [('Region', Region) for Region in Regions] + [('Country', Country) for Country in Countries]
+    Outliers = outlier_counts(DATA, legacy)
+
+    Tasks = [(Level, Code, S, n_bootstrap, seed, legacy, article_size) for Level, Code in Groups for S in Samples]
+
+    if workers > 1:
 
-        tst = calculate_stats(DATA[DATA['IDX'] == 0])
-        print(f'==================== {Code} - nIDX ====================')
-        print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)')
-        print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
-        print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
-        print()
+        shm, Layout = share_index(INDEX)
 
-def calculate_stats(data):
+        try:
+            with ProcessPoolExecutor(max_workers = workers, initializer = init_worker, initargs = (shm.name, Layout, INDEX['Spans'], Monitor.ENABLED)) as pool:
+                OUTPUTS = list(pool.map(run_cell, Tasks, chunksize = max(1, len(Tasks) // (4 * workers))))
+        finally:
+            shm.close()
+            shm.unlink()
+
+        CELLS = [tst for tst, RECORDS in OUTPUTS]
+
+        for tst, RECORDS in OUTPUTS:
+            Monitor.merge(RECORDS)
+
+    else:
+        CELLS = [describe_cell(INDEX, *Task) for Task in Tasks]
+
+    STATS = [{'Level': Level, 'Code': Code, 'Sample': S, 'Outliers': Outliers[Level].get(Code, 0), **tst} for (Level, Code, S, *_), tst in zip(Tasks, CELLS)]
+
+    return pd.DataFrame(STATS)
+
+def describe_cell(INDEX, Level, Code, S, n_bootstrap = 999, seed = 42, legacy = True, article_size = False):
+    """
+    Obtains the statistics of one cell of the partition index.
+    The legacy mode uses seed in every cell, as the article does; otherwise the seed is derived from the cell key.
+    """
+
+    arr, arb, pos = index_cell(INDEX, Level, Code, S)
+
+    # The legacy bootstrap draws positions, so the cell is put back in the row order of the data.
+
+    if legacy:
+        arr = arr[np.argsort(pos)]
+    else:
+        seed = cell_seed(Level, Code, S, seed)
+
+    with Monitor.capture(f'{Level}|{Code}|{S}'):
+        return cell_stats(arr, arb, n_bootstrap = n_bootstrap, seed = seed, legacy = legacy, article_size = article_size)
+
+def cell_seed(Level, Code, S, seed = 42):
+    """
+    Derives a deterministic seed for a cell from its key, independent of the order in which the cells run.
+    """
+
+    Key = [zlib.crc32(str(Part).encode()) for Part in (Level, Code, S)]
+
+    return int(np.random.SeedSequence(seed, spawn_key = Key).generate_state(1)[0])
+
+def share_index(INDEX):
+    """
+    Copies the arrays of the partition index to a shared memory block.
+    Returns the block and the layout (array, dimension, dtype, shape, offset) needed to attach to it.
+    """
+
+    Arrays = [(Column, Dim, A) for Column in ('ARR', 'ARB', 'Pos') for Dim, A in INDEX[Column].items()]
+    Offsets = np.cumsum([0] + [-(-A.nbytes // 8) * 8 for *_, A in Arrays])     # 8-byte aligned offsets.
+
+    shm = shared_memory.SharedMemory(create = True, size = max(int(Offsets[-1]), 1))
+    Layout = []
+
+    for (Column, Dim, A), offset in zip(Arrays, Offsets):
+        np.ndarray(A.shape, dtype = A.dtype, buffer = shm.buf, offset = offset)[:] = A
+        Layout.append((Column, Dim, A.dtype.str, A.shape, int(offset)))
+
+    return shm, Layout
+
+def init_worker(name, Layout, Spans, monitor = False):
+    """
+    Attaches a worker process to the shared partition index (and enables its instrumentation if monitor is True).
+    """
+
+    global WORKER_INDEX
+
+    Monitor.enable(monitor)
+    Monitor.reset()     # The records inherited from the parent process are not sent back to it.
+
+    shm = shared_memory.SharedMemory(name = name)     # The parent process owns (and unlinks) the block.
+
+    WORKER_INDEX = {'ARR': {}, 'ARB': {}, 'Pos': {}, 'Spans': Spans, 'shm': shm}
+
+    for Column, Dim, dtype, shape, offset in Layout:
+        WORKER_INDEX[Column][Dim] = np.ndarray(shape, dtype = dtype, buffer = shm.buf, offset = offset)
+
+def run_cell(Task):
+    """
+    Obtains the statistics of one cell in a worker process, with the records of its instrumentation.
+    """
+
+    return describe_cell(WORKER_INDEX, *Task), Monitor.drain()
+
+def render_report(STATS):
+    """
+    Prints the description of the samples and the tests from the table of cell statistics.
+    """
+
+    for tst in STATS.to_dict('records'):
+
+        Code, S = tst['Code'], tst['Sample']
+        tst['N'], tst['ARB'] = int(tst['N']), (int(tst['ARB']) if tst['N'] > 0 else np.nan)
+
+        ### Full Sample ###
+
+        if S == 'F':
+
+            print(f'==================== {Code} - Full Sample ====================')
+            print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)  - Outliers: {tst["Outliers"]}')
+            print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
+            print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
+            print(f'Maximum: {tst["Maximum"]*100:.2f}% - Minimum: {tst["Minimum"]*100:.2f}% - Skewness: {tst["Skewness"]:.2f} - Kurtosis: {tst["Kurtosis"]:.2f}')
+            print()
+
+        ### Samples per Periods, (non-)Dilutive Equity Offerings and Companies (not) listed in the main Stock Index ###
+
+        else:
+
+            Name = f'PER{S}' if S in ('1', '2', '3') else S
+            print(f'==================== {Code} - {Name} ====================')
+            print(f'N: {tst["N"]} / ARB: {tst["ARB"]} ({(tst["R"]*100):.2f}%)')
+            print(f'Average: {tst["Mean"]*100:.2f}% ({tst["Std"]:.2f})% - t: {tst["T-test p-value"]:.4f} ({tst["Bootstrap CI Lower"]:.4f}, {tst["Bootstrap CI Upper"]:.4f})')
+            print(f'Median: {tst["Median"]*100:.2f}% - W: {tst["Wilcoxon p-value"]:.4f}')
+            print()
+
+def update_grid(DATA, Regions, Countries, Samples, path, n_bootstrap = 999, seed = 42, legacy = True, article_size = False, refresh = True, total = True):
+    """
+    Obtains the table of describe_grid incrementally, from the state of the cells saved in path (a JSON file).
+    Only the offerings appended to DATA since the last update are read: their moments are merged into the cells they
+    belong to, which become dirty. The state keeps every cell (total sample, every region and country, every sample),
+    whatever the selection, so that any later selection is served from it. The median, the Wilcoxon test and the
+    bootstrap CI are recomputed from DATA only for the dirty cells of the selection (and only if refresh is True;
+    otherwise they are left missing until the next refresh), and the other dirty cells wait for a selection with them.
+    The state is rebuilt from scratch if the offerings already ingested, or the bootstrap options, have changed.
+    """
+
+    Groups = [('Total', 'Total')] * total + [('Region', Region) for Region in Regions] + [('Country', Country) for Country in Countries]
+    Selected = {f'{Level}|{Code}|{S}' for Level, Code in Groups for S in Samples}
+    Options = [n_bootstrap, seed, legacy, article_size]
+
+    STATE = {'rows': 0, 'hash': prefix_hash(DATA, 0), 'options': Options, 'outliers': {}, 'cells': {}, 'lazy': {}, 'dirty': []}
+
+    if os.path.exists(path):
+        with open(path) as file:
+            SAVED = json.load(file)
+        if SAVED['rows'] <= len(DATA) and SAVED['hash'] == prefix_hash(DATA, SAVED['rows']) and SAVED['options'] == Options:
+            STATE = SAVED
+
+    Dirty = set(STATE['dirty'])
+
+    # The new offerings are merged into the state of their cells.
+
+    NEW = DATA.iloc[STATE['rows']:]
+
+    if len(NEW):
+
+        INDEX = partition_index(NEW)
+        Outliers = outlier_counts(NEW, legacy)
+
+        Present = [('Total', 'Total')] + [('Region', Region) for Region in NEW['Region'].dropna().unique()] + [('Country', Country) for Country in NEW['Country'].dropna().unique()]
+
+        for Level, Code in Present:
+
+            STATE['outliers'][f'{Level}|{Code}'] = STATE['outliers'].get(f'{Level}|{Code}', 0) + int(Outliers[Level].get(Code, 0))
+
+            for S in Sample_Cells:
+
+                arr, arb, pos = index_cell(INDEX, Level, Code, S)
+
+                if len(arr):
+                    key = f'{Level}|{Code}|{S}'
+                    STATE['cells'][key] = merge_moments(STATE['cells'].get(key, cell_moments(arr[:0], arb[:0])), cell_moments(arr, arb))
+                    Dirty.add(key)
+
+        STATE['rows'], STATE['hash'] = len(DATA), prefix_hash(DATA, len(DATA))
+
+    # The order statistics and the bootstrap are only recomputed for the dirty cells of the selection.
+
+    if refresh and Dirty & Selected:
+
+        INDEX = partition_index(DATA)
+
+        for key in sorted(Dirty & Selected):
+            tst = describe_cell(INDEX, *key.split('|'), n_bootstrap = n_bootstrap, seed = seed, legacy = legacy, article_size = article_size)
+            STATE['lazy'][key] = {Name: float(tst[Name]) for Name in LAZY_STATS}
+
+        Dirty -= Selected
+
+    STATE['dirty'] = sorted(Dirty)
+
+    with open(path, 'w') as file:
+        json.dump(STATE, file)
+
+    STATS = []
+
+    for Level, Code in Groups:
+        for S in Samples:
+            key = f'{Level}|{Code}|{S}'
+            MOMENTS = moment_stats(STATE['cells'][key]) if key in STATE['cells'] else moment_stats(cell_moments(np.empty(0), np.empty(0)))
+            LAZY = STATE['lazy'][key] if key in STATE['lazy'] and key not in Dirty else dict.fromkeys(LAZY_STATS, np.nan)
+            STATS.append({'Level': Level, 'Code': Code, 'Sample': S, 'Outliers': STATE['outliers'].get(f'{Level}|{Code}', 0), **MOMENTS, **LAZY})
+
+    return pd.DataFrame(STATS)[describe_columns()]
+
+def describe_columns():
+    """
+    Obtains the columns of the table of cell statistics, in the order of describe_grid.
+    """
+
+    return ['Level', 'Code', 'Sample', 'Outliers'] + list(cell_stats(np.empty(0), np.empty(0)))
+
+def cell_moments(arr, arb):
+    """
+    Obtains the mergeable state of a cell: its rows, its arbitrages, and the count, mean, sums of the central
+    powers (M2, M3, M4), minimum and maximum of its non-missing ARR.
+    """
+
+    values = arr[~np.isnan(arr)]
+    n = len(values)
+    mean = values.mean() if n > 0 else 0.0
+    d = values - mean
+
+    return {
+        'N': len(arr),
+        'ARB': int(np.count_nonzero(arb == 1)),
+        'n': n,
+        'mean': float(mean),
+        'M2': float((d**2).sum()),
+        'M3': float((d**3).sum()),
+        'M4': float((d**4).sum()),
+        'min': float(values.min()) if n > 0 else float('inf'),
+        'max': float(values.max()) if n > 0 else float('-inf')
+    }
+
+def merge_moments(A, B):
+    """
+    Merges the states of two disjoint parts of a cell with the pairwise update of the central moments (Pébay, 2008).
+    """
+
+    na, nb = A['n'], B['n']
+    n = na + nb
+
+    if na == 0 or nb == 0:
+        S = dict(A if nb == 0 else B)
+    else:
+        d = B['mean'] - A['mean']
+        S = {
+            'n': n,
+            'mean': A['mean'] + d * nb / n,
+            'M2': A['M2'] + B['M2'] + d**2 * na * nb / n,
+            'M3': A['M3'] + B['M3'] + d**3 * na * nb * (na - nb) / n**2 + 3 * d * (na * B['M2'] - nb * A['M2']) / n,
+            'M4': A['M4'] + B['M4'] + d**4 * na * nb * (na**2 - na * nb + nb**2) / n**3
+                  + 6 * d**2 * (na**2 * B['M2'] + nb**2 * A['M2']) / n**2 + 4 * d * (na * B['M3'] - nb * A['M3']) / n
+        }
+
+    S.update({'N': A['N'] + B['N'], 'ARB': A['ARB'] + B['ARB'], 'min': min(A['min'], B['min']), 'max': max(A['max'], B['max'])})
+
+    return S
+
+def moment_stats(S):
+    """
+    Obtains the statistics of cell_stats that only depend on the mergeable state of a cell
+    (the skewness and kurtosis are the bias-corrected ones of pandas).
+    """
+
+    N, n = S['N'], S['n']
+
+    if N == 0:
+        return {Name: value for Name, value in cell_stats(np.empty(0), np.empty(0)).items() if Name not in LAZY_STATS}
+
+    mean = S['mean'] if n > 0 else np.nan
+    std = np.sqrt(S['M2'] / (n - 1)) if n > 1 else np.nan
+
+    from scipy import stats     # Imported on first use, so that the selective runs start faster.
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+
+        m2 = S['M2'] / n if n > 0 else np.nan
+        skewness = (0.0 if m2 == 0 else np.sqrt(n * (n - 1)) / (n - 2) * (S['M3'] / n) / m2**1.5) if n > 2 else np.nan
+        kurtosis = (0.0 if m2 == 0 else n * (n + 1) * (n - 1) * S['M4'] / ((n - 2) * (n - 3) * S['M2']**2) - 3 * (n - 1)**2 / ((n - 2) * (n - 3))) if n > 3 else np.nan
+
+        t = mean / (std / np.sqrt(n)) if n > 1 else np.nan
+        t_pvalue = 2 * stats.t.sf(np.abs(t), n - 1) if n > 1 else np.nan
+
+    return {
+        'N': N,
+        'ARB': S['ARB'],
+        'R': S['ARB'] / N,
+        'Mean': mean,
+        'Std': std,
+        'Maximum': S['max'] if n > 0 else np.nan,
+        'Minimum': S['min'] if n > 0 else np.nan,
+        'Skewness': skewness,
+        'Kurtosis': kurtosis,
+        'T-test p-value': t_pvalue
+    }
+
+def stream_grid(path, Regions, Countries, Samples, chunksize = 10**6, n_bootstrap = 999, seed = 42, k = 1000, legacy = True, total = True, max_bytes = 64 * 2**20):
+    """
+    Obtains the table of describe_grid reading the data file in chunks of chunksize rows, so that the memory used does
+    not depend on its size. Every cell keeps its exact moments (cell_moments), a KLL sketch of its ARR (kll_sketch) for the
+    median and the Wilcoxon test, and the sums of a Poisson bootstrap with n_bootstrap replicates (poisson_bootstrap).
+    While a cell has at most k values its sketch holds all of them, so its median and Wilcoxon test are exact;
+    the bootstrap CI always comes from the Poisson bootstrap, so it differs from that of describe_grid.
+    The outliers are counted as in describe_grid (see outlier_counts).
+    """
+
+    Groups = [('Total', 'Total')] * total + [('Region', Region) for Region in Regions] + [('Country', Country) for Country in Countries]
+    Keys = [(Level, Code, S) for Level, Code in Groups for S in Samples]
+
+    rng = np.random.default_rng(seed)
+    CELLS = {key: {'moments': cell_moments(np.empty(0), np.empty(0)), 'sketch': kll_sketch(k), 'bootstrap': None} for key in Keys}
+    Outliers = dict.fromkeys(Groups, 0)
+
+    for DATA in pd.read_csv(path, delimiter = ';', chunksize = chunksize):
+
+        Counts = outlier_counts(DATA, legacy)
+
+        for Level, Code in Groups:
+            Outliers[(Level, Code)] += int(Counts[Level].get(Code, 0))
+
+        INDEX = partition_index(DATA)
+        ARR = DATA.loc[clean_mask(DATA), 'ARR'].to_numpy(dtype = float)
+        POSITIONS = {}
+
+        for key in Keys:
+
+            arr, arb, pos = index_cell(INDEX, *key)
+
+            if len(arr) > 0:
+                CELLS[key]['moments'] = merge_moments(CELLS[key]['moments'], cell_moments(arr, arb))
+                CELLS[key]['sketch'] = kll_merge(CELLS[key]['sketch'], kll_sketch(k, arr[~np.isnan(arr)]), rng)
+                POSITIONS[key] = np.sort(pos[~np.isnan(arr)])
+
+        # The Poisson weights of each row are drawn once and shared by every cell that contains it.
+
+        block = max(1, int(max_bytes // (8 * n_bootstrap)))
+
+        with Monitor.stage('bootstrap'):
+
+            for start in range(0, len(ARR), block):
+
+                w = rng.poisson(1.0, size = (n_bootstrap, min(block, len(ARR) - start))).astype(float)
+
+                for key, pos in POSITIONS.items():
+                    first, last = np.searchsorted(pos, [start, start + block])
+                    if last > first:
+                        CELLS[key]['bootstrap'] = poisson_bootstrap(ARR[pos[first:last]], w[:, pos[first:last] - start], CELLS[key]['bootstrap'])
+
+    STATS = []
+
+    for key in Keys:
+
+        CELL = CELLS[key]
+        tst = moment_stats(CELL['moments'])
+        tst.update(dict.fromkeys(LAZY_STATS, np.nan))
+
+        if CELL['moments']['n'] > 0:
+
+            n, mean, std = CELL['moments']['n'], tst['Mean'], tst['Std']
+            tst['Median'] = kll_quantile(CELL['sketch'], 0.5)
+            tst['Wilcoxon p-value'] = kll_wilcoxon(CELL['sketch'])
+
+            bootstrap_T = poisson_bootstrap_t(CELL['bootstrap'])
+            tst['Bootstrap CI Lower'] = mean - np.percentile(bootstrap_T, 97.5) * (std / np.sqrt(n))
+            tst['Bootstrap CI Upper'] = mean - np.percentile(bootstrap_T, 2.5) * (std / np.sqrt(n))
+
+        STATS.append({'Level': key[0], 'Code': key[1], 'Sample': key[2], 'Outliers': Outliers[key[:2]], **tst})
+
+    return pd.DataFrame(STATS)[describe_columns()]
+
+def kll_sketch(k = 1000, values = None):
+    """
+    Obtains a KLL sketch (Karnin, Lang & Liberty, 2016) with accuracy parameter k, of the given values or empty.
+    The sketch keeps compactors of items of weight 2^h; its rank error is about 1.7 / k of the count, whatever the count is.
+    """
+
+    values = np.empty(0) if values is None else np.asarray(values, dtype = float)
+
+    return kll_compress({'k': k, 'n': len(values), 'levels': [values]}, None)
+
+def kll_merge(A, B, rng):
+    """
+    Merges two KLL sketches (of disjoint data), compacting the result with random offsets drawn from rng.
+    """
+
+    Levels = [np.concatenate([A['levels'][h] if h < len(A['levels']) else np.empty(0), B['levels'][h] if h < len(B['levels']) else np.empty(0)])
+              for h in range(max(len(A['levels']), len(B['levels'])))]
+
+    return kll_compress({'k': A['k'], 'n': A['n'] + B['n'], 'levels': Levels}, rng)
+
+def kll_compress(S, rng):
+    """
+    Compacts every level of a sketch above its capacity (k (2/3)^depth): its sorted items are halved, keeping those
+    in even or odd positions at random, and promoted to the next level with twice the weight.
+    Without rng (a sketch of new values) the sketch is left exact, with all its values in the first level.
+    """
+
+    if rng is None:
+        return S
+
+    Levels, h = S['levels'], 0
+
+    while h < len(Levels):
+
+        capacity = max(2, int(np.ceil(S['k'] * (2 / 3)**(len(Levels) - 1 - h))))
+
+        if len(Levels[h]) > capacity:
+
+            items = np.sort(Levels[h])
+            odd = len(items) % 2
+
+            if h + 1 == len(Levels):
+                Levels.append(np.empty(0))
+
+            Levels[h + 1] = np.concatenate([Levels[h + 1], items[odd:][rng.integers(2)::2]])
+            Levels[h] = items[:odd]
+
+        h += 1
+
+    return S
+
+def kll_items(S):
+    """
+    Obtains the sorted items of a sketch and their weights.
+    """
+
+    values = np.concatenate(S['levels'])
+    weights = np.concatenate([np.full(len(Level), 2.0**h) for h, Level in enumerate(S['levels'])])
+    order = np.argsort(values, kind = 'stable')
+
+    return values[order], weights[order]
+
+def kll_quantile(S, q):
+    """
+    Obtains the quantile q of the values of a sketch (exact, as np.quantile, while the sketch holds all of them).
+    """
+
+    if len(S['levels']) == 1:
+        return np.quantile(S['levels'][0], q)
+
+    values, weights = kll_items(S)
+
+    return values[np.searchsorted(np.cumsum(weights), q * weights.sum())]
+
+def kll_wilcoxon(S):
+    """
+    Obtains the p-value of the Wilcoxon signed-rank test of the values of a sketch: exact (scipy) while the sketch holds
+    all of them, and otherwise from the normal approximation, ranking every item of weight w as w tied values.
+    """
+
+    from scipy import stats     # Imported on first use, so that the selective runs start faster.
+
+    if len(S['levels']) == 1:
+        try:
+            return stats.wilcoxon(S['levels'][0])[1]
+        except ValueError:
+            return np.nan
+
+    values, weights = kll_items(S)
+    weights, values = weights[values != 0], values[values != 0]     # The zeros are dropped, as in scipy.
+
+    order = np.argsort(np.abs(values), kind = 'stable')
+    magnitude, w = np.abs(values)[order], weights[order]
+
+    # Midrank of each item: the weight of the smaller magnitudes plus half that of its ties.
+
+    first = np.searchsorted(magnitude, magnitude, side = 'left')
+    last = np.searchsorted(magnitude, magnitude, side = 'right')
+    cum = np.r_[0, np.cumsum(w)]
+    rank = cum[first] + (cum[last] - cum[first] + 1) / 2
+
+    n = w.sum()
+    W = (w * rank)[values[order] > 0].sum()
+    z = (W - n * (n + 1) / 4) / np.sqrt(n * (n + 1) * (2 * n + 1) / 24)
+
+    return 2 * stats.norm.sf(np.abs(z))
+
+def poisson_bootstrap(values, w, B = None):
+    """
+    Adds values to the sums of a Poisson (online) bootstrap, where w (replicates x values) are the Poisson(1) number of
+    times that each replicate takes each value, so the replicates are updated in a single pass. Keeps, for each replicate,
+    the count, and the sum and sum of squares of the values minus a shift (the mean of the first values, for accuracy).
+    """
+
+    if B is None:
+        B = {'shift': values.mean(), 'W': np.zeros(len(w)), 'S1': np.zeros(len(w)), 'S2': np.zeros(len(w))}
+
+    x = values - B['shift']
+
+    B['W'] += w.sum(axis = 1)
+    B['S1'] += w @ x
+    B['S2'] += w @ x**2
+
+    return B
+
+def poisson_bootstrap_t(B):
+    """
+    Obtains the bootstrap t-statistics of the mean (as bootstrap_t) from the sums of a Poisson bootstrap.
+    """
+
+    W = B['W']
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        mean = B['S1'] / W
+        std = np.sqrt((B['S2'] - W * mean**2) / (W - 1))
+        return (mean + B['shift']) / (std / np.sqrt(W))
+
+def calculate_stats(data, n_bootstrap = 999, seed = 42, legacy = True, article_size = False):
     """
     Calculate descriptive statistics and hypothesis tests.
+    The bootstrap uses n_bootstrap replicates drawn from seed (see bootstrap_t for the legacy mode).
+    """
+
+    return cell_stats(data['ARR'].to_numpy(dtype = float), data['ARB'].to_numpy(), n_bootstrap = n_bootstrap, seed = seed, legacy = legacy, article_size = article_size)
+
+def cell_stats(arr, arb, n_bootstrap = 999, seed = 42, legacy = True, article_size = False):
+    """
+    Calculate descriptive statistics and hypothesis tests from the ARR and ARB values of a cell.
+    Each bootstrap resample has as many draws as non-missing ARR values; with article_size = True it has as many
+    as rows in the cell (missing ARR included), which reproduces the bootstrap CI of the article.
     """
     
-    N = len(data)
+    N = len(arr)
 
     if N == 0:
         return {
@@ -131,11 +689,10 @@ def calculate_stats(data):
             'Bootstrap CI Upper': np.nan
         }
 
-    ARB = len(data[data['ARB'] == 1])   # Number of arbitrages.
+    ARB = int(np.count_nonzero(arb == 1))   # Number of arbitrages.
     R = ARB / N if N > 0 else 0         # Proportion of arbitrages.
 
-    values = data['ARR'].dropna()
-    values = values.reset_index(drop=True)    
+    values = pd.Series(arr[~np.isnan(arr)])
 
     # Main statistics.
 
@@ -147,6 +704,8 @@ def calculate_stats(data):
     skewness = values.skew()
     kurtosis = values.kurtosis()
     
+    from scipy import stats     # Imported on first use, so that the selective runs start faster.
+
     # T-test (testing if mean is different from 0)
     t_stat, t_pvalue = stats.ttest_1samp(values, 0)
     
@@ -159,19 +718,8 @@ def calculate_stats(data):
 
     # Bootstrap test
 
-    n_bootstrap = 999
-    bootstrap_T = []
-    np.random.seed(42)
-    
-    for _ in range(n_bootstrap):
-        bootstrap_sample = np.random.choice(values, size=len(data), replace=True)
-        bootstrap_mean = np.mean(bootstrap_sample)
-        bootstrap_std = np.std(bootstrap_sample, ddof=1)
-        bootstrap_t = bootstrap_mean / (bootstrap_std / np.sqrt(len(bootstrap_sample)))
-        
-        bootstrap_T.append(bootstrap_t)
-    
-    bootstrap_T = np.array(bootstrap_T)
+    with Monitor.stage('bootstrap'):
+        bootstrap_T = bootstrap_t(values, n_bootstrap = n_bootstrap, seed = seed, legacy = legacy, size = N if article_size else None)
     bootstrap_ci_lower = mean - np.percentile(bootstrap_T, 97.5) * (std / np.sqrt(len(values)))
     bootstrap_ci_upper = mean - np.percentile(bootstrap_T, 2.5) * (std / np.sqrt(len(values)))
     
@@ -192,45 +740,83 @@ def calculate_stats(data):
         'Bootstrap CI Upper': bootstrap_ci_upper
     }
 
-#################### END OF COMPLEMENTARY FUNCTIONS ####################
+def bootstrap_t(values, n_bootstrap = 999, seed = 42, legacy = True, size = None, max_bytes = 64 * 2**20):
+    """
+    Obtains the bootstrap t-statistics of the mean, drawing the resamples as index matrices.
+    With legacy = True the draws come from RandomState(seed), which reproduces the former np.random.seed(42) loop;
+    otherwise they come from a np.random.Generator. Each resample has size draws (by default, the number of values).
+    The replicates are split in chunks of at most max_bytes.
+    """
 
-#################### START OF THE CODE ####################
+    values = np.asarray(values, dtype = float)
+    n = len(values)
+    size = n if size is None else size
 
-DATA = pd.read_csv('Verdu_Carchano_Ruiz_2025_Data.csv', delimiter = ';') # Open the data file.
+    if legacy:
+        rng = np.random.RandomState(seed)
+        draw = rng.randint
+    else:
+        rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        draw = rng.integers
 
-Regions = ['AFR', 'AME', 'ASI', 'EUR']
+    # Each replicate holds n indices and n resampled values (8 bytes each).
 
-Countries = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
+    chunk = max(1, int(max_bytes // (16 * max(size, 1))))
+    bootstrap_T = np.empty(n_bootstrap)
 
-Samples = ['F', '1', '2', '3', 'DIL', 'nDIL', 'IDX', 'nIDX']
+    for start in range(0, n_bootstrap, chunk):
+        stop = min(start + chunk, n_bootstrap)
+        bootstrap_sample = values[draw(0, n, size = (stop - start, size))]
+        bootstrap_mean = bootstrap_sample.mean(axis = 1)
+        bootstrap_std = bootstrap_sample.std(axis = 1, ddof = 1)
+        bootstrap_T[start:stop] = bootstrap_mean / (bootstrap_std / np.sqrt(size))
+
+    return bootstrap_T
+
+LAZY_STATS = ('Median', 'Wilcoxon p-value', 'Bootstrap CI Lower', 'Bootstrap CI Upper')   # Statistics that cannot be merged.
+
+Sample_Cells = {'F': ('F', 'F'), '1': ('PER', 'PER1'), '2': ('PER', 'PER2'), '3': ('PER', 'PER3'),
+                'DIL': ('DIL', 'DIL'), 'nDIL': ('DIL', 'nDIL'), 'IDX': ('IDX', 'IDX'), 'nIDX': ('IDX', 'nIDX')}   # Dimension and label of each sample.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
+
+#################### START OF THE CODE ####################
 
-##### RESULTS FROM THE ARBITRAGE STRATEGY #####
+if __name__ == '__main__':
 
-### Sample Distribution by Arbitrage Results, Descriptive Statistics and Statistical Tests###
+    parser = argparse.ArgumentParser(description = 'Descriptive statistics and tests of the arbitrage strategy.')
+    parser.add_argument('--state', default = None, help = 'JSON file with the state of the cells: only the offerings appended since its last update are read.')
+    parser.add_argument('--monitor', default = None, help = 'JSON lines file where the time of each stage and the warnings of each cell are saved.')
+    parser.add_argument('--stream', type = int, default = None, help = 'Reads the data file in chunks of this number of rows, with bounded memory (approximate median, Wilcoxon test and bootstrap CI).')
+    parser.add_argument('--article-size', action = 'store_true', help = 'Draws bootstrap resamples as large as the whole cell (missing ARR included), as the article does, to reproduce its CI.')
+    ARGS = parser.parse_args()
 
-## Total Sample ##
+    Monitor.enable(ARGS.monitor is not None)
 
-Code = 'Total'
+    Regions = ['AFR', 'AME', 'ASI', 'EUR']
 
-for Sample in Samples:
-    sample_description(DATA, Sample, Code)
+    Countries = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
 
-## Results for Regions ##
+    Samples = ['F', '1', '2', '3', 'DIL', 'nDIL', 'IDX', 'nIDX']
 
-for Region in Regions:
+    Workers = os.cpu_count() or 1   # Number of processes used to obtain the statistics of the cells.
 
-    data = DATA[DATA['Region'] == Region]
-    Code = Region
+    ##### RESULTS FROM THE ARBITRAGE STRATEGY #####
 
-    for Sample in Samples:
-        sample_description(data, Sample, Code)
+    ### Sample Distribution by Arbitrage Results, Descriptive Statistics and Statistical Tests###
 
-for Country in Countries:
+    if ARGS.stream:
+        STATS = stream_grid('Verdu_Carchano_Ruiz_2025_Data.csv', Regions, Countries, Samples, chunksize = ARGS.stream)   # Total sample, regions and countries, out of core.
+    elif ARGS.state:
+        DATA = load_data('Verdu_Carchano_Ruiz_2025_Data.csv')     # Open the data file (through its columnar cache).
+        STATS = update_grid(DATA, Regions, Countries, Samples, ARGS.state, article_size = ARGS.article_size)   # Total sample, regions and countries, updated incrementally.
+    else:
+        DATA = load_data('Verdu_Carchano_Ruiz_2025_Data.csv')     # Open the data file (through its columnar cache).
+        STATS = describe_grid(DATA, Regions, Countries, Samples, article_size = ARGS.article_size, workers = Workers)   # Total sample, regions and countries.
 
-    data = DATA[DATA['Country'] == Country]
-    Code = Country
+    render_report(STATS)
 
-    for Sample in Samples:
-        sample_description(data, Sample, Code)
+    if ARGS.monitor:
+        Monitor.report(ARGS.monitor)
 
 #################### END OF THE CODE ####################
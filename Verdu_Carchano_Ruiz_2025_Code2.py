@@ -17,145 +17,1270 @@
 #################### LIBRARIES TO USE ####################
 
 import warnings                         # Allows to ignore certain warnings and get a cleaner output.
+import os                               # Allows to check the state of the incremental mode.
+import zlib                             # Allows to derive the seeds of the bootstrap and permutation tests of each region.
+import json                             # Allows to save the state of the incremental mode and the selected orders.
+import hashlib                          # Allows to identify the samples of the selected orders.
+import argparse                         # Allows to read the options of the command line.
+import itertools                        # Allows to enumerate the permutations of the exact tests.
+
+from concurrent.futures import ProcessPoolExecutor  # Allows to select the orders and run the bootstrap in parallel processes.
 
 import numpy as np                      # Allows to work with Series.
 import pandas as pd						# Allows to organize the Data.
-import statsmodels.api as sm            # Allows to apply regression methods.
-import statsmodels.formula.api as smf	# Allows to apply regression methods.
 
-from scipy import stats                 # Allows to work with statistical tests and distributions
-from scipy.linalg import toeplitz
+# statsmodels (regression methods), patsy (design matrices) and scipy (tests and factorizations) are imported by the
+# functions that use them, so that the module can be imported, and the selective runs started, without loading them.
+
+from Verdu_Carchano_Ruiz_2025_Store import load_data, clean_mask, prefix_hash     # Allows to open the data through its typed cache.
+import Verdu_Carchano_Ruiz_2025_Monitor as Monitor                                  # Allows to time the stages and capture the warnings.
 
 warnings.filterwarnings('ignore')
 
+#################### START OF COMPLEMENTARY FUNCTIONS ####################
+
+def statsmodels_api():
+    """
+    Imports statsmodels on first use. Its import enables some of its warnings, which are ignored again as in the rest of the script.
+    """
+
+    import statsmodels.api as sm
+
+    warnings.filterwarnings('ignore')
+
+    return sm
+
+def ar_filter(x, phi):
+    """
+    Cochrane-Orcutt transform: quasi-differences x[t] - phi[0] * x[t-1] - ... - phi[p-1] * x[t-p] for t >= p.
+    """
+
+    x = np.asarray(x, dtype = float)
+    phi = np.atleast_1d(phi)
+    p = len(phi)
+
+    x_t = x[p:].copy()
+
+    for i in range(1, p + 1):
+        x_t -= phi[i - 1] * x[p - i:len(x) - i]
+
+    return x_t
+
+def ar_factor(phi):
+    """
+    Obtains the Cholesky factor of the correlation matrix of the first p observations of a stationary AR(p) process,
+    and the standard deviation of its innovations relative to the variance of the process.
+    """
+
+    from scipy.linalg import cholesky, toeplitz
+
+    statsmodels_api()
+    from statsmodels.tsa.arima_process import arma_acf
+
+    phi = np.atleast_1d(np.asarray(phi, dtype = float))
+    p = len(phi)
+
+    acf = arma_acf(np.r_[1, -phi], [1], lags = p + 1)
+    s2 = 1 - phi @ acf[1:]
+
+    if not s2 > 0:
+        raise np.linalg.LinAlgError(f'The AR coefficients {phi} do not define a stationary process.')
+
+    return cholesky(toeplitz(acf[:p]), lower = True), np.sqrt(s2)
+
+def ar_whiten(x, phi):
+    """
+    Prais-Winsten transform for errors whose covariance is the correlation matrix of a stationary AR(p) process.
+    Returns inv(cholesky(Sigma)) @ x in O(N) time and memory, without building the N x N matrix Sigma.
+    """
+
+    from scipy.linalg import solve_triangular
+
+    x = np.asarray(x, dtype = float)
+    L, s = ar_factor(phi)
+    p = len(L)
+
+    return np.concatenate([solve_triangular(L, x[:p], lower = True), ar_filter(x, phi) / s])
+
+def argls_class():
+    """
+    Obtains the ARGLS model (a subclass of sm.GLS), defined on first use so that statsmodels is only imported when needed.
+    It is also available as the attribute ARGLS of the module.
+    """
+
+    global ARGLS_CLASS
+
+    if ARGLS_CLASS is not None:
+        return ARGLS_CLASS
+
+    sm = statsmodels_api()
+
+    class ARGLS(sm.GLS):
+        """
+        GLS with the AR(p) correlation matrix of coefficients phi as sigma.
+        Gives the same estimates as sm.GLS with the dense sigma, but whitens with the Prais-Winsten transform.
+        """
+
+        def __init__(self, endog, exog, phi, **kwargs):
+
+            self.phi = np.atleast_1d(np.asarray(phi, dtype = float))
+            super(sm.GLS, self).__init__(endog, exog, **kwargs)
+
+            self.sigma = np.ones(len(self.endog))   # Diagonal of sigma, used for the centered TSS and the predictions.
+            self.cholsigmainv = None
+
+        def whiten(self, x):
+            return ar_whiten(x, self.phi)
+
+        def loglike(self, params):
+            """
+            Gaussian log-likelihood of the GLS model, with log|Sigma| obtained from the Prais-Winsten factors.
+            """
+
+            L, s = ar_factor(self.phi)
+
+            nobs2 = self.nobs / 2.0
+            SSR = np.sum((self.wendog - np.dot(self.wexog, params)) ** 2, axis = 0)
+            llf = -np.log(SSR) * nobs2
+            llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+            llf -= np.sum(np.log(np.diag(L))) + (self.nobs - len(L)) * np.log(s)
+
+            return llf
+
+    ARGLS.__qualname__ = 'ARGLS'     # Found through the module, so that the fitted models can be pickled.
+    ARGLS_CLASS = ARGLS
+
+    return ARGLS
+
+def __getattr__(name):
+    """
+    Defines the attribute ARGLS of the module on first use (see argls_class).
+    """
+
+    if name == 'ARGLS':
+        return argls_class()
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def restricted_fits(res, Restrictions):
+    """
+    Obtains the models that drop each variable in Restrictions from a fitted full model, factorizing its (whitened)
+    design matrix once and deleting the column from the QR factorization instead of estimating a new model.
+    Returns the params, HC1 bse and residuals of each restricted model.
+    """
+
+    from scipy.linalg import qr_delete, solve_triangular
+
+    model = res.model
+    Q, R = np.linalg.qr(model.wexog)
+    Names = list(model.exog_names)
+    n = len(model.wendog)
+
+    FITS = {}
+
+    for Variable in Restrictions:
+
+        j = Names.index(Variable)
+        Q_r, R_r = qr_delete(Q, R, j, which = 'col')
+        X = np.delete(model.exog, j, axis = 1)
+        wX = np.delete(model.wexog, j, axis = 1)
+        k = wX.shape[1]
+
+        params = solve_triangular(R_r, Q_r.T @ model.wendog)
+        wresid = model.wendog - wX @ params
+
+        # HC1: (X'X)^-1 X' diag(e^2) X (X'X)^-1 n / (n - k), with X = Q R.
+
+        R_inv = solve_triangular(R_r, np.eye(k))
+        meat = (Q_r * wresid[:, None] ** 2).T @ Q_r
+        cov = R_inv @ meat @ R_inv.T * n / (n - k)
+
+        Index = [Name for Name in Names if Name != Variable]
+
+        FITS[Variable] = {
+            'params': pd.Series(params, index = Index),
+            'bse': pd.Series(np.sqrt(np.diag(cov)), index = Index),
+            'resid': pd.Series(model.endog - X @ params, index = res.resid.index)
+        }
+
+    return FITS
+
+def sample_rows(data, Sample):
+    """
+    Obtains the mask of the offerings of a sample: F (full sample), 1, 2, 3 (periods), DIL, nDIL (DIL at least 0.5 or not)
+    and IDX, nIDX (listed in the main stock index or not).
+    """
+
+    MASKS = {
+        'F': lambda: np.ones(len(data), dtype = bool),
+        'DIL': lambda: (data['DIL'] >= 0.5).to_numpy(),
+        'nDIL': lambda: (data['DIL'] < 0.5).to_numpy(),
+        'IDX': lambda: (data['IDX'] == 1).to_numpy(),
+        'nIDX': lambda: (data['IDX'] == 0).to_numpy()
+        }
+
+    if Sample in MASKS:
+        return MASKS[Sample]()
+
+    return (data['PER'] == f'PER{Sample}').to_numpy()
+
+def region_sample(DATA, Region):
+    """
+    Obtains the sample of a region used in the regressions: no missing variables and the clean mask.
+    """
+
+    with Monitor.stage('filter'):
+
+        data = DATA[DATA['Region'] == Region]
+        data = data.dropna(subset=['ARR', 'DIL', 'IDX', 'ISC', 'CAP'])
+        data = data.reset_index(drop=True)
+
+        return data[clean_mask(data)]
+
+def ols_shift(y, X):
+    """
+    Obtains the shift of the sums of ols_accumulators from a sample: the means of y and of the columns of X, except the
+    intercept (the first column of ones), which is kept. Without an intercept nothing is shifted.
+    Returns the shift (of y, then of the columns of X) and the column of the intercept (-1 if there is none).
+    """
+
+    y = np.asarray(y, dtype = float).ravel()
+    X = np.asarray(X, dtype = float)
+    Ones = np.flatnonzero((X == 1).all(axis = 0)) if len(X) else []
+
+    if not len(Ones):
+        return np.zeros(X.shape[1] + 1), -1
+
+    shift = np.r_[y.mean(), X.mean(axis = 0)]
+    shift[1 + Ones[0]] = 0
+
+    return shift, int(Ones[0])
+
+def ols_accumulators(y, X, shift = None, intercept = -1):
+    """
+    Obtains the mergeable sums of an OLS regression: X'X, X'y, y'y and the number of observations, together with the
+    sums of y^2 x x', y x x x and x x x x, from which the HC1 covariance of any later fit is obtained without the residuals.
+    The sums are those of y and X minus a shift (see ols_shift), as the shifted data of Chan, Golub & LeVeque (1983):
+    with the shift close to the means, the sums do not grow with the level of the variables, so that the residuals
+    obtained from them do not come from the difference of large numbers.
+    """
+
+    y = np.asarray(y, dtype = float).ravel()
+    X = np.asarray(X, dtype = float)
+    shift = np.zeros(X.shape[1] + 1) if shift is None else np.asarray(shift, dtype = float)
+
+    y, X = y - shift[0], X - shift[1:]
+
+    return {
+        'n': len(y),
+        'XX': X.T @ X,
+        'Xy': X.T @ y,
+        'yy': y @ y,
+        'A2': np.einsum('i,ij,ik->jk', y**2, X, X),
+        'A3': np.einsum('i,ij,ik,il->jkl', y, X, X, X),
+        'A4': np.einsum('ij,ik,il,im->jklm', X, X, X, X),
+        'shift': shift,
+        'intercept': intercept
+    }
+
+def merge_accumulators(A, B):
+    """
+    Merges the sums of two disjoint samples of the same regression (with the same shift).
+    """
+
+    return {Name: A[Name] if Name in ('shift', 'intercept') else A[Name] + B[Name] for Name in A}
+
+def ols_from_accumulators(ACC, XX_inv = None):
+    """
+    Obtains the OLS params, the HC1 covariance and bse, and the sum of squared residuals from the sums of a regression.
+    HC1: (X'X)^-1 X' diag(e^2) X (X'X)^-1 n / (n - k), with X' diag(e^2) X = A2 - 2 A3 b + A4 b b.
+    The fit of the shifted data has the same residuals; its params and covariance are taken back to those of y and X
+    (the intercept absorbs the shift). The inverse of the shifted X'X can be given (e.g. from its Cholesky factor).
+    """
+
+    n, k = ACC['n'], len(ACC['Xy'])
+
+    if XX_inv is None:
+        d = np.sqrt(np.diag(ACC['XX']))      # Scaled to a unit diagonal, so that the inverse does not depend on the units.
+        XX_inv = np.linalg.inv(ACC['XX'] / np.outer(d, d)) / np.outer(d, d)
+
+    params = XX_inv @ ACC['Xy']
+
+    meat = ACC['A2'] - 2 * np.einsum('jkl,l->jk', ACC['A3'], params) + np.einsum('jklm,l,m->jk', ACC['A4'], params, params)
+    cov = XX_inv @ meat @ XX_inv * n / (n - k)
+    ssr = ACC['yy'] - 2 * params @ ACC['Xy'] + params @ ACC['XX'] @ params
+
+    # y - shift_y = (X - shift_X) b is y = X M b + shift_y, with M the identity minus shift_X in the row of the intercept.
+
+    j = int(ACC['intercept'])
+
+    if j >= 0:
+        M = np.eye(k)
+        M[j] -= ACC['shift'][1:]
+        params, cov = M @ params, M @ cov @ M.T
+        params[j] += ACC['shift'][0]
+
+    return {
+        'params': params,
+        'cov': cov,
+        'bse': np.sqrt(np.diag(cov)),
+        'ssr': ssr,
+        'nobs': n
+    }
+
+def update_accumulators(DATA, Regions, Formula, path):
+    """
+    Keeps the OLS sums of every region in path (a JSON file), reading only the offerings appended to DATA since the
+    last update. The sums of every region in the new offerings are kept, whatever the Regions asked for, so that any
+    later selection is served from them. The sums are rebuilt from scratch if the offerings already ingested, the
+    formula, or the layout of the sums (ACCUMULATOR_VERSION), have changed.
+    Returns the OLS fit (ols_from_accumulators) of each of the Regions, with the names of the columns of the design matrix.
+    """
+
+    from patsy import dmatrices
+
+    STATE = {'rows': 0, 'hash': prefix_hash(DATA, 0), 'formula': Formula, 'version': ACCUMULATOR_VERSION, 'names': None, 'regions': {}}
+
+    if os.path.exists(path):
+        with open(path) as file:
+            SAVED = json.load(file)
+        if SAVED['rows'] <= len(DATA) and SAVED['hash'] == prefix_hash(DATA, SAVED['rows']) and SAVED['formula'] == Formula and SAVED.get('version') == ACCUMULATOR_VERSION:
+            STATE = SAVED
+
+    ACCS = {Region: {Name: np.asarray(Value) for Name, Value in ACC.items()} for Region, ACC in STATE['regions'].items()}
+
+    NEW = DATA.iloc[STATE['rows']:]
+
+    for Region in NEW['Region'].dropna().unique():
+
+        data = region_sample(NEW, Region)
+
+        if len(data):
+            y, X = dmatrices(Formula, data, return_type = 'dataframe')
+            STATE['names'] = list(X.columns)
+
+            # The sums of a region are shifted by the means of its first offerings (see ols_accumulators).
+
+            if Region in ACCS:
+                ACCS[Region] = merge_accumulators(ACCS[Region], ols_accumulators(y, X, ACCS[Region]['shift'], ACCS[Region]['intercept']))
+            else:
+                ACCS[Region] = ols_accumulators(y, X, *ols_shift(y, X))
+
+    STATE['rows'], STATE['hash'] = len(DATA), prefix_hash(DATA, len(DATA))
+    STATE['regions'] = {Region: {Name: np.asarray(Value).tolist() for Name, Value in ACC.items()} for Region, ACC in ACCS.items()}
+
+    with open(path, 'w') as file:
+        json.dump(STATE, file)
+
+    return {Region: {**ols_from_accumulators(ACCS[Region]), 'names': STATE['names']} for Region in Regions if Region in ACCS}
+
+def cholesky_update(R, x, sign = 1):
+    """
+    Rank-one update (sign 1) or downdate (sign -1) in place of the upper Cholesky factor R of X'X when the row x is
+    added to (or removed from) X, in O(k^2). Raises LinAlgError if the downdate leaves X'X (numerically) singular.
+    """
+
+    x = np.array(x, dtype = float)
+
+    for j in range(len(x)):
+
+        r2 = R[j, j]**2 + sign * x[j]**2
+
+        if r2 <= 1e-12 * R[j, j]**2:
+            raise np.linalg.LinAlgError('Singular downdate.')
+
+        r = np.sqrt(r2)
+        c, s = r / R[j, j], x[j] / R[j, j]
+        R[j, j] = r
+        R[j, j + 1:] = (R[j, j + 1:] + sign * s * x[j + 1:]) / c
+        x[j + 1:] = c * x[j + 1:] - s * R[j, j + 1:]
+
+def rolling_ols(y, X, window = None, min_nobs = None, refresh = 1000):
+    """
+    OLS params and HC1 bse of every window of window consecutive rows (expanding windows from the first row if window is
+    None), each one ending at a row of X. Each step adds the new row to (and removes the oldest one from) the Cholesky
+    factor of X'X and the sums of ols_accumulators, so that its cost does not depend on the length of the window. The
+    sums are shifted by the means of the whole sample (see ols_shift), and both the sums and the factor are recomputed
+    from the rows of the window every refresh steps, and whenever a downdate fails, so that their rounding errors do not
+    build up over the updates and downdates.
+    Returns params and bse (rows x columns) and nobs; the windows with fewer than min_nobs rows (window, or k + 1 for
+    expanding windows, by default), or singular, are NaN.
+    """
+
+    from scipy.linalg.lapack import dtrtri
+
+    y = np.asarray(y, dtype = float).ravel()
+    X = np.asarray(X, dtype = float)
+    n, k = X.shape
+    min_nobs = max(min_nobs or (window or 0), k + 1)
+
+    params, bse = np.full((n, k), np.nan), np.full((n, k), np.nan)
+    nobs = np.minimum(np.arange(1, n + 1), n if window is None else window)
+
+    shift, intercept = ols_shift(y, X)
+    ys, Xs = y - shift[0], X - shift[1:]
+
+    ACC = ols_accumulators(y[:0], X[:0], shift, intercept)
+    R = None
+
+    def add(i, sign):
+        """
+        Adds (sign 1) or removes (sign -1) the row i from the sums, in place.
+        """
+
+        xx = np.outer(Xs[i], Xs[i])
+        xxx = xx[:, :, None] * Xs[i]
+        ACC['n'] += sign
+        ACC['XX'] += sign * xx
+        ACC['Xy'] += sign * ys[i] * Xs[i]
+        ACC['yy'] += sign * ys[i]**2
+        ACC['A2'] += sign * ys[i]**2 * xx
+        ACC['A3'] += sign * ys[i] * xxx
+        ACC['A4'] += sign * xxx[..., None] * Xs[i]
+
+    with Monitor.stage('rolling'):
+
+        for t in range(n):
+
+            add(t, 1)
+
+            if R is not None:
+                cholesky_update(R, Xs[t])
+
+            if window is not None and t >= window:
+
+                add(t - window, -1)
+
+                if R is not None:
+                    try:
+                        cholesky_update(R, Xs[t - window], -1)
+                    except np.linalg.LinAlgError:
+                        Monitor.count('refactorized')
+                        R = None
+
+            if nobs[t] < min_nobs:
+                continue
+
+            if R is None or t % refresh == 0:
+                ACC.update(ols_accumulators(y[t + 1 - nobs[t]:t + 1], X[t + 1 - nobs[t]:t + 1], shift, intercept))
+                try:
+                    R = np.linalg.cholesky(ACC['XX']).T
+                except np.linalg.LinAlgError:
+                    Monitor.count('singular')
+                    R = None
+                    continue
+
+            R_inv = dtrtri(R)[0]
+            FIT = ols_from_accumulators(ACC, R_inv @ R_inv.T)
+            params[t], bse[t] = FIT['params'], FIT['bse']
+
+    return {'params': params, 'bse': bse, 'nobs': nobs}
+
+def rolling_region(data, Formula = 'ARR ~ DIL + IDX + ISC + CAP', window = None):
+    """
+    Paths of the OLS coefficients and HC1 standard errors of a region (see region_sample) over the windows of window
+    offerings, in the order of the data (expanding windows if window is None), with rolling_ols.
+    """
+
+    from patsy import dmatrices
+
+    y, X = dmatrices(Formula, data, return_type = 'dataframe')
+
+    return {**rolling_ols(y.to_numpy(), X.to_numpy(), window), 'names': list(X.columns)}
+
+def rolling_table(DATA, Regions, Formula = 'ARR ~ DIL + IDX + ISC + CAP', window = None):
+    """
+    Obtains the paths of the OLS coefficients of the regions (from rolling_region) in a tidy DataFrame, with one row per
+    window and term: the position of the last offering of the window in the sample of the region, and its number of offerings.
+    """
+
+    TABLES = []
+
+    for Region in Regions:
+
+        PATH = rolling_region(region_sample(DATA, Region), Formula, window)
+        End, Term = np.nonzero(~np.isnan(PATH['params']))
+
+        TABLES.append(pd.DataFrame({'Region': Region, 'End': End, 'N': PATH['nobs'][End], 'Term': np.asarray(PATH['names'])[Term],
+                                    'Coefficient': PATH['params'][End, Term], 'Std. Error': PATH['bse'][End, Term]}))
+
+    return pd.concat(TABLES, ignore_index = True)
+
+def incremental_table(FITS):
+    """
+    Obtains the OLS coefficients of the regions updated incrementally (from update_accumulators) in a tidy DataFrame,
+    with the columns of region_table and the number of offerings.
+    """
+
+    from scipy import stats
+
+    TABLE = []
+
+    for Region, FIT in FITS.items():
+        for j, Term in enumerate(FIT['names']):
+            TABLE.append({'Region': Region, 'Estimator': 'OLS', 'Term': Term, 'Coefficient': FIT['params'][j], 'Std. Error': FIT['bse'][j],
+                          'p-value': 2 * stats.norm.sf(abs(FIT['params'][j] / FIT['bse'][j])), 'N': FIT['nobs']})
+
+    return pd.DataFrame(TABLE)
+
+def estimate_region(data, Formula = 'ARR ~ DIL + IDX + ISC + CAP', Order = (1, 0, 0), Restrictions = ('DIL', 'IDX'), rho = None):
+    """
+    Estimates the OLS, FGLS and FOGLS models of the sample of a region (see region_sample), with the AR coefficient
+    of the FGLS and FOGLS obtained from an ARIMA model of ARR with the given order (see ORDERS for those of the article),
+    unless it is given as rho (e.g. from select_orders).
+    Returns, for each estimator, its results, its restricted fits and the KW p-values that compare their residuals.
+    """
+
+    sm = statsmodels_api()
+    from patsy import dmatrices
+    from scipy import stats
+
+    # The design matrix is built once and shared by the three estimators; the restricted models
+    # are obtained from the QR factorization of each full model.
+
+    y, X = dmatrices(Formula, data, return_type = 'dataframe')
+
+    with Monitor.stage('fit'):
+        res_ols = sm.OLS(y, X).fit(cov_type = 'HC1')
+
+    if rho is None:
+        rho = arima_rho(data['ARR'], Order)
+
+    # The AR(1) sigma (rho ** |i - j|) is applied through the Prais-Winsten transform instead of a dense N x N matrix.
+
+    with Monitor.stage('fit'):
+        res_fgls = argls_class()(y, X, phi = rho).fit(cov_type = 'HC1')
+
+    # Cochrane-Orcutt transform of every variable (the first observation is dropped); the intercept is kept.
+
+    y_T = pd.DataFrame(ar_filter(y, rho), columns = ['ARRT'])
+    X_T = pd.DataFrame(ar_filter(X, rho), columns = [Name if Name == 'Intercept' else f'{Name}T' for Name in X.columns])
+    X_T['Intercept'] = 1.0
+
+    with Monitor.stage('fit'):
+        res_fogls = sm.OLS(y_T, X_T).fit(cov_type = 'HC1')
+
+    FITS = {}
+
+    for Estimator, res, Suffix in (('OLS', res_ols, ''), ('FGLS', res_fgls, ''), ('FOGLS', res_fogls, 'T')):
+
+        with Monitor.stage('restricted'):
+            res_R = restricted_fits(res, [f'{Variable}{Suffix}' for Variable in Restrictions])
+
+        FITS[Estimator] = {
+            'res': res,
+            'restricted': res_R,
+            'KW': {Variable: stats.kruskal(res.resid, res_R[f'{Variable}{Suffix}']['resid'])[1] for Variable in Restrictions}
+        }
+
+    return FITS
+
+def arima_rho(ARR, Order):
+    """
+    Obtains the coefficient used as AR(1) coefficient of the errors: the second parameter of an ARIMA model of ARR
+    with the given order (as in the article). It is ar.L1 for the orders with a constant (d = 0), but not for the
+    differenced ones: for the (2, 1, 0) of AME in the article it is ar.L2. select_order takes ar.L1 by name instead,
+    so the rho of a selected order is not that of arima_rho for the same differenced order.
+    """
+
+    return arima_fit(ARR, Order).params.iloc[1]
+
+def arima_fit(ARR, Order):
+    """
+    Fits by maximum likelihood an ARIMA model of ARR with the given order (with a constant if it is not differenced).
+    """
+
+    sm = statsmodels_api()
+
+    with Monitor.stage('arima'):
+        mod_arima = sm.tsa.arima.ARIMA(endog = ARR, order = Order)
+        res_arima = mod_arima.fit()
+
+    return res_arima
+
+def prescreen_order(x, Order):
+    """
+    Approximate AIC and BIC of an ARIMA model of x with the given order, from a cheap fit of the differenced series
+    (Burg for pure AR models and Hannan-Rissanen otherwise) and the Gaussian likelihood of its conditional residuals.
+    """
+
+    from scipy.signal import lfilter
+
+    statsmodels_api()
+    from statsmodels.tsa.arima.estimators.burg import burg
+    from statsmodels.tsa.arima.estimators.hannan_rissanen import hannan_rissanen
+
+    p, d, q = Order
+    x = np.diff(np.asarray(x, dtype = float), n = d)
+    x = x - x.mean() if d == 0 else x
+    n = len(x)
+
+    if q == 0:
+        params, _ = burg(x, ar_order = p)
+    else:
+        params, _ = hannan_rissanen(x, ar_order = p, ma_order = q)
+
+    # Residuals of the ARMA filter (the Hannan-Rissanen variance is unreliable when the AR and MA roots nearly cancel).
+
+    e = lfilter(np.r_[1, -params.ar_params], np.r_[1, params.ma_params], x)
+
+    k = p + q + 1 + (d == 0)    # Coefficients, variance and constant.
+    llf = -n / 2 * (np.log(2 * np.pi * np.mean(e**2)) + 1)
+
+    return {'aic': -2 * llf + 2 * k, 'bic': -2 * llf + k * np.log(n)}
+
+def unit_root_order(x, test = 'kpss', alpha = 0.05):
+    """
+    Chooses the order of differencing (0 or 1) of x with a unit-root test at level alpha: the KPSS test (kpss), whose
+    null is stationarity, differences x when it is rejected; the augmented Dickey-Fuller test (adf), whose null is a
+    unit root, differences x unless it is rejected.
+    """
+
+    statsmodels_api()
+    from statsmodels.tsa.stattools import adfuller, kpss
+
+    x = np.asarray(x, dtype = float)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')     # The KPSS p-values are interpolated in a table that only covers [0.01, 0.1].
+        if test == 'kpss':
+            return int(kpss(x, regression = 'c', nlags = 'auto')[1] < alpha)
+        return int(adfuller(x, regression = 'c', autolag = 'AIC')[1] >= alpha)
+
+def select_order(ARR, Grid = None, top = 5, criterion = 'aic', test = 'kpss'):
+    """
+    Selects the ARIMA order of ARR. The order of differencing d is chosen first by a unit-root test (unit_root_order,
+    kpss or adf), since the criteria of the levels and of the differences are not comparable; with test None every
+    order is compared. The orders of Grid (ORDER_GRID by default) with that d (all of them if none has it) are
+    pre-screened with prescreen_order, and only the top ones by the approximate criterion (aic or bic) are fitted by
+    maximum likelihood and compared by their exact criterion. Returns the selected order, its first AR coefficient
+    (ar.L1, by name; see arima_rho for the coefficient of the article) and its criterion.
+    """
+
+    Grid = ORDER_GRID if Grid is None else Grid
+    ARR = pd.Series(np.asarray(ARR, dtype = float))
+
+    statsmodels_api()
+    import statsmodels.tsa.arima.api     # Imported before the stages, so that they only time the fits.
+
+    if test is not None:
+        with Monitor.stage('unit root'):
+            d = unit_root_order(ARR, test)
+        Grid = [Order for Order in Grid if Order[1] == d] or Grid
+
+    SCREEN = []
+
+    with Monitor.stage('prescreen'):
+        for Order in Grid:
+            try:
+                SCREEN.append((prescreen_order(ARR, Order)[criterion], tuple(Order)))
+            except (np.linalg.LinAlgError, ValueError):
+                continue
+
+    BEST = None
+
+    for value, Order in sorted(SCREEN)[:top]:
+
+        try:
+            res = arima_fit(ARR, Order)
+        except (np.linalg.LinAlgError, ValueError):
+            continue
+
+        if 'ar.L1' in res.params.index and np.isfinite(getattr(res, criterion)) and (BEST is None or getattr(res, criterion) < BEST[criterion]):
+            BEST = {'order': Order, 'rho': float(res.params['ar.L1']), criterion: float(getattr(res, criterion))}
+
+    return BEST
+
+def select_orders(DATA, Regions, Grid = None, top = 5, criterion = 'aic', workers = 1, path = None, test = 'kpss'):
+    """
+    Selects the ARIMA order (select_order) of the sample of every region, in a process pool with workers > 1.
+    With a path (a JSON file), the selection of every sample is kept under the hash of its ARR and of the options,
+    so that it is only repeated for the samples that have changed.
+    """
+
+    Grid = [tuple(Order) for Order in (ORDER_GRID if Grid is None else Grid)]
+    SERIES = {Region: region_sample(DATA, Region)['ARR'].to_numpy(dtype = float) for Region in Regions}
+    Keys = {Region: order_key(ARR, Grid, top, criterion, test) for Region, ARR in SERIES.items()}
+
+    CACHE = {}
+
+    if path and os.path.exists(path):
+        with open(path) as file:
+            CACHE = json.load(file)
+
+    Missing = [Region for Region in Regions if Keys[Region] not in CACHE]
+    Monitor.count('cached', len(Regions) - len(Missing))
+
+    Tasks = [(SERIES[Region], Grid, top, criterion, test) for Region in Missing]
+
+    if workers > 1 and len(Tasks) > 1:
+        with ProcessPoolExecutor(max_workers = min(workers, len(Tasks)), initializer = init_worker, initargs = (Monitor.ENABLED,)) as pool:
+            OUTPUTS = list(pool.map(run_selection, Tasks))
+    else:
+        OUTPUTS = [(select_order(*Task), None) for Task in Tasks]
+
+    for Region, (BEST, RECORDS) in zip(Missing, OUTPUTS):
+        Monitor.merge(RECORDS)
+        if BEST is not None:
+            CACHE[Keys[Region]] = {**BEST, 'order': list(BEST['order'])}
+
+    if path and Missing:
+        with open(path, 'w') as file:
+            json.dump(CACHE, file)
+
+    return {Region: {**CACHE[Keys[Region]], 'order': tuple(CACHE[Keys[Region]]['order'])} for Region in Regions if Keys[Region] in CACHE}
+
+def order_key(ARR, Grid, top, criterion, test = 'kpss'):
+    """
+    Identifies a selection of select_order by the hash of the series and of its options.
+    """
+
+    digest = hashlib.sha1(np.ascontiguousarray(ARR, dtype = float).tobytes())
+    digest.update(json.dumps([Grid, top, criterion, test]).encode())
+
+    return digest.hexdigest()
+
+def init_worker(monitor = False):
+    """
+    Enables the instrumentation of a worker process if monitor is True.
+    """
+
+    Monitor.enable(monitor)
+    Monitor.reset()     # The records inherited from the parent process are not sent back to it.
+
+def run_selection(Task):
+    """
+    Runs select_order in a worker process, returning its output with the records of its instrumentation.
+    """
+
+    return select_order(*Task), Monitor.drain()
+
+def ar_unwhiten(w, phi):
+    """
+    Inverse of ar_whiten (along the first axis, so that the columns of a matrix are transformed at once).
+    """
+
+    from scipy.signal import lfilter
+
+    w = np.asarray(w, dtype = float)
+    phi = np.atleast_1d(np.asarray(phi, dtype = float))
+    L, s = ar_factor(phi)
+    p = len(L)
+
+    x = L @ w[:p]
+
+    # State of the AR recursion x[t] = s * w[t] + phi[0] * x[t-1] + ... + phi[p-1] * x[t-p] after the first p observations.
+
+    zi = np.array([sum(phi[m - 1] * x[p - m + i] for m in range(i + 1, p + 1)) for i in range(p)])
+
+    return np.concatenate([x, lfilter([s], np.r_[1, -phi], w[p:], axis = 0, zi = zi)[0]])
+
+def bootstrap_design(res, Restrictions):
+    """
+    Factorizes once the (whitened) design matrix of a fitted model for bootstrap_block: its QR factors, parameters and
+    whitened residuals, and the fitted values and residuals of the models without each variable in Restrictions.
+    """
+
+    from scipy.linalg import qr_delete
+
+    model = res.model
+    wX, wy = np.asarray(model.wexog, dtype = float), np.asarray(model.wendog, dtype = float).ravel()
+    Q, R = np.linalg.qr(wX)
+    params = np.asarray(res.params, dtype = float)
+    Names = list(model.exog_names)
+
+    DESIGN = {'Q': Q, 'R': R, 'params': params, 'wresid': wy - wX @ params, 'phi': getattr(model, 'phi', None), 'restricted': {}}
+
+    for Variable in Restrictions:
+        Q_r, _ = qr_delete(Q, R, Names.index(Variable), which = 'col')
+        wfit = Q_r @ (Q_r.T @ wy)
+        DESIGN['restricted'][Variable] = {'Q': Q_r, 'wfit': wfit, 'wresid': wy - wfit}
+
+    return DESIGN
+
+def kruskal_h(A, B):
+    """
+    Kruskal-Wallis statistic of two samples (without the correction for ties), for each column of A and B.
+    """
+
+    from scipy.stats import rankdata
+
+    n1, n2 = len(A), len(B)
+    N = n1 + n2
+    ranks = rankdata(np.concatenate([A, B]), axis = 0)
+
+    return 12 / (N * (N + 1)) * (ranks[:n1].sum(axis = 0)**2 / n1 + ranks[n1:].sum(axis = 0)**2 / n2) - 3 * (N + 1)
+
+def bootstrap_block(DESIGN, n, seed, method = 'wild'):
+    """
+    Obtains n bootstrap replicates of the parameters of a model factorized by bootstrap_design, and of the KW statistic
+    that compares its residuals with those of each restricted model.
+    wild: Rademacher weights on the (whitened) residuals, so that every replicate is b + R^-1 Q' (e * v), a product
+    with the factors of the model. pairs: multinomial weights on the rows, which need one (k x k) system per replicate.
+    The KW statistics are obtained under the restricted model (wild in both cases): y* = X_r b_r + e_r * v.
+    """
+
+    from scipy.linalg import solve_triangular
+
+    rng = np.random.default_rng(seed)
+    Q, R, params, u = DESIGN['Q'], DESIGN['R'], DESIGN['params'], DESIGN['wresid']
+    m = len(u)
+
+    with Monitor.stage('bootstrap'):
+
+        if method == 'wild':
+            V = rng.choice([-1.0, 1.0], size = (m, n))
+            PARAMS = params + solve_triangular(R, Q.T @ (u[:, None] * V)).T
+        else:
+            W = rng.multinomial(m, np.full(m, 1 / m), size = n).T.astype(float)
+            wX = Q @ R
+            wy = wX @ params + u
+            PARAMS = (np.linalg.pinv(np.einsum('ib,ij,ik->bjk', W, wX, wX)) @ ((W * wy[:, None]).T @ wX)[:, :, None])[:, :, 0]
+            V = rng.choice([-1.0, 1.0], size = (m, n))
+
+        H = {}
+
+        for Variable, RESTRICTED in DESIGN['restricted'].items():
+
+            wy = RESTRICTED['wfit'][:, None] + RESTRICTED['wresid'][:, None] * V
+            e = wy - Q @ (Q.T @ wy)
+            e_r = wy - RESTRICTED['Q'] @ (RESTRICTED['Q'].T @ wy)
+
+            if DESIGN['phi'] is not None:
+                e, e_r = ar_unwhiten(e, DESIGN['phi']), ar_unwhiten(e_r, DESIGN['phi'])
+
+            H[Variable] = kruskal_h(e, e_r)
+
+    return PARAMS, H
+
+def bootstrap_region(FITS, Restrictions = ('DIL', 'IDX'), n_bootstrap = 999, method = 'wild', seed = 42, key = '', workers = 1, max_bytes = 64 * 2**20):
+    """
+    Bootstrap inference (wild or pairs, see bootstrap_block) for the models of a region (from estimate_region): standard
+    errors, 95% percentile intervals and p-values of the coefficients, and p-values of the KW tests of the restricted models.
+    The replicates run in blocks, each with its own seed spawned from seed and key (e.g. the region), so that the results
+    do not depend on workers (blocks run in a process pool with workers > 1).
+    """
+
+    Tasks, Owners = [], []
+
+    for Estimator, FIT in FITS.items():
+
+        Suffix = 'T' if Estimator == 'FOGLS' else ''
+        DESIGN = bootstrap_design(FIT['res'], [f'{Variable}{Suffix}' for Variable in Restrictions])
+        m = len(DESIGN['wresid'])
+        block = max(1, int(max_bytes // (8 * m * (3 + 2 * len(Restrictions)))))
+        Sizes = [min(block, n_bootstrap - start) for start in range(0, n_bootstrap, block)]
+        Seeds = np.random.SeedSequence(seed, spawn_key = [zlib.crc32(str(key).encode()), zlib.crc32(Estimator.encode())]).spawn(len(Sizes))
+
+        Tasks += [(DESIGN, n, Seed, method) for n, Seed in zip(Sizes, Seeds)]
+        Owners += [Estimator] * len(Sizes)
+
+    if workers > 1 and len(Tasks) > 1:
+        with ProcessPoolExecutor(max_workers = min(workers, len(Tasks)), initializer = init_worker, initargs = (Monitor.ENABLED,)) as pool:
+            OUTPUTS = list(pool.map(run_bootstrap, Tasks))
+    else:
+        OUTPUTS = [(bootstrap_block(*Task), None) for Task in Tasks]
+
+    BOOT = {}
+
+    for Estimator, FIT in FITS.items():
+
+        res = FIT['res']
+        Suffix = 'T' if Estimator == 'FOGLS' else ''
+        BLOCKS = [OUTPUT for Owner, (OUTPUT, RECORDS) in zip(Owners, OUTPUTS) if Owner == Estimator]
+        PARAMS = np.vstack([PARAMS for PARAMS, H in BLOCKS])
+        params = res.params.to_numpy()
+
+        H = {Variable: kruskal_h(res.resid.to_numpy(), FIT['restricted'][f'{Variable}{Suffix}']['resid'].to_numpy()) for Variable in Restrictions}
+
+        BOOT[Estimator] = {
+            'bse': pd.Series(PARAMS.std(axis = 0, ddof = 1), index = res.params.index),
+            'ci_lower': pd.Series(np.percentile(PARAMS, 2.5, axis = 0), index = res.params.index),
+            'ci_upper': pd.Series(np.percentile(PARAMS, 97.5, axis = 0), index = res.params.index),
+            'pvalues': pd.Series((1 + (np.abs(PARAMS - params) >= np.abs(params)).sum(axis = 0)) / (len(PARAMS) + 1), index = res.params.index),
+            'KW': {Variable: (1 + sum((Block[1][f'{Variable}{Suffix}'] >= H[Variable]).sum() for Block in BLOCKS)) / (len(PARAMS) + 1) for Variable in Restrictions}
+        }
+
+    for OUTPUT, RECORDS in OUTPUTS:
+        Monitor.merge(RECORDS)
+
+    return BOOT
+
+def run_bootstrap(Task):
+    """
+    Runs bootstrap_block in a worker process, returning its output with the records of its instrumentation.
+    """
+
+    return bootstrap_block(*Task), Monitor.drain()
+
+def kruskal_permutation(A, B, n_permutations = 9999, seed = 42, max_bytes = 64 * 2**20):
+    """
+    Permutation p-value of the Kruskal-Wallis test of two samples. The pooled values are ranked once; as the statistic
+    only depends on the sum of the ranks of one sample, every permutation of the labels is a sum over the rank vector,
+    evaluated in chunks of permutations that use at most max_bytes. All the permutations are enumerated (exact test)
+    when there are at most n_permutations, and n_permutations random ones are used otherwise (Monte Carlo).
+    Returns the statistic (as stats.kruskal), the p-value, its Monte Carlo standard error and whether it is exact.
+    """
+
+    from math import comb
+    from scipy.stats import rankdata, tiecorrect
+
+    A, B = np.asarray(A, dtype = float), np.asarray(B, dtype = float)
+    A, B = A[~np.isnan(A)], B[~np.isnan(B)]
+    n1, N = min(len(A), len(B)), len(A) + len(B)
+
+    ranks = rankdata(np.concatenate([A, B] if len(A) <= len(B) else [B, A]))
+    correction = tiecorrect(ranks)
+
+    # 2 * R1 is an integer (midranks), so the permutations as extreme as the sample are found without rounding errors.
+
+    twice = 2 * ranks
+    center = n1 * (N + 1)
+    distance = abs(twice[:n1].sum() - center)
+    H = 3 * distance**2 / ((N + 1) * n1 * (N - n1)) / correction
+
+    exact = comb(N, n1) <= n_permutations
+    chunk = max(1, int(max_bytes // (16 * N)))
+    rng = np.random.default_rng(seed)
+
+    Total, Extreme = 0, 0
+
+    with Monitor.stage('permutation'):
+
+        if exact:
+            Subsets = itertools.combinations(range(N), n1)
+            while CHUNK := list(itertools.islice(Subsets, chunk)):
+                Extreme += int((np.abs(twice[np.array(CHUNK)].sum(axis = 1) - center) >= distance).sum())
+                Total += len(CHUNK)
+        else:
+            while Total < n_permutations:
+                m = min(chunk, n_permutations - Total)
+                SUBSETS = np.argpartition(rng.random((m, N)), n1 - 1, axis = 1)[:, :n1]
+                Extreme += int((np.abs(twice[SUBSETS].sum(axis = 1) - center) >= distance).sum())
+                Total += m
+
+    pvalue = Extreme / Total if exact else (1 + Extreme) / (1 + Total)
+
+    return {'statistic': H, 'pvalue': pvalue, 'error': 0.0 if exact else np.sqrt(pvalue * (1 - pvalue) / Total), 'exact': exact}
+
+def permutation_region(FITS, Restrictions = ('DIL', 'IDX'), n_permutations = 9999, seed = 42, key = ''):
+    """
+    Permutation KW tests (kruskal_permutation) of the residuals of every model of a region (from estimate_region)
+    against those of the model without each variable in Restrictions, with a seed for each region (key), model and variable.
+    """
+
+    PERM = {}
+
+    for Estimator, FIT in FITS.items():
+
+        Suffix = 'T' if Estimator == 'FOGLS' else ''
+        PERM[Estimator] = {}
+
+        for Variable in Restrictions:
+            Seed = np.random.SeedSequence(seed, spawn_key = [zlib.crc32(Part.encode()) for Part in (str(key), Estimator, Variable)])
+            PERM[Estimator][Variable] = kruskal_permutation(FIT['res'].resid, FIT['restricted'][f'{Variable}{Suffix}']['resid'], n_permutations, Seed)
+
+    return PERM
+
+def grouped_ols(y, X, codes, G):
+    """
+    Estimates, with HC1 covariance, one OLS model for each of the G groups of rows given by codes (0 to G - 1), as
+    statsmodels does: pseudoinverse of X'X and residual degrees of freedom from the rank of each group.
+    X'X, X'y and the HC1 meat of every group are segment sums over the rows sorted by group, and all the groups are
+    solved at once with a batched pseudoinverse. Returns params, cov, bse, pvalues (normal, as statsmodels for HC1),
+    ssr, nobs and rank of each group; the groups without rows (or without residual degrees of freedom) are NaN.
+    """
+
+    from scipy import stats
+
+    y = np.asarray(y, dtype = float).ravel()
+    X = np.asarray(X, dtype = float)
+    k = X.shape[1]
+
+    order = np.argsort(codes, kind = 'stable')
+    codes, y, X = codes[order], y[order], X[order]
+
+    nobs = np.bincount(codes, minlength = G)
+    present = nobs > 0
+    starts = (np.cumsum(nobs) - nobs)[present]
+
+    def segment_sum(V):
+
+        S = np.zeros((G,) + V.shape[1:])
+        if len(V):
+            S[present] = np.add.reduceat(V, starts, axis = 0)
+
+        return S
+
+    P = X[:, :, None] * X[:, None, :]
+    XX = segment_sum(P)
+    XX_inv = np.linalg.pinv(XX)
+    params = (XX_inv @ segment_sum(X * y[:, None])[..., None])[..., 0]
+
+    resid = y - np.einsum('ij,ij->i', X, params[codes])
+    meat = segment_sum(P * resid[:, None, None]**2)
+
+    rank = np.linalg.matrix_rank(XX)
+    df_resid = nobs - rank
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+
+        cov = XX_inv @ meat @ XX_inv * np.where(df_resid > 0, nobs / df_resid, np.nan)[:, None, None]
+        bse = np.sqrt(np.diagonal(cov, axis1 = 1, axis2 = 2))
+        pvalues = 2 * stats.norm.sf(np.abs(params / bse))
+
+    params[~present] = np.nan
+
+    return {'params': params, 'cov': cov, 'bse': bse, 'pvalues': pvalues, 'ssr': segment_sum(resid**2), 'nobs': nobs, 'rank': rank}
+
+def estimate_groups(DATA, By = 'Country', Samples = ('F',), Formula = 'ARR ~ DIL + IDX + ISC + CAP', Orders = None):
+    """
+    Estimates the OLS, FGLS and FOGLS models of estimate_region for every group of By (Country or Region) and sample
+    (F, 1, 2, 3, DIL, nDIL, IDX, nIDX) at once with grouped_ols; only the ARIMA models that give the AR coefficient
+    of each group are fitted one by one. The ARIMA order of a group is that of its region in Orders (ORDERS by default).
+    Returns a tidy DataFrame with the coefficient, HC1 standard error and p-value of every term, group, sample and estimator
+    (the groups with fewer observations than terms are only estimated by OLS).
+    """
+
+    from patsy import dmatrices
+
+    Orders = ORDERS if Orders is None else Orders
+
+    with Monitor.stage('filter'):
+        data = DATA.dropna(subset=['ARR', 'DIL', 'IDX', 'ISC', 'CAP'])
+        data = data[clean_mask(data)].reset_index(drop=True)
+
+    y, X = dmatrices(Formula, data, return_type = 'dataframe')
+    Names = list(X.columns)
+    y, X = y.to_numpy()[:, 0], X.to_numpy()
+
+    group, Groups = pd.factorize(data[By].astype(str), sort = True)
+    Region = data['Region'].astype(str).to_numpy()
+
+    # Rows of every (group, sample), in the order of the data; a row belongs to one group of each sample dimension.
+
+    ROWS, CODES = [], []
+
+    for s, Sample in enumerate(Samples):
+        rows = np.flatnonzero(sample_rows(data, Sample))
+        ROWS.append(rows)
+        CODES.append(group[rows] * len(Samples) + s)
+
+    rows, codes = np.concatenate(ROWS), np.concatenate(CODES)
+    order = np.argsort(codes, kind = 'stable')
+    rows, codes = rows[order], codes[order]
+    G = len(Groups) * len(Samples)
+
+    with Monitor.stage('fit'):
+        FITS = {'OLS': grouped_ols(y[rows], X[rows], codes, G)}
+
+    # FGLS (Prais-Winsten) and FOGLS (Cochrane-Orcutt, without the first observation) with the AR coefficient of each group.
+
+    WHITE = {'FGLS': ([], [], []), 'FOGLS': ([], [], [])}     # Transformed y, X and group of each estimator.
+    bounds = np.r_[0, np.cumsum(np.bincount(codes, minlength = G))]
+
+    for g in range(G):
+
+        segment = rows[bounds[g]:bounds[g + 1]]
+
+        if len(segment) <= X.shape[1]:
+            continue
+
+        try:
+            rho = arima_rho(pd.Series(y[segment]), Orders[Region[segment[0]]])
+            TRANSFORMED = {'FGLS': (ar_whiten(y[segment], rho), ar_whiten(X[segment], rho)),
+                           'FOGLS': (ar_filter(y[segment], rho), ar_filter(X[segment], rho))}
+        except (np.linalg.LinAlgError, ValueError):
+            continue
+
+        for Estimator, (ty, tX) in TRANSFORMED.items():
+            WHITE[Estimator][0].append(ty)
+            WHITE[Estimator][1].append(tX)
+            WHITE[Estimator][2].append(np.full(len(ty), g))
+
+    for Estimator, (ty, tX, tcodes) in WHITE.items():
+
+        ty = np.concatenate(ty) if ty else np.empty(0)
+        tX = np.concatenate(tX) if tX else np.empty((0, X.shape[1]))
+        tcodes = np.concatenate(tcodes) if tcodes else np.empty(0, dtype = int)
+
+        if Estimator == 'FOGLS':
+            tX[:, Names.index('Intercept')] = 1.0   # The intercept is kept, as in estimate_region.
+
+        with Monitor.stage('fit'):
+            FITS[Estimator] = grouped_ols(ty, tX, tcodes, G)
+
+    # Tidy table of the groups with results.
+
+    TABLE = []
+
+    for Estimator, FIT in FITS.items():
+        for g in np.flatnonzero(FIT['nobs'] > 0):
+            for j, Term in enumerate(Names):
+                TABLE.append({By: Groups[g // len(Samples)], 'Sample': Samples[g % len(Samples)], 'Estimator': Estimator,
+                              'Term': Term if Estimator != 'FOGLS' or Term == 'Intercept' else f'{Term}T', 'Coefficient': FIT['params'][g, j],
+                              'Std. Error': FIT['bse'][g, j], 'p-value': FIT['pvalues'][g, j], 'N': FIT['nobs'][g]})
+
+    return pd.DataFrame(TABLE)
+
+def region_table(Region, FITS, BOOT = None, PERM = None):
+    """
+    Obtains the coefficients of the models of a region (from estimate_region) in a tidy DataFrame, with the KW p-value
+    of the model without each restricted variable, their bootstrap counterparts if BOOT (from bootstrap_region) is given,
+    and the permutation KW p-values if PERM (from permutation_region) is given.
+    """
+
+    TABLE = []
+
+    for Estimator, FIT in FITS.items():
+
+        res = FIT['res']
+
+        for Term in res.params.index:
+            Variable = Term[:-1] if Estimator == 'FOGLS' and Term != 'Intercept' else Term
+            TABLE.append({'Region': Region, 'Estimator': Estimator, 'Term': Term, 'Coefficient': res.params[Term],
+                          'Std. Error': res.bse[Term], 'p-value': res.pvalues[Term], 'KW p-value': FIT['KW'].get(Variable, np.nan)})
+
+            if BOOT is not None:
+                TABLE[-1].update({'Bootstrap Std. Error': BOOT[Estimator]['bse'][Term], 'Bootstrap p-value': BOOT[Estimator]['pvalues'][Term],
+                                  'Bootstrap KW p-value': BOOT[Estimator]['KW'].get(Variable, np.nan)})
+
+            if PERM is not None:
+                TEST = PERM[Estimator].get(Variable, {})
+                TABLE[-1].update({'Permutation KW p-value': TEST.get('pvalue', np.nan), 'Permutation KW error': TEST.get('error', np.nan)})
+
+    return pd.DataFrame(TABLE)
+
+ORDERS = {'AFR': (1, 0, 0), 'AME': (2, 1, 0), 'ASI': (1, 0, 0), 'EUR': (1, 0, 1)}     # Optimal ARIMA orders for each region.
+
+ORDER_GRID = [(p, d, q) for p in (1, 2, 3) for d in (0, 1) for q in (0, 1, 2)]            # ARIMA orders compared by select_order (with AR terms, as rho is one of them).
+
+ARGLS_CLASS = None      # ARGLS model, once defined (see argls_class).
+
+ACCUMULATOR_VERSION = 2     # Changes whenever the sums of ols_accumulators change, so that a saved state is rebuilt.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
+
 #################### START OF THE CODE ####################
 
-DATA = pd.read_csv('Verdu_Carchano_Ruiz_2025_Data.csv', delimiter = ';') # Open the data file.
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Models of the returns from the arbitrage strategy.')
+    parser.add_argument('--monitor', default = None, help = 'JSON lines file where the time of each stage and the warnings of each region are saved.')
+    parser.add_argument('--bootstrap', type = int, default = None, help = 'Number of bootstrap replicates for the coefficients and KW tests (none by default).')
+    parser.add_argument('--method', default = 'wild', choices = ['wild', 'pairs'], help = 'Bootstrap of the residuals (wild) or of the offerings (pairs).')
+    parser.add_argument('--permutations', type = int, default = None, help = 'Number of permutations of the KW tests (exact if there are fewer possible ones; none by default).')
+    parser.add_argument('--select', default = None, help = 'JSON file where the ARIMA orders selected for each region are kept (the orders of the article are used otherwise).')
+    parser.add_argument('--rolling', default = None, help = 'NPZ file where the paths of the OLS coefficients and HC1 standard errors of each region over rolling windows are saved.')
+    parser.add_argument('--window', type = int, default = None, help = 'Number of offerings of each window of --rolling (expanding windows by default).')
+    parser.add_argument('--state', default = None, help = 'JSON file with the OLS sums of each region: only the offerings appended since its last update are read (OLS models only).')
+    ARGS = parser.parse_args()
+
+    if ARGS.state and (ARGS.bootstrap or ARGS.permutations or ARGS.select):
+        parser.error('--state only estimates the OLS models: --bootstrap, --permutations and --select cannot be used with it.')
 
-Regions = ['AFR', 'AME', 'ASI', 'EUR']
+    Monitor.enable(ARGS.monitor is not None)
 
-Countries = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
+    DATA = load_data('Verdu_Carchano_Ruiz_2025_Data.csv')     # Open the data file (through its columnar cache).
 
-##### MODELLING THE RETURNS FROM THE STRATEGY #####
+    Regions = ['AFR', 'AME', 'ASI', 'EUR']
 
-### Defining the models to be estimated ###
+    Countries = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
 
-Formula = 'ARR ~ DIL + IDX + ISC + CAP'     # General Model
+    ##### MODELLING THE RETURNS FROM THE STRATEGY #####
 
-Formula_DIL = 'ARR ~ IDX + ISC + CAP'       # Restricted model for DIL.
-Formula_IDX = 'ARR ~ DIL + ISC + CAP'       # Restricted model for IDX.
+    ### Defining the models to be estimated ###
 
-Orders = [(1, 0, 0), (2, 1, 0), (1, 0, 0), (1, 0, 1)]   # Optimal ARIMA orders for each region.
+    Formula = 'ARR ~ DIL + IDX + ISC + CAP'     # General Model
 
-### Estimating the models by regions ###
+    Restrictions = ['DIL', 'IDX']               # Restricted models, without DIL and without IDX.
 
-for R in range(0, len(Regions)):
+    Orders = [(1, 0, 0), (2, 1, 0), (1, 0, 0), (1, 0, 1)]   # Optimal ARIMA orders for each region.
 
-    data = DATA[DATA['Region'] == Regions[R]]
-    data = data.dropna(subset=['ARR', 'DIL', 'IDX', 'ISC', 'CAP'])
-    data = data.reset_index(drop=True)
+    Rhos = [None] * len(Regions)                            # AR coefficients, obtained from the orders unless they are selected.
 
-    ## Filtering the errors ##
+    ### Incremental estimation of the OLS models ###
 
-    data = data[data['OUT'] == 0]
-    data = data[data['DIL'] != 0]
-    data = data[data['ISC'] != 0]
-    data = data[data['CAP'] != 0]
+    if ARGS.state:
 
-    print(f'==================== OLS Estimation for: {Regions[R]} ====================')
+        TABLE = incremental_table(update_accumulators(DATA, Regions, Formula, ARGS.state))
 
-    mod_ols = smf.ols(Formula, data)
-    res_ols = mod_ols.fit(cov_type = 'HC1')
-    ols_resid = res_ols.resid
-    print(res_ols.summary())
+        for Region, REGION in TABLE.groupby('Region', sort = False):
+            print(f'==================== OLS Estimation for: {Region} (incremental, {REGION["N"].iloc[0]} offerings) ====================')
+            print(REGION.set_index('Term')[['Coefficient', 'Std. Error', 'p-value']].to_string(float_format = '{:.4f}'.format))
+            print()
 
-    mod_ols_DIL = smf.ols(Formula_DIL, data)
-    res_ols_DIL = mod_ols_DIL.fit(cov_type = 'HC1')
-    DIL_ols_resid = res_ols_DIL.resid
+    else:
 
-    ols_KW_res_DIL = stats.kruskal(ols_resid, DIL_ols_resid)
-    print(f'KW Test for DIL: {ols_KW_res_DIL[1]:.4f}')
+        if ARGS.select:
+            SELECTED = select_orders(DATA, Regions, workers = os.cpu_count() or 1, path = ARGS.select)
+            Orders = [SELECTED[Region]['order'] if Region in SELECTED else Orders[R] for R, Region in enumerate(Regions)]
+            Rhos = [SELECTED[Region]['rho'] if Region in SELECTED else None for Region in Regions]
+            print('Selected ARIMA orders: ' + ', '.join(f'{Region} {Order}' for Region, Order in zip(Regions, Orders)) + '\n')
 
-    mod_ols_IDX = smf.ols(Formula_IDX, data)
-    res_ols_IDX = mod_ols_IDX.fit(cov_type = 'HC1')
-    IDX_ols_resid = res_ols_IDX.resid
+        ### Estimating the models by regions ###
 
-    ols_KW_res_IDX = stats.kruskal(ols_resid, IDX_ols_resid)
-    print(f'KW Test for IDX: {ols_KW_res_IDX[1]:.4f}')
-    print()
+        for R in range(0, len(Regions)):
 
-    print(f'==================== FGLS Estimation for: {Regions[R]} ====================')
+            ## Filtering the errors ##
 
-    mod_arima = sm.tsa.arima.ARIMA(endog = data['ARR'], order = Orders[R]) 
-    res_arima = mod_arima.fit()
+            data = region_sample(DATA, Regions[R])
 
-    rho = res_arima.params[1]
-    
-    order = toeplitz(range(len(data)))
-    sigma = rho ** order
+            with Monitor.capture(Regions[R]):
+                FITS = estimate_region(data, Formula, Orders[R], Restrictions, rho = Rhos[R])
 
-    mod_fgls = smf.gls(Formula, data, sigma = sigma)
-    res_fgls = mod_fgls.fit(cov_type = 'HC1')
-    fgls_resid = res_fgls.resid
-    print(res_fgls.summary())
+            if ARGS.bootstrap:
+                BOOT = bootstrap_region(FITS, Restrictions, n_bootstrap = ARGS.bootstrap, method = ARGS.method, key = Regions[R], workers = os.cpu_count() or 1)
 
-    mod_fgls_DIL = smf.gls(Formula_DIL, data, sigma = sigma)
-    res_fgls_DIL = mod_fgls_DIL.fit(cov_type = 'HC1')
-    DIL_fgls_resid = res_fgls_DIL.resid
+            if ARGS.permutations:
+                PERM = permutation_region(FITS, Restrictions, n_permutations = ARGS.permutations, key = Regions[R])
 
-    fgls_KW_res_DIL = stats.kruskal(fgls_resid, DIL_fgls_resid)
-    print(f'KW Test for DIL: {fgls_KW_res_DIL[1]:.4f}')
+            for Estimator in ('OLS', 'FGLS', 'FOGLS'):
 
-    mod_fgls_IDX = smf.gls(Formula_IDX, data, sigma = sigma)
-    res_fgls_IDX = mod_fgls_IDX.fit(cov_type = 'HC1')
-    IDX_fgls_resid = res_fgls_IDX.resid
+                print(f'==================== {Estimator} Estimation for: {Regions[R]} ====================')
+                print(FITS[Estimator]['res'].summary())
 
-    fgls_KW_res_IDX = stats.kruskal(fgls_resid, IDX_fgls_resid)
-    print(f'KW Test for IDX: {fgls_KW_res_IDX[1]:.4f}')
-    print()
+                print(f'KW Test for DIL: {FITS[Estimator]["KW"]["DIL"]:.4f}')
+                print(f'KW Test for IDX: {FITS[Estimator]["KW"]["IDX"]:.4f}')
 
-    print(f'==================== FOGLS Estimation for: {Regions[R]} ====================')
+                if ARGS.bootstrap:
+                    print(f'{ARGS.method.capitalize()} bootstrap ({ARGS.bootstrap} replicates):')
+                    print(pd.DataFrame({'std err': BOOT[Estimator]['bse'], 'P>|z|': BOOT[Estimator]['pvalues'], '[0.025': BOOT[Estimator]['ci_lower'],
+                                        '0.975]': BOOT[Estimator]['ci_upper']}).to_string(float_format = '{:.4f}'.format))
+                    print(f'Bootstrap KW Test for DIL: {BOOT[Estimator]["KW"]["DIL"]:.4f}')
+                    print(f'Bootstrap KW Test for IDX: {BOOT[Estimator]["KW"]["IDX"]:.4f}')
 
-    Formula_Res = 'RES1 ~ RES0'
-    Formula_T = 'ARRT ~ DILT + IDXT + ISCT + CAPT'
+                if ARGS.permutations:
+                    for Variable in Restrictions:
+                        TEST = PERM[Estimator][Variable]
+                        print(f'Permutation KW Test for {Variable}: {TEST["pvalue"]:.4f}' + (' (exact)' if TEST['exact'] else f' (MC error {TEST["error"]:.4f})'))
 
-    Formula_DILT = 'ARRT ~ IDXT + ISCT + CAPT'
-    Formula_IDXT = 'ARRT ~ DILT + ISCT + CAPT'
+                if Estimator != 'FOGLS':
+                    print()
 
-    N = len(data)
+    ### Rolling estimation of the OLS models ###
 
-    arr_t = data['ARR']
-    dil_t = data['DIL']
-    idx_t = data['IDX']
-    isc_t = data['ISC']
-    cap_t = data['CAP']
+    if ARGS.rolling:
 
-    ARR_T = arr_t[1:] - rho * arr_t[:-1]
-    DIL_T = arr_t[1:] - rho * dil_t[:-1]
-    IDX_T = idx_t
-    ISC_T = arr_t[1:] - rho * isc_t[:-1]
-    CAP_T = arr_t[1:] - rho * cap_t[:-1]
+        if not ARGS.state:
+            print()
 
-    data_T = {'ARRT': ARR_T, 'DILT': DIL_T, 'IDXT': IDX_T, 'ISCT': ISC_T, 'CAPT': CAP_T}
-    data_T = pd.DataFrame(data_T)
+        PATHS = {}
 
-    mod_fogls = smf.ols(Formula_T, data_T)
-    res_fogls = mod_fogls.fit(cov_type = 'HC1')
-    fogls_resid = res_fogls.resid
-    print(res_fogls.summary())
+        for Region in Regions:
 
-    mod_fogls_DIL = smf.ols(Formula_DILT, data_T)
-    res_fogls_DIL = mod_fogls_DIL.fit(cov_type = 'HC1')
-    DIL_fogls_resid = res_fogls_DIL.resid
+            PATH = rolling_region(region_sample(DATA, Region), Formula, ARGS.window)
+            PATHS.update({f'{Region}_params': PATH['params'], f'{Region}_bse': PATH['bse'], f'{Region}_nobs': PATH['nobs']})
 
-    fogls_KW_res_DIL = stats.kruskal(fogls_resid, DIL_fogls_resid)
-    print(f'KW Test for DIL: {fogls_KW_res_DIL[1]:.4f}')
+            valid = ~np.isnan(PATH['params'][:, 0])
+            print(f'==================== Rolling OLS Estimation for: {Region} ({valid.sum()} windows) ====================')
+            print(pd.DataFrame({'min': np.nanmin(PATH['params'], axis = 0), 'max': np.nanmax(PATH['params'], axis = 0),
+                                'last': PATH['params'][-1], 'last std err': PATH['bse'][-1]}, index = PATH['names']).to_string(float_format = '{:.4f}'.format))
+            print()
 
-    mod_fogls_IDX = smf.ols(Formula_IDXT, data_T)
-    res_fogls_IDX = mod_fogls_IDX.fit(cov_type = 'HC1')
-    IDX_fogls_resid = res_fogls_IDX.resid
+        np.savez(ARGS.rolling, names = PATH['names'], **PATHS)
 
-    fogls_KW_res_IDX = stats.kruskal(fogls_resid, IDX_fogls_resid)
-    print(f'KW Test for IDX: {fogls_KW_res_IDX[1]:.4f}')
+    if ARGS.monitor:
+        Monitor.report(ARGS.monitor)
 
 #################### END OF THE CODE ####################
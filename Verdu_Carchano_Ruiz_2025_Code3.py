@@ -18,12 +18,25 @@
 
 import warnings                         # Allows to ignore certain warnings and get a cleaner output.
 import itertools                        # Allows to work with combinations and permutations.
-
+import os                               # Allows to know the number of available processors.
+import sys                              # Allows to report the progress on the standard error.
+import time                             # Allows to measure the elapsed time and estimate the remaining one.
+import heapq                            # Allows to dispatch the most expensive tasks first.
+import argparse                         # Allows to read the options of the command line.
+import hashlib                          # Allows to identify the samples in the cache.
+import json                             # Allows to save the parameters in the cache.
+import sqlite3                          # Allows to keep the fitted models in a cache on disk.
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED  # Allows to run the tasks in parallel processes.
+
+import numpy as np                      # Allows to work with Series.
 import pandas as pd						# Allows to organize the Data.
-import statsmodels.api as sm            # Allows to apply regression methods.
-import statsmodels.formula.api as smf	# Allows to apply regression methods.
 
-from scipy.linalg import toeplitz
+from scipy.special import ndtr, ndtri   # Normal cumulative distribution function and its inverse.
+from scipy.linalg import qr             # Allows to find the linearly dependent columns of each candidate.
+
+from Verdu_Carchano_Ruiz_2025_Store import load_data, clean_mask, COUNTRIES   # Allows to open the data through its typed cache.
+import Verdu_Carchano_Ruiz_2025_Monitor as Monitor                  # Allows to time the stages, count the fits and capture the warnings.
 
 warnings.filterwarnings('ignore')
 
@@ -32,197 +45,1462 @@ warnings.filterwarnings('ignore')
 def success(FIT, DEP):
     """
     Calculate the success in predicting the result of an arbitrage opportunity.
+    Raises ZeroDivisionError when there are no arbitrages or no non-arbitrages.
     """
 
-    Low = 1/3		# Maximum to consider a success in the estimation of a non-arbitrage.
-    Up = 1 - Low	# Maximum to consider a success in the estimation of a arbitrage.
+    DEP = np.asarray(DEP, dtype = float)
 
     # We obtain the total number of arbitrages and non-arbitrages.
 
-    pos = 0
-    neg = 0
+    pos = np.count_nonzero(DEP == 1)
+    neg = np.count_nonzero(DEP == 0)
+
+    if pos == 0 or neg == 0:
+        raise ZeroDivisionError('division by zero')
+
+    SCORE = score_batch(np.asarray(FIT, dtype = float)[None, :], DEP)
+
+    return SCORE['suc'][0, 0], SCORE['suc_p'][0, 0], SCORE['suc_n'][0, 0]
+
+def score_batch(FIT, y, Low = (1/3,), Up = None, prob = None):
+    """
+    Calculates the success of a batch of fits (models x rows) for several thresholds at once.
+    A non-arbitrage is a success when its fitted value is at most Low and an arbitrage when it is at least Up
+    (1 - Low by default). Returns the success rates ('suc', 'suc_p', 'suc_n', as models x thresholds),
+    the AUC of each fit and, if the fitted probabilities are given, the Brier score.
+    """
+
+    from scipy import stats     # Imported on first use (to rank the fitted values), so that the selective runs start faster.
+
+    Low = np.atleast_1d(np.asarray(Low, dtype = float))
+    Up = 1 - Low if Up is None else np.atleast_1d(np.asarray(Up, dtype = float))
+    M, T = FIT.shape[0], len(Low)
+
+    P, N = FIT[:, y == 1], FIT[:, y == 0]
+    pos, neg = P.shape[1], N.shape[1]
+
+    def below(V, Thresholds, strict):
+        """
+        Counts, for every row of V, the values below each threshold (strictly or not) with one sort and one cumsum.
+        With the thresholds placed after the values, a stable sort leaves the values equal to a threshold before it.
+        """
+
+        Values = np.concatenate([V, np.broadcast_to(Thresholds, (M, T))] if not strict else [np.broadcast_to(Thresholds, (M, T)), V], axis = 1)
+        IsValue = np.r_[np.ones(V.shape[1]), np.zeros(T)] if not strict else np.r_[np.zeros(T), np.ones(V.shape[1])]
+
+        Order = np.argsort(Values, axis = 1, kind = 'stable')
+        Count = np.cumsum(IsValue[Order], axis = 1)
+
+        Rank = np.empty_like(Order)     # Position of each value and threshold in the sorted rows.
+        np.put_along_axis(Rank, Order, np.broadcast_to(np.arange(Order.shape[1]), Order.shape), axis = 1)
 
-    for a in range(0, len(DEP)):
-        if DEP[a] == 1:
-            pos = pos + 1
-        elif DEP[a] == 0:
-            neg = neg + 1
+        return np.take_along_axis(Count, Rank[:, IsValue == 0], axis = 1)
 
-    F = len(FIT)
-    PRD_P, PRD_N, PRD = [], [], []	# Number of success for each cathegory (arbitrage, non-arbitrage and total).
+    HIT_N = below(N, Low, strict = False)
+    HIT_P = np.count_nonzero(~np.isnan(P), axis = 1)[:, None] - below(P, Up, strict = True)     # NaN fits are never a success.
 
-    for f in range(0,F):
-        if (DEP[f] == 0 and FIT[f] <= Low):
-            PRD_N.append(1)
-            PRD.append(1)
-        elif (DEP[f] == 1 and FIT[f] >= Up):
-            PRD_P.append(1)
-            PRD.append(1)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
 
-    # The success rate is obtained.
-    
-    suc_p = (sum(PRD_P) / pos)
-    suc_n = (sum(PRD_N) / neg)
-    suc = (sum(PRD) / len(DEP))
+        SCORE = {
+            'suc': (HIT_P + HIT_N) / len(y),
+            'suc_p': HIT_P / pos,
+            'suc_n': HIT_N / neg,
+            'auc': ((stats.rankdata(FIT, axis = 1)[:, y == 1].sum(axis = 1) - pos * (pos + 1) / 2) / (pos * neg)),
+            'brier': ((prob - y)**2).mean(axis = 1) if prob is not None else None
+        }
 
-    return suc, suc_p, suc_n
+    return SCORE
 
-def predict_mod(data, Model):
+def threshold_table(FIT, DEP, prob = None, Low = np.linspace(0.05, 0.5, 10)):
     """
-    Obtaining the model that best precicts the number of opportunities of arbitrage.
+    Obtains the success of a fit for several thresholds (Low and Up = 1 - Low), with its AUC and Brier score.
     """
 
-    ### Step 1: Main variables from the model. ###
+    SCORE = score_batch(np.asarray(FIT, dtype = float)[None, :], np.asarray(DEP, dtype = float), Low = Low,
+                        prob = None if prob is None else np.asarray(prob, dtype = float)[None, :])
 
-    Variables1 = ('DIL', 'IDX', 'ISC', 'CAP', 'GEN', 'ACQ', 'INV', 'REF')
-    Formulas1 = []
-    SUC_P1 = []
+    TABLE = pd.DataFrame({'Low': Low, 'Up': 1 - np.asarray(Low), 'Success': SCORE['suc'][0], 'ARB': SCORE['suc_p'][0], 'nARB': SCORE['suc_n'][0]})
+    TABLE['AUC'] = SCORE['auc'][0]
+    TABLE['Brier'] = SCORE['brier'][0] if prob is not None else np.nan
 
-    ## Obtaining all combinations of variables for the model. ##
+    return TABLE
 
-    for i in range(1, len(Variables1) + 1):
-        for combo in itertools.combinations(Variables1, i):
-            formula = "ARB ~ " + " + ".join(combo)
-            Formulas1.append(formula)
+def design_matrix(data):
+    """
+    Builds, once per sample, the design matrix with every column that a candidate model can use:
+    the intercept, the main variables, the economic sectors and the interactions of DIL with the sectors.
+    Rows without ARB are dropped; the missing values of the other columns are kept as NaN, and each candidate drops the
+    rows where its own columns are missing (see candidate_rows), as patsy does for each formula.
+    """
+
+    Values = data[['ARB'] + list(Variables1) + list(Sectors)].to_numpy(dtype = float)[complete_rows(data)]
+
+    y = Values[:, 0]
+    X = np.column_stack([np.ones(len(Values)), Values[:, 1:], Values[:, [1]] * Values[:, 1 + len(Variables1):]])
+
+    return X, y
+
+def complete_rows(data):
+    """
+    Obtains the mask of the rows of a sample kept in its design matrix (those with ARB).
+    """
+
+    return data['ARB'].notna().to_numpy()
+
+def candidate_rows(X, Candidates):
+    """
+    Groups the candidates (lists of columns of X) by the rows that they use: those without missing values in their own
+    columns, as patsy keeps them for each formula. Returns (rows, candidates) pairs, with rows None for every row.
+    """
+
+    Missing = np.isnan(X)
+
+    if not Missing.any():
+        return [(None, list(range(len(Candidates))))]
+
+    GROUPS = {}
+
+    for m, Cols in enumerate(Candidates):
+        rows = ~Missing[:, Cols].any(axis = 1)
+        GROUPS.setdefault(rows.tobytes(), (rows, []))[1].append(m)
+
+    return [(None if rows.all() else rows, Group) for rows, Group in GROUPS.values()]
+
+def term_columns(Terms):
+    """
+    Obtains the columns of the design matrix used by a model with the given terms, in the order patsy gives them
+    (intercept, main effects and then interactions, each in order of appearance).
+    """
+
+    Main, Interactions = [], []
+
+    for Term in Terms:
+        if '*' in Term:
+            A, B = [Part.strip() for Part in Term.split('*')]
+            Main += [A, B]
+            Interactions.append(f'{A}:{B}')
+        else:
+            Main.append(Term)
+
+    Used = dict.fromkeys(['Intercept'] + Main + Interactions)     # Ordered and without repetitions.
+
+    return [Columns.index(Column) for Column in Used]
+
+def fit_binary(X, y, Model, start = None, cov = False, maxiter = 35, tol = 1e-8):
+    """
+    Fits a logit (LGT) or probit (PRT) model by Newton-Raphson, with the same steps, ridge and stopping rule as
+    statsmodels' default fit. Returns the linear predictor, the fitted probabilities, the parameters,
+    the convergence status and, if cov = True, the HC1 covariance (computed as statsmodels does for discrete models).
+    Raises np.linalg.LinAlgError when the Hessian is singular, as statsmodels does.
+    """
+
+    n, k = X.shape
+    q = 2 * y - 1
+
+    def derivatives(params):
+
+        XB = X @ params
+
+        if Model == 'LGT':
+            L = 1 / (1 + np.exp(-XB))
+            score = (y - L) @ X
+            weight = L * (1 - L)
+            score_obs = (y - L)
+        else:
+            L = q * np.exp(-0.5 * (q * XB) ** 2) / np.sqrt(2 * np.pi) / np.clip(ndtr(q * XB), FLOAT_EPS, 1 - FLOAT_EPS)
+            score = L @ X
+            weight = L * (L + XB)
+            score_obs = L
+
+        return score, (X.T * weight) @ X, score_obs
+
+    # Newton-Raphson on the average negative log-likelihood.
+
+    params = np.zeros(k) if start is None else np.asarray(start, dtype = float)
+    old = np.inf
+    iterations = 0
+
+    while iterations < maxiter and np.any(np.abs(params - old) > tol):
+        score, H, _ = derivatives(params)
+        H = H / n
+        H[np.diag_indices(k)] += 1e-10
+        old = params
+        params = old - np.linalg.solve(H, -score / n)
+        iterations += 1
 
-    ## Estimation of each model and obtention of the success rate. ##
+    score, H, score_obs = derivatives(params)
+    H_inv = np.linalg.inv(H / n) / n    # Raises for a singular Hessian.
 
-    for Formula1 in Formulas1:
+    XB = X @ params
 
-        try:
+    FIT = {
+        'linear': XB,
+        'prob': 1 / (1 + np.exp(-XB)) if Model == 'LGT' else ndtr(XB),
+        'params': params,
+        'converged': iterations < maxiter,
+        'iterations': iterations
+    }
 
-            if Model == 'LGT':
-                mod = smf.logit(Formula1, data)
-            elif Model == 'PRT':
-                mod = smf.probit(Formula1, data)
+    if cov:
+        S = X * score_obs[:, None]
+        FIT['cov'] = H_inv @ (S.T @ S) @ H_inv
 
-            res = mod.fit(cov_type = 'HC1', disp = 0, warn_convergence = False) #white robustness.
-            pred = res.predict()
+    Monitor.count('fits attempted')
+    Monitor.count('fits converged', FIT['converged'])
+    Monitor.histogram('Newton iterations', [iterations])
 
-            # We  extract the fitted values to annalyze the success of the model.
+    return FIT
 
-            FIT = res.fittedvalues.values
-            DEP = data['ARB'].values.tolist()
+def fit_binary_batch(X, y, Model, Candidates, start = None, maxiter = 35, tol = 1e-8, max_bytes = 64 * 2**20):
+    """
+    Fits many candidate models (lists of columns of X) at once with the Newton steps of fit_binary.
+    The candidates with the same number of columns are stacked in a (models x rows x columns) array and every iteration
+    solves the batch of Hessians with one np.linalg.solve; converged models leave the active set. Without padding, and
+    with every stacked array contiguous, the arithmetic of each fit does not depend on the other models of its batch.
+    The starting values of each candidate can be given in start (None for zeros).
+    Returns the linear predictors, fitted probabilities, parameters (zero-padded), iterations, convergence status,
+    and whether each fit succeeded (False where fit_binary would raise for a singular Hessian). A separated fit, whose
+    linear predictor has the sign of y - 1/2 in every row (so that its parameters diverge), succeeds if and only if its
+    columns are linearly independent: its Hessian vanishes along the fit, so that whether it is singular would otherwise
+    depend on the rounding of the last steps.
+    """
+
+    n = X.shape[0]
+    M = len(Candidates)
+    K = max(len(Cols) for Cols in Candidates)
+
+    FIT = {
+        'linear': np.empty((M, n)),
+        'prob': np.empty((M, n)),
+        'params': np.zeros((M, K)),
+        'iterations': np.zeros(M, dtype = int),
+        'converged': np.zeros(M, dtype = bool),
+        'success': np.zeros(M, dtype = bool)
+    }
+
+    # The candidates are batched by size, so that no batch is padded.
+
+    Sizes = np.array([len(Cols) for Cols in Candidates])
+    Batches = []
+
+    for k in np.unique(Sizes):
+        Same = np.flatnonzero(Sizes == k)
+        chunk = max(1, int(max_bytes // (8 * n * k * 3)))
+        Batches += [Same[first:first + chunk] for first in range(0, len(Same), chunk)]
+
+    for Batch in Batches:
+
+        k = Sizes[Batch[0]]
+        X_all = np.ascontiguousarray(X[:, [Candidates[m] for m in Batch]].transpose(1, 0, 2))     # (models, rows, columns)
+
+        params = np.zeros((len(Batch), k))
+
+        if start is not None:
+            for i, m in enumerate(Batch):
+                if start[m] is not None:
+                    params[i] = start[m]
+
+        iterations = np.zeros(len(Batch), dtype = int)
+
+        # Active set: the design matrices are compacted only when some models leave it.
+
+        active = np.arange(len(Batch))
+        Xa, pa = X_all, params.copy()
+
+        while len(active):
+
+            score, H, _ = batch_derivatives(Xa, y, pa, Model)
+            H = H / n
+            H[:, np.arange(k), np.arange(k)] += 1e-10
+
+            old = pa
+            pa = old - np.linalg.solve(H, -score[..., None] / n)[..., 0]
+            iterations[active] += 1
+            params[active] = pa
+
+            moving = np.any(np.abs(pa - old) > tol, axis = 1) & (iterations[active] < maxiter)
+
+            if not moving.all():
+                active, Xa, pa = active[moving], Xa[moving], pa[moving]
+
+        # Final Hessian: a zero pivot (determinant sign 0) marks the fits that statsmodels cannot invert, except for the
+        # separated fits, which are judged by the rank of their columns.
+
+        score, H, _ = batch_derivatives(X_all, y, params, Model)
+        sign, _ = np.linalg.slogdet(H / n)
+
+        XB = (X_all @ params[..., None])[..., 0]
+        prob = 1 / (1 + np.exp(-XB)) if Model == 'LGT' else ndtr(XB)
+
+        separated = ((XB > 0) == (y == 1)).all(axis = 1)
+        regular = sign != 0
+
+        if separated.any():
+            regular[separated] = np.linalg.matrix_rank(X_all[separated]) == k
+
+        FIT['linear'][Batch] = XB
+        FIT['prob'][Batch] = prob
+        FIT['params'][Batch, :k] = params
+        FIT['iterations'][Batch] = iterations
+        FIT['converged'][Batch] = iterations < maxiter
+        FIT['success'][Batch] = regular & np.all(np.isfinite(params), axis = 1)
+
+    # Accounting of the fits: separated fits predict every observation perfectly (statsmodels' perfect prediction check).
+
+    if Monitor.ENABLED:
+        Monitor.count('fits attempted', M)
+        Monitor.count('fits converged', np.count_nonzero(FIT['converged'] & FIT['success']))
+        Monitor.count('fits singular', np.count_nonzero(~FIT['success']))
+        Monitor.count('fits separated', np.count_nonzero(FIT['success'] & np.isclose(FIT['prob'], y).all(axis = 1)))
+        Monitor.histogram('Newton iterations', FIT['iterations'])
+
+    return FIT
+
+def batch_derivatives(X, y, params, Model):
+    """
+    Score, Hessian of the negative log-likelihood and observation weights for a batch of models (fit_binary formulas).
+    """
+
+    XB = (X @ params[..., None])[..., 0]
+    q = 2 * y - 1
+
+    if Model == 'LGT':
+        L = 1 / (1 + np.exp(-XB))
+        score_obs = y - L
+        weight = L * (1 - L)
+    else:
+        L = q * np.exp(-0.5 * (q * XB) ** 2) / np.sqrt(2 * np.pi) / np.clip(ndtr(q * XB), FLOAT_EPS, 1 - FLOAT_EPS)
+        score_obs = L
+        weight = L * (L + XB)
 
-            suc, suc_p, suc_n = success(FIT, DEP)
+    score = (score_obs[:, None, :] @ X)[:, 0, :]
+    H = (X.transpose(0, 2, 1) * weight[:, None, :]) @ X
 
-        except:
+    return score, H, score_obs
+
+def predict_mod(data, Model, policy = 'legacy', warm = False, cache = None, Country = '', Sample = ''):
+    """
+    Obtaining the model that best precicts the number of opportunities of arbitrage.
+    The design matrix is built once and every candidate model is fitted on its subset of columns.
+    The policy for the candidates with degenerate columns ('legacy', 'fail' or 'reduce') is described in score_candidates;
+    with warm = True every fit starts from the parameters of a fitted model one term smaller.
+    With the path of a cache the fits are saved there and reused (Country and Sample label its entries).
+    """
 
-            suc_p = 0
+    X, y = design_matrix(data)
+    MEMO = {}
+    PARAMS = {} if warm else None
+    CACHE = cache_scope(cache, X, y, Model, Country, Sample, warm) if cache else None
 
-        SUC_P1.append(suc_p)
+    with Monitor.capture(f'{Country}|{Sample}|{Model}'):
 
-    FormulaS = Formulas1[SUC_P1.index(max(SUC_P1))] + ' + '
-    
-    ### Step 2: Interations with the economic sector. ###
+        ### Step 1: Main variables from the model. ###
+
+        Formulas1, Columns1 = main_candidates()
+        SCORES1 = score_candidates(X, y, Model, Columns1, policy = policy, MEMO = MEMO, PARAMS = PARAMS, CACHE = CACHE)
+
+        FormulaS, TermsS = best_main(Formulas1, SCORES1)
+
+        ### Step 2: Interations with the economic sector. ###
+
+        Formulas2, Columns2 = interaction_candidates(FormulaS, TermsS)
+        SCORES2 = score_candidates(X, y, Model, Columns2, policy = policy, MEMO = MEMO, PARAMS = PARAMS, CACHE = CACHE)
+
+    return best_model(Formulas2, SCORES2)
+
+def main_candidates():
+    """
+    Obtaining all combinations of the main variables for the model, as formulas and as columns of the design matrix.
+    """
+
+    Formulas1 = []
+    Columns1 = []
+
+    for i in range(1, len(Variables1) + 1):
+        for combo in itertools.combinations(Variables1, i):
+            formula = "ARB ~ " + " + ".join(combo)
+            Formulas1.append(formula)
+            Columns1.append(term_columns(combo))
+
+    return Formulas1, Columns1
+
+def interaction_candidates(FormulaS, TermsS):
+    """
+    Obtaining all combinations of interactions with the economic sector that extend the selected main model.
+    """
 
-    ## Obtaining all combinations of variables for the new model. ##
-    
-    Variables2 = ('DIL * ACA', 'DIL * BAS', 'DIL * CYC', 'DIL * NCY', 'DIL * ENE', 'DIL * FIN', 'DIL * GOV', 'DIL * HEA', 'DIL * IND', 'DIL * EST', 'DIL * TEC', 'DIL * UTI')
     Formulas2 = []
-    R2, SUC, SUC_P, SUC_N = [], [], [], []
+    Columns2 = []
 
     for i in range(1, len(Variables2) + 1):
         for combo in itertools.combinations(Variables2, i):
             formula = FormulaS + " + ".join(combo)
             Formulas2.append(formula)
+            Columns2.append(term_columns(TermsS + list(combo)))
 
-    ## Estimation of each model and obtention of the success rate. ##
+    return Formulas2, Columns2
 
-    for Formula2 in Formulas2:
+def score_candidates(X, y, Model, Candidates, policy = 'legacy', MEMO = None, PARAMS = None, CACHE = None):
+    """
+    Estimation of each candidate model (all at once) and obtention of its success rate.
+    Returns one (R2, success, success of ARB, success of nARB) tuple per candidate; failed fits score 0.
+    Candidates with all-zero columns always fail, so they score 0 without being fitted. Those with linearly dependent
+    columns (see effective_columns) are fitted as they are with policy 'legacy', where they fail or not depending on rounding
+    (they always fail if the fit is separated, see fit_binary_batch), score 0 with policy 'fail', and with policy 'reduce'
+    every candidate is fitted on its zero-free, linearly independent columns.
+    The scores are memoized in MEMO (one dictionary per sample and link) by the set of columns that are fitted.
+    If a dictionary PARAMS is given, the fits are warm-started from the converged parameters of their neighbours
+    (see warm_start), which are stored there as well. With a CACHE (see cache_scope) the fits already on disk
+    are not repeated, and every fitted level is saved as a checkpoint.
+    Each candidate is fitted and scored on the rows without missing values in its columns (see candidate_rows).
+    """
 
-        try:
+    Groups = candidate_rows(X, Candidates)
 
-            if Model == 'LGT':
-                mod = smf.logit(Formula2, data)
-            elif Model == 'PRT':
-                mod = smf.probit(Formula2, data)
+    if len(Groups) > 1 or Groups[0][0] is not None:
 
-            res = mod.fit(cov_type = 'HC1', disp = 0, warn_convergence = False) #white robustness.
-            pred = res.predict()
-            r_squared = 1 - ((data['ARB'] - pred)**2).sum() / ((data['ARB'] - data['ARB'].mean())**2).sum()
-            
-            # We  extract the fitted values to annalyze the success of the model.
+        # The candidates of every set of rows are scored apart, with their own memo and entries of the cache.
 
-            FIT = res.fittedvalues.values
-            DEP = data['ARB'].values.tolist()
+        MEMO = {} if MEMO is None else MEMO
+        SCORES = [None] * len(Candidates)
 
-            suc, suc_p, suc_n = success(FIT, DEP)
+        for rows, Group in Groups:
 
-        except:
+            if rows is None:
+                Xg, yg, MEMOg, CACHEg = X, y, MEMO, CACHE
+            else:
+                Xg, yg, MEMOg = X[rows], y[rows], MEMO.setdefault(rows.tobytes(), {})
+                CACHEg = dict(CACHE, data = hashlib.sha1(CACHE['data'].encode() + rows.tobytes()).hexdigest()) if CACHE is not None else None
 
-            r_squared = 0
-            suc_p = 0
-            suc_n = 0
-            suc = 0
+            for m, SCORE in zip(Group, score_candidates(Xg, yg, Model, [Candidates[m] for m in Group], policy, MEMOg, PARAMS, CACHEg)):
+                SCORES[m] = SCORE
 
-        R2.append(r_squared)
-        SUC.append(suc)
-        SUC_P.append(suc_p)
-        SUC_N.append(suc_n)
+        return SCORES
 
-    FormulaE = Formulas2[SUC_P.index(max(SUC_P))]
-    R2S = R2[SUC_P.index(max(SUC_P))]
-    SUC = SUC[SUC_P.index(max(SUC_P))]
-    SUC_N = SUC_N[SUC_P.index(max(SUC_P))]
-    SUC_P = SUC_P[SUC_P.index(max(SUC_P))]
+    SCORES = [(0, 0, 0, 0)] * len(Candidates)
 
-    return FormulaE, R2S, SUC, SUC_P, SUC_N
+    # Without ARB or without nARB the success rate cannot be obtained, so no candidate needs to be fitted.
 
-#################### END OF COMPLEMENTARY FUNCTIONS ####################
+    if y.all() or not y.any():
+        return SCORES
 
-#################### START OF THE CODE ####################
+    MEMO = {} if MEMO is None else MEMO
+    Alias = column_aliases(X)
+    Keys = []
+    Fit = {}
+    Singular = set()
+
+    for m, Cols in enumerate(Candidates):
+
+        Effective, singular = effective_columns(X, Alias, Cols, policy)
+
+        if Effective is None:
+            Keys.append(None)
+            continue
+
+        if singular:
+            Singular.add(tuple(sorted(Cols)))
+
+        key = tuple(sorted(Effective))
+        Keys.append(key)
+
+        if key not in MEMO:
+            Fit.setdefault(key, Effective)
+
+    Monitor.count('fits skipped (degenerate)', Keys.count(None))
+
+    if CACHE is not None and Fit:
+
+        for key, (score, converged, params) in cache_get(CACHE, Fit).items():
+            MEMO[key] = score
+            if PARAMS is not None and converged:
+                PARAMS[key] = params
+
+        Monitor.count('fits cached', sum(key in MEMO for key in Fit))
+        Fit = {key: Cols for key, Cols in Fit.items() if key not in MEMO}
+
+    if Fit:
+
+        TSS = ((y - y.mean())**2).sum()
+
+        # With warm starts the models are fitted by size, so that every neighbour one term smaller is already fitted.
+
+        if PARAMS is None:
+            Levels = [list(Fit)]
+        else:
+            PARAMS.setdefault((0,), {0: np.log(y.mean() / (1 - y.mean())) if Model == 'LGT' else ndtri(y.mean())})
+            Levels = [[key for key in Fit if len(key) == size] for size in sorted({len(key) for key in Fit})]
+
+        for Level in Levels:
+
+            # The singular candidates always start from zero, since whether they fail depends on the path of the fit.
+
+            Start = [warm_start(Fit[key], PARAMS) if key not in Singular else None for key in Level] if PARAMS is not None else None
+            with Monitor.stage('fit'):
+                FITS = fit_binary_batch(X, y, Model, [Fit[key] for key in Level], start = Start)
+
+            # A fit that does not converge (separation), fails (singular Hessian) or converges to fitted probabilities of 0 or 1
+            # (quasi-separation) depends on its start, so it is repeated from zero as in the search without warm starts. Since the
+            # fits of a batch do not depend on each other, those fits are then identical to the cold ones, and the rest agree with
+            # them to the tolerance of the Newton steps.
+
+            Redo = []
+
+            if Start is not None:
+                extreme = (np.minimum(FITS['prob'], 1 - FITS['prob']) < np.sqrt(FLOAT_EPS)).any(axis = 1)
+                Redo = [m for m in range(len(Level)) if Start[m] is not None and (not (FITS['converged'][m] and FITS['success'][m]) or extreme[m])]
+
+            if Redo:
+                with Monitor.stage('fit'):
+                    REDO = fit_binary_batch(X, y, Model, [Fit[Level[m]] for m in Redo])
+                for Name in ('linear', 'prob', 'iterations', 'converged', 'success'):
+                    FITS[Name][Redo] = REDO[Name]
+                FITS['params'][Redo] = 0
+                FITS['params'][Redo, :REDO['params'].shape[1]] = REDO['params']
+
+            # The success of the whole level is obtained at once; the failed fits score 0.
+
+            with Monitor.stage('score'):
+                SCORE = score_batch(FITS['linear'], y)
+                R2 = 1 - ((y - FITS['prob'])**2).sum(axis = 1) / TSS
+
+            for m, key in enumerate(Level):
+
+                if FITS['success'][m]:
+                    MEMO[key] = (R2[m], SCORE['suc'][m, 0], SCORE['suc_p'][m, 0], SCORE['suc_n'][m, 0])
+                else:
+                    MEMO[key] = (0, 0, 0, 0)
 
-DATA = pd.read_csv('Verdu_Carchano_Ruiz_2025_Data.csv', delimiter = ';') # Open the data file.
+                if PARAMS is not None and FITS['success'][m] and FITS['converged'][m]:
+                    PARAMS[key] = dict(zip(Fit[key], FITS['params'][m]))
 
-Regions = ['AFR', 'AME', 'ASI', 'EUR']
+            if CACHE is not None:
+                cache_put(CACHE, [(key, MEMO[key], FITS['success'][m] and FITS['converged'][m], dict(zip(Fit[key], FITS['params'][m]))) for m, key in enumerate(Level)])
 
-Countries = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
+    return [MEMO[key] if key is not None else SCORES[m] for m, key in enumerate(Keys)]
 
-Samples = ['F', '1', '2', '3']
-Models = ['LGT', 'PRT']
+def effective_columns(X, Alias, Cols, policy = 'legacy'):
+    """
+    Obtains the columns that are fitted for a candidate, given the aliases of the design matrix (see column_aliases) and
+    the policy of score_candidates, and whether its columns are linearly dependent (fitted as they are with policy 'legacy').
+    Beyond the aliases, the dependence among three or more columns (such as sectors that add up to the intercept) is
+    found by independent_columns. Returns None as columns when the candidate is not fitted (it scores 0).
+    """
+
+    Effective = list(dict.fromkeys(int(Alias[Col]) for Col in Cols if Alias[Col] >= 0))
+    zero = (Alias[Cols] < 0).any()
+
+    if zero and policy != 'reduce':
+        return None, False
 
-##### SUCCESS OF THE MODELS #####
+    Effective = independent_columns(X, Effective)
 
-for C in range(0, len(Countries)):
+    if len(Effective) < len(Cols) and policy == 'fail':
+        return None, False
 
-    data0 = DATA[DATA['Country'] == Countries[C]]
-    data0 = data0[data0['OUT'] == 0]
-    data0 = data0[data0['DIL'] != 0]
-    data0 = data0[data0['ISC'] != 0]
-    data0 = data0[data0['CAP'] != 0]
+    if policy == 'legacy':
+        return list(Cols), len(Effective) < len(Cols)
+
+    return Effective, False
+
+def warm_start(Cols, PARAMS):
+    """
+    Obtains the starting values of a model from an already fitted neighbour in the lattice of models: the model without
+    its last column, or without its last column and another one (a sector and its interaction with DIL).
+    The columns that the neighbour does not have start at zero; without a fitted neighbour it returns None.
+    """
 
-    for Sample in Samples:
+    last = len(Cols) - 1
+
+    for Drop in [(last,)] + [(last, j) for j in range(last)]:
+
+        key = tuple(sorted(Col for j, Col in enumerate(Cols) if j not in Drop))
+
+        if key in PARAMS:
+            return [PARAMS[key].get(Col, 0.0) for Col in Cols]
+
+    return None
+
+def column_aliases(X):
+    """
+    Finds the zero and pairwise proportional columns of a design matrix, such as the absent sectors and their
+    interactions with DIL, once per sample. Returns, for each column, -1 if it is all zero, the first column
+    proportional to it if there is one, or the column itself otherwise.
+    """
+
+    Nonzero = X != 0
+    Zero = ~Nonzero.any(axis = 0)
+
+    # Each column is scaled by its first non-zero value, so proportional columns become equal.
+
+    Scale = X[Nonzero.argmax(axis = 0), np.arange(X.shape[1])]
+    Scaled = np.round(X / np.where(Zero, 1, Scale), 12) + 0.0     # Adding 0.0 turns -0.0 into 0.0.
+
+    _, Group = np.unique(Scaled.T, axis = 0, return_inverse = True)
+    Group = Group.ravel()
+
+    Alias = np.array([np.flatnonzero(Group == g)[0] for g in Group])
+    Alias[Zero] = -1
+
+    return Alias
+
+def independent_columns(X, Cols):
+    """
+    Keeps the columns of a candidate that are linearly independent, in their order, by a QR factorization with column
+    pivoting of the columns scaled to unit norm (with the tolerance of np.linalg.matrix_rank).
+    """
+
+    if len(Cols) < 2:
+        return list(Cols)
+
+    A = X[:, Cols]
+    _, R, Pivot = qr(A / np.linalg.norm(A, axis = 0), mode = 'economic', pivoting = True)
+    rank = (np.abs(np.diag(R)) > np.abs(R[0, 0]) * max(A.shape) * FLOAT_EPS).sum()
+
+    return [Cols[j] for j in sorted(Pivot[:rank])]
+
+def open_cache(path):
+    """
+    Opens (and creates, if needed) the SQLite cache with the fitted candidates and the finished tasks.
+    Every process keeps one connection per file.
+    """
+
+    if path not in CACHE_DB:
+
+        db = sqlite3.connect(path, timeout = 60)
+        db.execute('PRAGMA journal_mode = WAL')     # Allows the processes of predict_grid to read while one writes.
+        db.execute('CREATE TABLE IF NOT EXISTS fits (data TEXT, link TEXT, version TEXT, columns TEXT, country TEXT, period TEXT, '
+                   'r2 REAL, suc REAL, suc_p REAL, suc_n REAL, converged INTEGER, params TEXT, PRIMARY KEY (data, link, version, columns))')
+        db.execute('CREATE TABLE IF NOT EXISTS tasks (data TEXT, link TEXT, version TEXT, policy TEXT, country TEXT, period TEXT, '
+                   'formula TEXT, r2 REAL, suc REAL, suc_p REAL, suc_n REAL, PRIMARY KEY (data, link, version, policy))')
+        db.commit()
+
+        CACHE_DB[path] = db
+
+    return CACHE_DB[path]
+
+def cache_scope(path, X, y, Model, Country = '', Sample = '', warm = False):
+    """
+    Identifies the entries of the cache of one sample and link: a hash of the sample (design matrix and dependent
+    variable), the link and the version of the fitter. The country and period are kept to invalidate them.
+    """
+
+    Hash = hashlib.sha1(np.asarray(X.shape).tobytes() + X.tobytes() + y.tobytes())
+
+    return {
+        'db': open_cache(path),
+        'data': Hash.hexdigest(),
+        'link': Model,
+        'version': FITTER_VERSION + ('-warm' if warm else ''),
+        'country': Country,
+        'period': Sample
+    }
+
+def cache_get(CACHE, Keys):
+    """
+    Obtains the scores, convergence and parameters of the cached fits among Keys (sets of columns of the design matrix).
+    """
+
+    Rows = CACHE['db'].execute('SELECT columns, r2, suc, suc_p, suc_n, converged, params FROM fits WHERE data = ? AND link = ? AND version = ?',
+                               (CACHE['data'], CACHE['link'], CACHE['version']))
+    FOUND = {}
+
+    for Names, r2, suc, suc_p, suc_n, converged, params in Rows:
+
+        key = tuple(sorted(Columns.index(Name) for Name in Names.split(' + ')))
+
+        if key in Keys:
+            FOUND[key] = ((r2, suc, suc_p, suc_n), bool(converged), {Columns.index(Name): value for Name, value in json.loads(params).items()})
+
+    return FOUND
+
+def cache_put(CACHE, ENTRIES):
+    """
+    Saves (key, scores, convergence, parameters) fits in the cache and commits them, so that an interrupted search
+    resumes from this point.
+    """
+
+    Rows = [(CACHE['data'], CACHE['link'], CACHE['version'], ' + '.join(Columns[Col] for Col in key), CACHE['country'], CACHE['period'],
+             *(float(score) for score in SCORE), int(converged), json.dumps({Columns[Col]: float(value) for Col, value in params.items()}))
+            for key, SCORE, converged, params in ENTRIES]
+
+    CACHE['db'].executemany('INSERT OR REPLACE INTO fits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', Rows)
+    CACHE['db'].commit()
+
+def cache_task(CACHE, policy, RESULT = None):
+    """
+    Obtains the cached result of predict_mod for a sample and link (None if it is not finished) or, if RESULT is given, saves it.
+    """
+
+    if RESULT is None:
+        Row = CACHE['db'].execute('SELECT formula, r2, suc, suc_p, suc_n FROM tasks WHERE data = ? AND link = ? AND version = ? AND policy = ?',
+                                  (CACHE['data'], CACHE['link'], CACHE['version'], policy)).fetchone()
+        return None if Row is None else tuple(Row)
+
+    Formula, *SCORE = RESULT
+    CACHE['db'].execute('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (CACHE['data'], CACHE['link'], CACHE['version'], policy, CACHE['country'], CACHE['period'], Formula, *(float(score) for score in SCORE)))
+    CACHE['db'].commit()
+
+def invalidate_cache(path, Countries = None, Samples = None):
+    """
+    Deletes the cached fits and results of the given countries and periods (all of them when None).
+    Returns the number of deleted entries.
+    """
+
+    db = open_cache(path)
+    Where, Values = [], []
+
+    for Field, Codes in (('country', Countries), ('period', Samples)):
+        if Codes:
+            Where.append(f'{Field} IN ({", ".join("?" * len(Codes))})')
+            Values += list(Codes)
+
+    Condition = ' WHERE ' + ' AND '.join(Where) if Where else ''
+    deleted = sum(db.execute(f'DELETE FROM {Table}{Condition}', Values).rowcount for Table in ('fits', 'tasks'))
+    db.commit()
+
+    return deleted
+
+def best_main(Formulas1, SCORES1):
+    """
+    Selects the main model with the highest success on ARB (the first one in case of ties), among those scored (not NaN).
+    Returns its formula, ready to be extended, and its terms.
+    """
+
+    SUC_P1 = [suc_p for r_squared, suc, suc_p, suc_n in SCORES1]
+    best = SUC_P1.index(max(suc_p for suc_p in SUC_P1 if not np.isnan(suc_p)))
+
+    FormulaS = Formulas1[best] + ' + '
+    TermsS = Formulas1[best][len("ARB ~ "):].split(' + ')
+
+    return FormulaS, TermsS
+
+def best_model(Formulas2, SCORES2):
+    """
+    Selects the final model with the highest success on ARB (the first one in case of ties), among those scored (not NaN).
+    Returns its formula, R2, total success, success on ARB and success on nARB.
+    """
+
+    SUC_P = [suc_p for r_squared, suc, suc_p, suc_n in SCORES2]
+    best = SUC_P.index(max(suc_p for suc_p in SUC_P if not np.isnan(suc_p)))
+
+    R2S, SUC, SUC_P, SUC_N = SCORES2[best]
+
+    return Formulas2[best], R2S, SUC, SUC_P, SUC_N
+
+def search_models(DATA, Countries = None, Samples = ('F', '1', '2', '3'), Models = ('LGT', 'PRT'), engine = 'subsets', **options):
+    """
+    Obtains the best model of the given countries (all of them by default), periods and links in a tidy DataFrame,
+    with one row per sample and link (without formula for the empty samples). The engine 'subsets' fits every subset
+    of the terms (predict_grid) and 'path' follows their elastic-net path (path_grid); the options are those of the engine.
+    """
+
+    Countries = COUNTRIES if Countries is None else list(Countries)
+
+    if engine == 'subsets':
+        options.setdefault('progress', False)
+        GRID = predict_grid(DATA, Countries, list(Samples), list(Models), **options)
+    else:
+        GRID = path_grid(DATA, Countries, list(Samples), list(Models), **options)
+
+    TABLE = []
+
+    for Country, Sample, Model, RESULT in GRID:
+
+        Formula, R2, SUC, SUC_P, SUC_N = RESULT if RESULT is not None else (None, np.nan, np.nan, np.nan, np.nan)
+        TABLE.append({'Country': Country, 'Sample': Sample, 'Model': Model, 'Formula': Formula, 'R2': R2, 'Success': SUC, 'ARB': SUC_P, 'nARB': SUC_N})
+
+    return pd.DataFrame(TABLE)
+
+def validation_folds(y, mode = 'kfold', k = 5, seed = 42, PER = None):
+    """
+    Obtains the (train, test) rows of each fold of a sample: k folds stratified by ARB (kfold), or the periods in order
+    (forward: PER1 -> PER2 and PER1, PER2 -> PER3), for which PER gives the period of each row.
+    """
+
+    if mode == 'forward':
+
+        Periods = [Period for Period in ('PER1', 'PER2', 'PER3') if (PER == Period).any()]
+
+        if len(Periods) < 2:
+            raise ValueError('The period-forward validation needs a sample with at least two periods.')
+
+        return [(np.flatnonzero(np.isin(PER, Periods[:i])), np.flatnonzero(PER == Periods[i])) for i in range(1, len(Periods))]
+
+    rng = np.random.default_rng(seed)
+    fold = np.empty(len(y), dtype = int)
+    start = 0
+
+    for value in (0, 1):
+        rows = rng.permutation(np.flatnonzero(y == value))
+        fold[rows] = (start + np.arange(len(rows))) % k
+        start += len(rows)
+
+    return [(np.flatnonzero(fold != f), np.flatnonzero(fold == f)) for f in range(k)]
+
+def fold_linear(X, y, train, test, Model, Candidates, policy = 'legacy'):
+    """
+    Fits every candidate on the train rows of the design matrix (a slice of the matrix of the whole sample) and obtains
+    its linear predictor on the test rows; NaN for the candidates that are not fitted or fail (see score_candidates),
+    and for the rows where the columns of the candidate are missing (see candidate_rows).
+    """
+
+    LINEAR = np.full((len(Candidates), len(test)), np.nan)
+
+    for rows, Group in candidate_rows(X, Candidates):
+
+        kept = np.ones(len(test), dtype = bool) if rows is None else rows[test]
+        train_g = train if rows is None else train[rows[train]]
+
+        X_train, y_train, X_test = X[train_g], y[train_g], X[test[kept]]
+
+        if y_train.all() or not y_train.any():
+            continue
+
+        Alias = column_aliases(X_train)
+        Fit = {}
+
+        for m in Group:
+            Effective, _ = effective_columns(X_train, Alias, Candidates[m], policy)
+            if Effective is not None:
+                Fit[m] = Effective
+
+        if Fit:
+
+            with Monitor.stage('fit'):
+                FITS = fit_binary_batch(X_train, y_train, Model, list(Fit.values()))
+
+            for i, (m, Cols) in enumerate(Fit.items()):
+                if FITS['success'][i]:
+                    LINEAR[m, kept] = X_test[:, Cols] @ FITS['params'][i, :len(Cols)]
+
+    return LINEAR
+
+def cv_scores(X, y, Model, Candidates, Folds, policy = 'legacy', pool = None):
+    """
+    Out-of-sample (R2, success, success of ARB, success of nARB) of each candidate, as score_candidates gives them in sample,
+    from the held-out predictions of all the folds (see validation_folds) pooled. The folds run in the process pool, if given.
+    A candidate that fails in any fold is not scored (NaN), nor is any of them if the held-out arbitrages are all equal.
+    Each candidate is scored on the held-out rows without missing values in its columns (see candidate_rows).
+    """
+
+    Tasks = [(X, y, train, test, Model, Candidates, policy) for train, test in Folds]
+
+    if pool is not None:
+        OUTPUTS = list(pool.map(run_fold, Tasks))
+    else:
+        OUTPUTS = [(fold_linear(*Task), None) for Task in Tasks]
+
+    for LINEAR, RECORDS in OUTPUTS:
+        Monitor.merge(RECORDS)
+
+    LINEAR = np.concatenate([LINEAR for LINEAR, RECORDS in OUTPUTS], axis = 1)
+    Test = np.concatenate([test for train, test in Folds])
+
+    SCORES = [(np.nan, np.nan, np.nan, np.nan)] * len(Candidates)
+
+    for rows, Group in candidate_rows(X[Test], Candidates):
+
+        kept = slice(None) if rows is None else rows
+        y_test = y[Test][kept]
+        fitted = [m for m in Group if not np.isnan(LINEAR[m, kept]).any()]
+
+        if y_test.all() or not y_test.any() or len(fitted) == 0:
+            continue
+
+        with Monitor.stage('score'):
+            FIT = LINEAR[fitted][:, kept]
+            SCORE = score_batch(FIT, y_test)
+            prob = 1 / (1 + np.exp(-FIT)) if Model == 'LGT' else ndtr(FIT)
+            R2 = 1 - ((y_test - prob)**2).sum(axis = 1) / ((y_test - y_test.mean())**2).sum()
+
+        for i, m in enumerate(fitted):
+            SCORES[m] = (R2[i], SCORE['suc'][i, 0], SCORE['suc_p'][i, 0], SCORE['suc_n'][i, 0])
+
+    return SCORES
+
+def cross_validate(data, Model, mode = 'kfold', k = 5, seed = 42, policy = 'legacy', pool = None):
+    """
+    Compares the model selected in sample (as predict_mod) with the one selected out of sample, where both steps of the
+    search choose the candidate with the highest out-of-sample success on ARB (cv_scores) instead of the in-sample one.
+    The design matrix is built once and the folds (see validation_folds) are slices of it.
+    Returns, for each selection ('In-sample' and 'Out-of-sample'), its formula, its in-sample R2, success, success on ARB
+    and success on nARB, the same four out-of-sample scores, and the number of its candidates that could not be scored
+    out of sample (NaN in cv_scores; the selected model alone for 'In-sample'). If no main model is scored, there is no
+    out-of-sample selection (None, with NaN scores).
+    """
+
+    X, y = design_matrix(data)
+    Folds = validation_folds(y, mode, k, seed, data['PER'].to_numpy()[complete_rows(data)])
+
+    # In-sample selection, scored out of sample.
+
+    FormulaI, *SCORE_I = predict_mod(data, Model, policy = policy)
+    ColumnsI = term_columns(FormulaI[len('ARB ~ '):].split(' + '))
+    CV_I = cv_scores(X, y, Model, [ColumnsI], Folds, policy)[0]
+    IN_SAMPLE = (FormulaI, *SCORE_I, *CV_I, int(np.isnan(CV_I[2])))
+
+    # Out-of-sample selection, scored in sample.
+
+    Formulas1, Columns1 = main_candidates()
+    SCORES1 = cv_scores(X, y, Model, Columns1, Folds, policy, pool)
+    Unscored = sum(np.isnan(suc_p) for r_squared, suc, suc_p, suc_n in SCORES1)
+
+    if Unscored == len(SCORES1):
+        return {'In-sample': IN_SAMPLE, 'Out-of-sample': (None, *[np.nan] * 8, Unscored)}
+
+    FormulaS, TermsS = best_main(Formulas1, SCORES1)
+
+    Formulas2, Columns2 = interaction_candidates(FormulaS, TermsS)
+    SCORES2 = cv_scores(X, y, Model, Columns2, Folds, policy, pool)
+    Unscored += sum(np.isnan(suc_p) for r_squared, suc, suc_p, suc_n in SCORES2)
+
+    FormulaO, *CV_O = best_model(Formulas2, SCORES2)
+    ColumnsO = Columns2[Formulas2.index(FormulaO)]
+
+    return {
+        'In-sample': IN_SAMPLE,
+        'Out-of-sample': (FormulaO, *score_candidates(X, y, Model, [ColumnsO], policy = policy)[0], *CV_O, int(Unscored))
+    }
+
+def validate_models(DATA, Countries = None, Samples = ('F',), Models = ('LGT', 'PRT'), mode = 'kfold', k = 5, seed = 42, policy = 'legacy', workers = 1):
+    """
+    Cross-validates (cross_validate) the search of every country, period and link in a tidy DataFrame with the in-sample
+    and out-of-sample success of the model selected in sample and of the one selected out of sample, side by side, and
+    the number of candidates of each selection that could not be scored out of sample (Unscored).
+    The folds run in a process pool with workers > 1. With mode forward only the samples with several periods are validated.
+    """
+
+    Countries = COUNTRIES if Countries is None else list(Countries)
+    pool = ProcessPoolExecutor(max_workers = workers, initializer = init_worker, initargs = ({}, {}, Monitor.ENABLED)) if workers > 1 else None
+
+    TABLE = []
+
+    try:
+
+        for Country in Countries:
+            for Sample in Samples:
+
+                data = sample_data(DATA, Country, Sample)
+
+                if complete_rows(data).sum() == 0 or (mode == 'forward' and data['PER'].nunique() < 2):
+                    continue
+
+                for Model in Models:
+
+                    with Monitor.capture(f'{Country}|{Sample}|{Model}'):
+                        RESULTS = cross_validate(data, Model, mode, k, seed, policy, pool)
+
+                    for Selection, (Formula, R2, SUC, SUC_P, SUC_N, CV_R2, CV_SUC, CV_SUC_P, CV_SUC_N, Unscored) in RESULTS.items():
+                        TABLE.append({'Country': Country, 'Sample': Sample, 'Model': Model, 'Selection': Selection, 'Formula': Formula,
+                                      'R2': R2, 'Success': SUC, 'ARB': SUC_P, 'nARB': SUC_N,
+                                      'CV R2': CV_R2, 'CV Success': CV_SUC, 'CV ARB': CV_SUC_P, 'CV nARB': CV_SUC_N, 'Unscored': Unscored})
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return pd.DataFrame(TABLE)
+
+def binary_path(X, y, Model, alpha = 1.0, Lambdas = None, n_lambdas = 50, ratio = None, tol = 1e-7, maxiter = 25):
+    """
+    Elastic-net path of a logit (LGT) or probit (PRT) model over every column of the design matrix but the intercept:
+    minimizes -loglik / n + lambda * (alpha * |b|_1 + (1 - alpha) / 2 * |b|^2) on the standardized columns for each lambda,
+    from the largest one (only the intercept) down to ratio times it (1e-3, or 1e-2 with fewer rows than columns), or for
+    the given Lambdas, each fit starting from the previous one. Every fit is iteratively reweighted least squares, whose
+    weighted problem is solved by coordinate descent on its (columns x columns) Gram matrix, sweeping the active columns
+    until they converge and then every column. The constant columns (absent sectors) never enter, and the path stops once
+    the fit is saturated (99.9% of the null deviance explained, as with separated samples).
+    Returns the lambdas and the parameters of each fit on the original scale of the columns (lambdas x columns).
+    """
+
+    n, p = X.shape
+    mean, scale = X[:, 1:].mean(axis = 0), X[:, 1:].std(axis = 0)
+    free = np.r_[True, scale > 0]
+    Z = np.column_stack([np.ones(n), np.where(free[1:], (X[:, 1:] - mean) / np.where(free[1:], scale, 1), 0)])
+
+    def working(beta):
+        """
+        Weights, working response and deviance of the quadratic approximation of the log-likelihood at beta.
+        """
+
+        eta = Z @ beta
+
+        if Model == 'LGT':
+            mu = np.clip(1 / (1 + np.exp(-eta)), FLOAT_EPS, 1 - FLOAT_EPS)
+            w = np.maximum(mu * (1 - mu), 1e-5)
+            z = eta + (y - mu) / w
+        else:
+            mu = np.clip(ndtr(eta), FLOAT_EPS, 1 - FLOAT_EPS)
+            phi = np.maximum(np.exp(-0.5 * eta**2) / np.sqrt(2 * np.pi), 1e-10)
+            w = np.maximum(phi**2 / (mu * (1 - mu)), 1e-5)
+            z = eta + (y - mu) / phi
+
+        return w, z, -2 * (y * np.log(mu) + (1 - y) * np.log(1 - mu)).sum()
+
+    def descent(G, c, beta, lam, Columns):
+        """
+        Coordinate descent on the weighted least squares problem (Gram matrix G, cross products c) over Columns,
+        keeping the gradient c - G @ beta up to date, until no update changes the objective by more than tol.
+        """
+
+        g = c - G @ beta
+        Diagonal = G.diagonal().tolist()
+
+        for sweep in range(1000):
+
+            change = 0.0
+
+            for j in Columns:
+                r = g[j] + Diagonal[j] * beta[j]
+                new = r / Diagonal[j] if j == 0 else np.sign(r) * max(abs(r) - lam * alpha, 0) / (Diagonal[j] + lam * (1 - alpha))
+                d = new - beta[j]
+                if d != 0:
+                    g -= G[:, j] * d
+                    beta[j] = new
+                    change = max(change, Diagonal[j] * d * d)
+
+            if change < tol:
+                return
+
+    ybar = np.clip(y.mean(), FLOAT_EPS, 1 - FLOAT_EPS)
+    beta = np.zeros(p)
+    beta[0] = np.log(ybar / (1 - ybar)) if Model == 'LGT' else ndtri(ybar)
+
+    w, z, null = working(beta)
+
+    if Lambdas is None:
+        ratio = (1e-2 if n < p else 1e-3) if ratio is None else ratio
+        lambda_max = np.abs(Z[:, 1:].T @ (w * (z - beta[0]))).max() / n / max(alpha, 1e-3)
+        Lambdas = lambda_max * np.logspace(0, np.log10(ratio), n_lambdas)
+
+    PATH = np.tile(beta, (len(Lambdas), 1))
+    Free = np.flatnonzero(free)
+
+    with Monitor.stage('path'):
+
+        for l, lam in enumerate(Lambdas):
+
+            for outer in range(maxiter):
+
+                w, z, deviance = working(beta)
+                G = (Z.T * w) @ Z / n
+                c = (Z.T * w) @ z / n
+                old = beta.copy()
+
+                while True:
+                    descent(G, c, beta, lam, np.flatnonzero((beta != 0) & free))
+                    active = beta != 0
+                    descent(G, c, beta, lam, Free)
+                    if ((beta != 0) == active).all():
+                        break
+
+                if (G.diagonal() * (beta - old)**2).max() < tol:
+                    break
+
+            PATH[l:] = beta
+
+            if working(beta)[2] < 1e-3 * null:
+                break
+
+    # Back to the original scale of the columns.
+
+    PARAMS = np.zeros_like(PATH)
+    PARAMS[:, 1:] = np.where(free[1:], PATH[:, 1:] / np.where(free[1:], scale, 1), 0)
+    PARAMS[:, 0] = PATH[:, 0] - PARAMS[:, 1:] @ mean
+
+    return np.asarray(Lambdas), PARAMS
+
+def path_terms(Active):
+    """
+    Obtains the terms of a model from the active columns of the design matrix: its main variables and the interactions
+    with DIL of the sectors whose column or interaction is active (a sector only enters through DIL * Sector).
+    """
+
+    Sector = Active[1 + len(Variables1):1 + len(Variables1) + len(Sectors)] | Active[1 + len(Variables1) + len(Sectors):]
+
+    return [Variable for i, Variable in enumerate(Variables1) if Active[1 + i]] + [Variables2[s] for s in np.flatnonzero(Sector)]
+
+def predict_path(data, Model, alpha = 1.0, criterion = 'suc_p', n_lambdas = 50, k = 5, seed = 42, policy = 'legacy'):
+    """
+    Alternative to predict_mod that selects the model on the elastic-net path (binary_path) over the 20 terms instead of
+    fitting every subset: the point of the path with the highest success on ARB (suc_p), or with the lowest deviance
+    in k-fold cross-validation (deviance, with the lambdas of the whole sample in every fold).
+    The selected terms are refitted without penalty, and the result is given as in predict_mod. The path, over every
+    term, uses the rows without missing values in any column; the refit uses those of its own columns.
+    """
+
+    X, y = design_matrix(data)
+    rows = ~np.isnan(X).any(axis = 1)
+    Xc, yc = X[rows], y[rows]
+
+    if yc.all() or not yc.any():
+        return 'ARB ~ 1', 0, 0, 0, 0
+
+    with Monitor.capture(f'path|{Model}'):
+
+        Lambdas, PATH = binary_path(Xc, yc, Model, alpha, n_lambdas = n_lambdas)
+
+        if criterion == 'suc_p':
+            best = int(np.argmax(score_batch(PATH @ Xc.T, yc)['suc_p'][:, 0]))
+        else:
+            DEVIANCE = np.zeros(len(Lambdas))
+            for train, test in validation_folds(yc, 'kfold', k, seed):
+                _, FOLD = binary_path(Xc[train], yc[train], Model, alpha, Lambdas = Lambdas)
+                eta = Xc[test] @ FOLD.T
+                prob = np.clip(1 / (1 + np.exp(-eta)) if Model == 'LGT' else ndtr(eta), FLOAT_EPS, 1 - FLOAT_EPS)
+                DEVIANCE -= 2 * (yc[test, None] * np.log(prob) + (1 - yc[test, None]) * np.log(1 - prob)).sum(axis = 0)
+            best = int(np.argmin(DEVIANCE))
+
+    Terms = path_terms(PATH[best] != 0)
+    Formula = 'ARB ~ ' + (' + '.join(Terms) if Terms else '1')
+
+    return (Formula, *score_candidates(X, y, Model, [term_columns(Terms)], policy = policy)[0])
+
+def path_grid(DATA, Countries, Samples, Models, alpha = 1.0, criterion = 'suc_p', policy = 'legacy'):
+    """
+    Selects the model of every country x period x link with predict_path, yielding the same tuples as predict_grid.
+    """
+
+    for Country in Countries:
+        for Sample in Samples:
+
+            data = sample_data(DATA, Country, Sample)
+
+            if len(data) == 0:
+                yield Country, Sample, None, None
+                continue
+
+            for Model in Models:
+                yield Country, Sample, Model, predict_path(data, Model, alpha, criterion, policy = policy)
+
+def sample_data(DATA, Country, Sample):
+    """
+    Obtains the sample of a country and period ('F' for the full sample) used to predict the arbitrages.
+    """
+
+    with Monitor.stage('filter'):
+
+        data0 = DATA[(DATA['Country'] == Country) & clean_mask(DATA)]
 
         if Sample == 'F':
-            data = data0.copy()
+            return data0.copy()
 
+        return data0[data0['PER'] == f'PER{Sample}'].copy()
+
+def candidate_costs(n, Candidates):
+    """
+    Estimates the cost of fitting each candidate model, proportional to rows x columns^2 (the Hessians).
+    """
+
+    return n * np.array([len(Cols) for Cols in Candidates], dtype = float)**2
+
+def predict_grid(DATA, Countries, Samples, Models, workers = 1, split = 4, progress = True, policy = 'legacy', warm = False, cache = None):
+    """
+    Obtains the best model of every country x period x link, dispatching the most expensive tasks first to a process pool.
+    The cost of a task is estimated from its rows and candidate models; once its main model is selected, the interactions
+    step is split into sub-batches of candidates (about split per worker over the whole grid) that are merged in order.
+    Yields (Country, Sample, Model, result of predict_mod) in the original order, with Model None for empty samples,
+    and reports the progress and the estimated remaining time on the standard error.
+    The policy for the candidates with degenerate columns, the warm starts and the cache are those of predict_mod;
+    the tasks already finished in the cache are not run again.
+    """
+
+    Formulas1, Columns1 = main_candidates()
+    COST1 = candidate_costs(1, Columns1).sum()
+    COST2 = candidate_costs(1, interaction_candidates('ARB ~ DIL + ', ['DIL'])[1]).sum()    # Estimate until the main model is known.
+
+    SAMPLES = {}
+    Items = []
+
+    for Country in Countries:
+        for Sample in Samples:
+
+            data = sample_data(DATA, Country, Sample)
+
+            if len(data) == 0:
+                Items.append((Country, Sample, None))
+            else:
+                SAMPLES[(Country, Sample)] = design_matrix(data)
+                Items += [(Country, Sample, Model) for Model in Models]
+
+    Tasks = [Item for Item in Items if Item[2] is not None]
+    Rows = {Task: len(SAMPLES[Task[:2]][1]) for Task in Tasks}
+    Cost = {Task: Rows[Task] * (COST1 + COST2) for Task in Tasks}
+    Target = sum(Cost.values()) / (max(workers, 1) * split)
+    OPTIONS = {'policy': policy, 'warm': warm, 'cache': cache}
+
+    # Every job is (kind, country, sample, model, arguments); serially the jobs keep the original order.
+
+    Pending = []
+    RESULTS = {}
+
+    for seq, Task in enumerate(Tasks):
+
+        Country, Sample, Model = Task
+        RESULT = cache_task(cache_scope(cache, *SAMPLES[(Country, Sample)], Model, Country, Sample, warm), policy) if cache else None
+
+        if RESULT is not None:
+            RESULTS[Task] = RESULT
+            del Cost[Task]
         else:
-            data = data0[data0['PER'] == f'PER{Sample}'].copy()
+            heapq.heappush(Pending, (-Cost[Task] if workers > 1 else seq, seq, ('main',) + Task, Rows[Task] * COST1))
+
+    STATE = {Task: {} for Task in Tasks}
+    Done, Total = 0.0, sum(Cost.values())
+    start = time.time()
+    cursor = 0
+    finished = len(RESULTS)
+
+    pool = ProcessPoolExecutor(max_workers = workers, initializer = init_worker, initargs = (SAMPLES, OPTIONS, Monitor.ENABLED)) if workers > 1 else None
+    Running = {}
+
+    try:
 
-        if len(data) == 0:
+        while Pending or Running or cursor < len(Items):
 
-            print(f'==================== Results for {Countries[C]} - Period: {Sample} ====================')
+            Completed = []
+
+            # Dispatch the most expensive pending jobs, keeping every process busy.
+
+            while Pending and (pool is None or len(Running) < 2 * workers):
+
+                priority, seq, Job, cost = heapq.heappop(Pending)
+
+                if pool is None:
+                    Completed = [(Job, cost, predict_job(SAMPLES, *Job, **OPTIONS))]
+                    break
+
+                Running[pool.submit(run_job, Job)] = (Job, cost)
+
+            if Running:
+                Ready, _ = wait(Running, return_when = FIRST_COMPLETED)
+                Completed = []
+
+                for future in Ready:
+                    OUTPUT, RECORDS = future.result()
+                    Monitor.merge(RECORDS)
+                    Completed.append(Running.pop(future) + (OUTPUT,))
+
+            for Job, cost, OUTPUT in Completed:
+
+                Kind, Country, Sample, Model, *Args = Job
+                Task = (Country, Sample, Model)
+                state = STATE[Task]
+                Done += cost
+
+                if Kind == 'main':
+
+                    # The main model is known: the interactions step is split in contiguous sub-batches of similar cost.
+
+                    FormulaS, TermsS = OUTPUT
+                    Formulas2, Columns2 = interaction_candidates(FormulaS, TermsS)
+
+                    Costs = np.cumsum(candidate_costs(Rows[Task], Columns2))
+                    Total += Costs[-1] - Rows[Task] * COST2
+
+                    parts = int(min(max(np.ceil(Costs[-1] / Target), 1), len(Columns2))) if workers > 1 else 1
+                    Bounds = np.unique(np.r_[0, np.searchsorted(Costs, Costs[-1] * np.arange(1, parts) / parts), len(Columns2)])
+
+                    state.update({'Formulas2': Formulas2, 'parts': {}, 'count': len(Bounds) - 1})
+
+                    for first, last in zip(Bounds[:-1], Bounds[1:]):
+                        cost = Costs[last - 1] - (Costs[first - 1] if first > 0 else 0)
+                        heapq.heappush(Pending, (-cost if workers > 1 else seq, seq, ('inter',) + Task + (TermsS, int(first), int(last)), cost))
+
+                    label = 'main model selected'
+
+                else:
+
+                    state['parts'][Args[1]] = OUTPUT
+                    label = f"interactions {len(state['parts'])}/{state['count']}"
+
+                    if len(state['parts']) == state['count']:
+                        SCORES2 = [score for first in sorted(state['parts']) for score in state['parts'][first]]
+                        RESULTS[Task] = best_model(state['Formulas2'], SCORES2)
+
+                        if cache:
+                            cache_task(cache_scope(cache, *SAMPLES[Task[:2]], Model, Country, Sample, warm), policy, RESULTS[Task])
+                        finished += 1
+                        label = 'finished'
+
+                if progress:
+                    elapsed = time.time() - start
+                    eta = elapsed * (Total - Done) / Done if Done > 0 else float('nan')
+                    print(f'[{finished}/{len(Tasks)} tasks | {100 * Done / Total:5.1f}% | ETA {eta // 60:.0f}m{eta % 60:02.0f}s] '
+                          f'{Country} - Model: {Model} - Period: {Sample}: {label}', file = sys.stderr, flush = True)
+
+            # The results are yielded in the original order as soon as they are available.
+
+            while cursor < len(Items) and (Items[cursor][2] is None or Items[cursor] in RESULTS):
+                Country, Sample, Model = Items[cursor]
+                yield Country, Sample, Model, RESULTS.pop(Items[cursor], None)
+                cursor += 1
+
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures = True)
+
+def predict_job(SAMPLES, Kind, Country, Sample, Model, *Args, policy = 'legacy', warm = False, cache = None):
+    """
+    Runs one job of predict_grid: the selection of the main model ('main'),
+    or the scores of a sub-batch [first, last) of the interaction candidates ('inter').
+    """
+
+    X, y = SAMPLES[(Country, Sample)]
+    PARAMS = {} if warm else None
+    CACHE = cache_scope(cache, X, y, Model, Country, Sample, warm) if cache else None
+
+    with Monitor.capture(f'{Country}|{Sample}|{Model}'):
+
+        if Kind == 'main':
+            Formulas1, Columns1 = main_candidates()
+            return best_main(Formulas1, score_candidates(X, y, Model, Columns1, policy = policy, PARAMS = PARAMS, CACHE = CACHE))
+
+        TermsS, first, last = Args
+        Formulas2, Columns2 = interaction_candidates('', TermsS)
+
+        return score_candidates(X, y, Model, Columns2[first:last], policy = policy, PARAMS = PARAMS, CACHE = CACHE)
+
+def init_worker(SAMPLES, OPTIONS, monitor = False):
+    """
+    Gives a worker process the design matrices of the samples and the options of predict_job
+    (and enables its instrumentation if monitor is True).
+    """
+
+    global WORKER_SAMPLES, WORKER_OPTIONS, CACHE_DB, PARENT_DB
+
+    Monitor.enable(monitor)
+    Monitor.reset()     # The records inherited from the parent process are not sent back to it.
+
+    WORKER_SAMPLES = SAMPLES
+    WORKER_OPTIONS = OPTIONS
+
+    PARENT_DB, CACHE_DB = CACHE_DB, {}      # The connections inherited from the parent process are neither used nor closed.
+
+def run_job(Job):
+    """
+    Runs one job of predict_grid in a worker process, returning its output with the records of its instrumentation.
+    """
+
+    return predict_job(WORKER_SAMPLES, *Job, **WORKER_OPTIONS), Monitor.drain()
+
+def run_fold(Task):
+    """
+    Runs fold_linear in a worker process, returning its output with the records of its instrumentation.
+    """
+
+    return fold_linear(*Task), Monitor.drain()
+
+Variables1 = ('DIL', 'IDX', 'ISC', 'CAP', 'GEN', 'ACQ', 'INV', 'REF')                           # Main variables of the model.
+Sectors = ('ACA', 'BAS', 'CYC', 'NCY', 'ENE', 'FIN', 'GOV', 'HEA', 'IND', 'EST', 'TEC', 'UTI')     # Economic sectors.
+Variables2 = tuple(f'DIL * {Sector}' for Sector in Sectors)                                     # Interactions with the economic sector.
+
+Columns = ('Intercept',) + Variables1 + Sectors + tuple(f'DIL:{Sector}' for Sector in Sectors)  # Columns of the design matrix.
+
+FLOAT_EPS = np.finfo(float).eps
+
+FITTER_VERSION = 'newton-4'     # Changes whenever the fits or the scores change, so that the cache is not reused.
+
+CACHE_DB = {}   # Connections to the cache of each process.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
+
+#################### START OF THE CODE ####################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Success of the models that predict the arbitrage opportunities.')
+    parser.add_argument('--cache', default = None, help = 'SQLite file with the fitted models: they are reused between runs (every model is fitted without it).')
+    parser.add_argument('--invalidate', action = 'store_true', help = 'Deletes the results of --countries and --periods (all by default) from --cache and exits.')
+    parser.add_argument('--countries', nargs = '+', help = 'Countries to invalidate.')
+    parser.add_argument('--periods', nargs = '+', help = 'Periods (F, 1, 2, 3) to invalidate.')
+    parser.add_argument('--monitor', default = None, help = 'JSON lines file where the time of each stage, the counts of the fits and the warnings of each task are saved.')
+    parser.add_argument('--validate', default = None, choices = ['kfold', 'forward'], help = 'Compares the in-sample and out-of-sample success of the models selected in and out of sample (k folds or PER1 -> PER2 -> PER3).')
+    parser.add_argument('--folds', type = int, default = 5, help = 'Number of folds of --validate kfold.')
+    parser.add_argument('--engine', default = 'subsets', choices = ['subsets', 'path'], help = 'Selection of the models: every subset of the terms, or their elastic-net path.')
+    parser.add_argument('--alpha', type = float, default = 1.0, help = 'Mixing of the L1 (1) and L2 (0) penalties of --engine path.')
+    parser.add_argument('--criterion', default = 'suc_p', choices = ['suc_p', 'deviance'], help = 'Point of the path of --engine path: highest success on ARB, or lowest cross-validated deviance.')
+    ARGS = parser.parse_args()
+
+    Monitor.enable(ARGS.monitor is not None)
+
+    if ARGS.invalidate and not ARGS.cache:
+        parser.error('--invalidate requires --cache.')
+
+    if ARGS.invalidate:
+        print(f'{invalidate_cache(ARGS.cache, ARGS.countries, ARGS.periods)} cached entries deleted.')
+        sys.exit()
+
+    DATA = load_data('Verdu_Carchano_Ruiz_2025_Data.csv')     # Open the data file (through its columnar cache).
+
+    Regions = ['AFR', 'AME', 'ASI', 'EUR']
+
+    Countries = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
+
+    Samples = ['F', '1', '2', '3']
+    Models = ['LGT', 'PRT']
+
+    Workers = os.cpu_count() or 1   # Number of processes used to estimate the models.
+
+    ##### OUT-OF-SAMPLE SUCCESS OF THE MODELS #####
+
+    if ARGS.validate:
+
+        TABLE = validate_models(DATA, Countries, ['F'] if ARGS.validate == 'forward' else Samples, Models, mode = ARGS.validate, k = ARGS.folds, workers = Workers)
+
+        for Row in TABLE.to_dict('records'):
+
+            if Row['Selection'] == 'In-sample':
+                print(f"==================== Validation for {Row['Country']} - Model: {Row['Model']} - Period: {Row['Sample']} ====================")
+
+            print(f"{Row['Selection']} selection (R2: {Row['R2']*100:.2f}%): {Row['Formula']}")
+            print(f"In sample: ARB: {Row['ARB']*100:.2f}% - nARB: {Row['nARB']*100:.2f}% - Total: {Row['Success']*100:.2f}% | "
+                  f"Out of sample: ARB: {Row['CV ARB']*100:.2f}% - nARB: {Row['CV nARB']*100:.2f}% - Total: {Row['CV Success']*100:.2f}%"
+                  + (f" ({Row['Unscored']} candidates not scored out of sample)" if Row['Unscored'] else ''))
+
+            if Row['Selection'] != 'In-sample':
+                print()
+
+        if ARGS.monitor:
+            Monitor.report(ARGS.monitor)
+
+        sys.exit()
+
+    ##### SUCCESS OF THE MODELS #####
+
+    if ARGS.engine == 'subsets':
+        GRID = predict_grid(DATA, Countries, Samples, Models, workers = Workers, cache = ARGS.cache)
+    else:
+        GRID = path_grid(DATA, Countries, Samples, Models, alpha = ARGS.alpha, criterion = ARGS.criterion)
+
+    for Country, Sample, Model, RESULT in GRID:
+
+        if Model is None:
+
+            print(f'==================== Results for {Country} - Period: {Sample} ====================')
             print('No Results available.')
             print()
 
         else:
 
-            for Model in Models:
+            Formula, R, SUC, SUC_P, SUC_N = RESULT
 
-                Formula, R, SUC, SUC_P, SUC_N = predict_mod(data, Model)
-                
-                if SUC == 0:
-                    
-                    print(f'==================== Results for {Countries[C]} - Model: {Model} - Period: {Sample} ====================')
-                    print('No Results available.')
-                    print()
+            if SUC == 0:
 
-                else:
+                print(f'==================== Results for {Country} - Model: {Model} - Period: {Sample} ====================')
+                print('No Results available.')
+                print()
+
+            else:
+
+                print(f'==================== Results for {Country} - Model: {Model} - Period: {Sample} ====================')
+                print(f'Formula (R2: {R*100:.2f}%): {Formula}')
+                print(f'Success: ARB: {SUC_P*100:.2f}% - nARB: {SUC_N*100:.2f}% - Total: {SUC*100:.2f}%')
+                print()
 
-                    print(f'==================== Results for {Countries[C]} - Model: {Model} - Period: {Sample} ====================')
-                    print(f'Formula (R2: {R*100:.2f}%): {Formula}')
-                    print(f'Success: ARB: {SUC_P*100:.2f}% - nARB: {SUC_N*100:.2f}% - Total: {SUC*100:.2f}%')
-                    print()
+    if ARGS.monitor:
+        Monitor.report(ARGS.monitor)
 
 #################### END OF THE CODE ####################
@@ -0,0 +1,216 @@
+# ======================================================================================================================================================
+
+# Instrumentation shared by the 3 parts of the code for the article Manuel Verdú, Óscar Carchano & Jesús Ruiz (2025) Detecting, characterizing, and predicting
+# arbitrage opportunities in international rights issues, Research in International Business and Finance, 74, 102719.
+
+# ======================================================================================================================================================
+
+# The instrumentation is disabled by default (every call returns at once). With the option --monitor PATH of each part of the code it records
+# the time spent in each stage (load, filter, fit, score, bootstrap...), the counters of the fits (attempted, converged, separated, singular),
+# the histogram of the Newton iterations and the warnings raised by each task, and saves them in PATH as JSON lines.
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import sys                              # Allows to print the summary on the standard error.
+import time                             # Allows to measure the time of each stage.
+import json                             # Allows to save the records as JSON lines.
+import warnings                         # Allows to capture the warnings of each task.
+import contextlib                       # Allows to use the stages in with statements.
+
+import numpy as np                      # Allows to work with Series.
+import pandas as pd						# Allows to organize the Data.
+
+#################### START OF COMPLEMENTARY FUNCTIONS ####################
+
+def enable(on = True):
+    """
+    Enables (or disables) the instrumentation of the current process.
+    """
+
+    global ENABLED
+
+    ENABLED = bool(on)
+
+def reset():
+    """
+    Removes every record of the current process.
+    """
+
+    for RECORDS in (STAGES, COUNTERS, HISTOGRAMS, WARNINGS):
+        RECORDS.clear()
+
+def stage(name):
+    """
+    Context manager that adds the time of its block to the stage name.
+    """
+
+    if not ENABLED:
+        return NULL
+
+    return timer(name)
+
+@contextlib.contextmanager
+def timer(name):
+    """
+    Times a block of the stage name (see stage).
+    """
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        RECORD = STAGES.setdefault(name, [0, 0.0])
+        RECORD[0] += 1
+        RECORD[1] += time.perf_counter() - start
+
+def count(name, k = 1):
+    """
+    Adds k to the counter name.
+    """
+
+    if ENABLED:
+        COUNTERS[name] = COUNTERS.get(name, 0) + int(k)
+
+def histogram(name, Values):
+    """
+    Adds the integer Values to the histogram name.
+    """
+
+    if ENABLED:
+        HISTOGRAM = HISTOGRAMS.setdefault(name, {})
+        for value, n in zip(*np.unique(np.asarray(Values, dtype = int), return_counts = True)):
+            HISTOGRAM[int(value)] = HISTOGRAM.get(int(value), 0) + int(n)
+
+def capture(task):
+    """
+    Context manager that records the warnings raised in its block under task (the scripts ignore them otherwise).
+    """
+
+    if not ENABLED:
+        return NULL
+
+    return catcher(task)
+
+@contextlib.contextmanager
+def catcher(task):
+    """
+    Records the warnings of a block of task (see capture).
+    """
+
+    with warnings.catch_warnings(record = True) as CAUGHT:
+
+        warnings.simplefilter('always')
+
+        try:
+            yield
+        finally:
+            for warning in CAUGHT:
+                key = (task, warning.category.__name__, str(warning.message))
+                WARNINGS[key] = WARNINGS.get(key, 0) + 1
+
+def drain():
+    """
+    Returns the records of the current process and removes them (None when disabled), so that a worker
+    process can send them to the main one after each task.
+    """
+
+    if not ENABLED:
+        return None
+
+    SNAPSHOT = records()
+    reset()
+
+    return SNAPSHOT
+
+def merge(SNAPSHOT):
+    """
+    Adds the records returned by drain in a worker process to those of the current process.
+    """
+
+    if not SNAPSHOT:
+        return
+
+    for RECORD in SNAPSHOT:
+
+        if RECORD['type'] == 'stage':
+            TOTAL = STAGES.setdefault(RECORD['name'], [0, 0.0])
+            TOTAL[0] += RECORD['calls']
+            TOTAL[1] += RECORD['seconds']
+
+        elif RECORD['type'] == 'counter':
+            COUNTERS[RECORD['name']] = COUNTERS.get(RECORD['name'], 0) + RECORD['count']
+
+        elif RECORD['type'] == 'histogram':
+            HISTOGRAM = HISTOGRAMS.setdefault(RECORD['name'], {})
+            for value, n in RECORD['counts'].items():
+                HISTOGRAM[int(value)] = HISTOGRAM.get(int(value), 0) + n
+
+        else:
+            key = (RECORD['task'], RECORD['category'], RECORD['message'])
+            WARNINGS[key] = WARNINGS.get(key, 0) + RECORD['count']
+
+def records():
+    """
+    Obtains the records of the current process as a list of dictionaries (one per stage, counter, histogram and warning).
+    """
+
+    return ([{'type': 'stage', 'name': name, 'calls': calls, 'seconds': seconds} for name, (calls, seconds) in STAGES.items()]
+            + [{'type': 'counter', 'name': name, 'count': n} for name, n in COUNTERS.items()]
+            + [{'type': 'histogram', 'name': name, 'counts': dict(sorted(HISTOGRAM.items()))} for name, HISTOGRAM in HISTOGRAMS.items()]
+            + [{'type': 'warning', 'task': task, 'category': category, 'message': message, 'count': n} for (task, category, message), n in WARNINGS.items()])
+
+def export(path, run = None):
+    """
+    Appends the records to path as JSON lines, each labelled with run (by default the name of the script).
+    """
+
+    run = run if run is not None else sys.argv[0]
+
+    with open(path, 'a') as file:
+        for RECORD in records():
+            file.write(json.dumps({'run': run, **RECORD}) + '\n')
+
+def summary():
+    """
+    Obtains the table of stages and counters, followed by the number of warnings of each category.
+    """
+
+    TABLE = [{'Kind': 'stage', 'Name': name, 'Count': calls, 'Seconds': seconds} for name, (calls, seconds) in STAGES.items()]
+    TABLE += [{'Kind': 'counter', 'Name': name, 'Count': n, 'Seconds': np.nan} for name, n in COUNTERS.items()]
+
+    for name, HISTOGRAM in HISTOGRAMS.items():
+        values = np.array(list(HISTOGRAM), dtype = float)
+        n = np.array(list(HISTOGRAM.values()), dtype = float)
+        TABLE.append({'Kind': 'histogram', 'Name': f'{name} (mean {values @ n / n.sum():.1f}, max {values.max():.0f})', 'Count': int(n.sum()), 'Seconds': np.nan})
+
+    CATEGORIES = {}
+    for (task, category, message), n in WARNINGS.items():
+        CATEGORIES[category] = CATEGORIES.get(category, 0) + n
+
+    TABLE += [{'Kind': 'warning', 'Name': category, 'Count': n, 'Seconds': np.nan} for category, n in CATEGORIES.items()]
+
+    return pd.DataFrame(TABLE, columns = ['Kind', 'Name', 'Count', 'Seconds'])
+
+def report(path = None, file = sys.stderr):
+    """
+    Prints the summary table on file and, if a path is given, saves the records there.
+    """
+
+    if path:
+        export(path)
+
+    print(summary().to_string(index = False), file = file)
+
+ENABLED = False     # The instrumentation is opt-in.
+
+NULL = contextlib.nullcontext()     # Context manager returned when the instrumentation is disabled.
+
+STAGES = {}         # Calls and seconds of each stage.
+COUNTERS = {}       # Value of each counter.
+HISTOGRAMS = {}     # Count of each value of each histogram.
+WARNINGS = {}       # Count of each (task, category, message) warning.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
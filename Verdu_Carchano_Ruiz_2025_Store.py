@@ -0,0 +1,166 @@
+# ======================================================================================================================================================
+
+# Data store shared by the 3 parts of the code for the article Manuel Verdú, Óscar Carchano & Jesús Ruiz (2025) Detecting, characterizing, and predicting
+# arbitrage opportunities in international rights issues, Research in International Business and Finance, 74, 102719.
+
+# ======================================================================================================================================================
+
+# The first time that the data file (Verdu_Carchano_Ruiz_2025_Data.csv) is opened, it is converted into a typed, columnar cache (one memory-mapped
+# .npy file per column) next to it. The cache is rebuilt whenever the content of the data file changes.
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import os                               # Allows to work with the files of the cache.
+import json                             # Allows to save the description of the cache.
+import shutil                           # Allows to remove the outdated caches.
+import hashlib                          # Allows to identify the content of the data file.
+import tempfile                         # Allows to build the cache without exposing it half-written.
+
+import numpy as np                      # Allows to work with Series.
+import pandas as pd						# Allows to organize the Data.
+
+from Verdu_Carchano_Ruiz_2025_Monitor import stage    # Allows to time the load of the data.
+
+#################### START OF COMPLEMENTARY FUNCTIONS ####################
+
+def load_data(path = 'Verdu_Carchano_Ruiz_2025_Data.csv', cache = None):
+    """
+    Opens the data of the article from its columnar cache (in cache, by default the data file followed by '.cache'),
+    building it when it does not exist for the current content of the data file.
+    The columns are memory-mapped, so that every process that opens the data shares the same pages.
+    Returns a DataFrame with categorical Region/Country/PER, compact numeric columns and the CLEAN mask.
+    """
+
+    with stage('load'):
+
+        cache = path + '.cache' if cache is None else cache
+        folder = os.path.join(cache, file_hash(path))
+
+        if not os.path.exists(os.path.join(folder, 'meta.json')):
+            build_cache(path, cache, folder)
+
+        with open(os.path.join(folder, 'meta.json')) as file:
+            META = json.load(file)
+
+        COLUMNS = {}
+
+        for Column in META['columns']:
+
+            Values = np.load(os.path.join(folder, f'{Column}.npy'), mmap_mode = 'r')
+
+            if Column in META['categories']:
+                COLUMNS[Column] = pd.Categorical.from_codes(Values, categories = META['categories'][Column])
+            else:
+                COLUMNS[Column] = Values
+
+        return pd.DataFrame(COLUMNS, copy = False)
+
+def build_cache(path, cache, folder):
+    """
+    Converts the data file into one .npy file per column and removes the caches of previous versions of the file.
+    The cache is written in a temporary folder and then renamed, so that concurrent processes never see it half-written.
+    """
+
+    DATA = pd.read_csv(path, delimiter = ';')
+
+    os.makedirs(cache, exist_ok = True)
+    temporary = tempfile.mkdtemp(dir = cache)
+
+    META = {'source': os.path.basename(path), 'columns': list(DATA.columns) + ['CLEAN'], 'categories': {}, 'dtypes': {}}
+
+    for Column in DATA.columns:
+
+        if Column in CATEGORICAL or not pd.api.types.is_numeric_dtype(DATA[Column]):
+            Values = DATA[Column].astype('category')
+            META['categories'][Column] = Values.cat.categories.tolist()
+            Values = Values.cat.codes.to_numpy().astype(code_type(len(META['categories'][Column])))
+        else:
+            Values = compact(DATA[Column].to_numpy())
+
+        META['dtypes'][Column] = Values.dtype.str
+        np.save(os.path.join(temporary, f'{Column}.npy'), Values)
+
+    np.save(os.path.join(temporary, 'CLEAN.npy'), clean_mask(DATA).to_numpy())
+
+    with open(os.path.join(temporary, 'meta.json'), 'w') as file:
+        json.dump(META, file, indent = 1)
+
+    try:
+        os.replace(temporary, folder)
+    except OSError:
+        shutil.rmtree(temporary)    # Another process has just built the same cache.
+
+    for Old in os.listdir(cache):
+        if os.path.join(cache, Old) != folder and not Old.startswith('tmp'):
+            shutil.rmtree(os.path.join(cache, Old), ignore_errors = True)
+
+def compact(Values):
+    """
+    Stores a numeric column in the smallest type that keeps every value: int8 for small integers without
+    missing values, float32 when every value (and NaN) is exactly representable, and float64 otherwise.
+    """
+
+    Values = np.asarray(Values, dtype = float)
+    finite = np.isfinite(Values)
+
+    if finite.all() and np.array_equal(Values, np.round(Values)) and (np.abs(Values) <= 127).all():
+        return Values.astype(np.int8)
+
+    if np.array_equal(Values.astype(np.float32).astype(float), Values, equal_nan = True):
+        return Values.astype(np.float32)
+
+    return Values
+
+def code_type(n):
+    """
+    Obtains the smallest integer type that keeps the codes of n categories (and -1 for the missing values).
+    """
+
+    return next(Type for Type in (np.int8, np.int16, np.int32, np.int64) if n - 1 <= np.iinfo(Type).max)
+
+def file_hash(path, block = 2**20):
+    """
+    Obtains the SHA-1 of the content of a file.
+    """
+
+    Hash = hashlib.sha1()
+
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(block), b''):
+            Hash.update(chunk)
+
+    return Hash.hexdigest()
+
+def clean_mask(DATA):
+    """
+    Obtains the clean sample used by every part of the article: no outliers and non-zero DIL, ISC and CAP.
+    The mask precomputed in the cache is used when available.
+    """
+
+    if 'CLEAN' in DATA.columns:
+        return DATA['CLEAN']
+
+    return (DATA['OUT'] == 0) & (DATA['DIL'] != 0) & (DATA['ISC'] != 0) & (DATA['CAP'] != 0)
+
+def prefix_hash(DATA, rows):
+    """
+    Obtains a hash of the first rows of the data (without the CLEAN mask), used by the incremental modes
+    to check that the offerings already ingested have not changed. The values are hashed as float64 (numeric columns)
+    or strings (the rest), so that the hash does not depend on the types of the cache, which the appended rows can change.
+    """
+
+    PREFIX = DATA[[Column for Column in DATA.columns if Column != 'CLEAN']].iloc[:rows]
+    PREFIX = pd.DataFrame({Column: PREFIX[Column].to_numpy(dtype = float) if pd.api.types.is_numeric_dtype(PREFIX[Column])
+                           else PREFIX[Column].astype(str).to_numpy(dtype = object) for Column in PREFIX.columns})
+
+    return str(int(pd.util.hash_pandas_object(PREFIX, index = False).sum()))
+
+CATEGORICAL = ('Region', 'Country', 'PER')     # Columns stored as categories.
+
+REGIONS = ['AFR', 'AME', 'ASI', 'EUR']      # Regions of the article.
+
+COUNTRIES = ['EGY', 'SAU', 'TUN', 'BRA', 'CAN', 'USA', 'AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA', 'AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']   # Countries of the article.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
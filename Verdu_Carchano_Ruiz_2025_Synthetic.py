@@ -0,0 +1,111 @@
+# ======================================================================================================================================================
+
+# Synthetic data for the code of the article Manuel Verdú, Óscar Carchano & Jesús Ruiz (2025) Detecting, characterizing, and predicting
+# arbitrage opportunities in international rights issues, Research in International Business and Finance, 74, 102719.
+
+# ======================================================================================================================================================
+
+# The data of the article is only available in https://doi.org/10.5281/zenodo.18054892. This file generates data with the same columns
+# (and similar distributions) at any size, to time the 3 parts of the code. The results obtained from it are meaningless.
+
+#   python Verdu_Carchano_Ruiz_2025_Synthetic.py 100000 --path Verdu_Carchano_Ruiz_2025_Data.csv
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import argparse                         # Allows to read the options of the command line.
+
+import numpy as np                      # Allows to work with Series.
+import pandas as pd						# Allows to organize the Data.
+
+#################### START OF COMPLEMENTARY FUNCTIONS ####################
+
+def synthetic_data(n, seed = 0, start = 0, total = None):
+    """
+    Generates n offerings with the columns of the data file: Country, Region, PER, the main variables, the 12 sector
+    dummies, ARR and ARB. The countries and periods appear in the proportions of the article, and ARR depends on DIL and IDX.
+    The offerings are in chronological order: their period is that of their position in a file of total offerings
+    (n by default) where they start at row start, so that the chunks of a file (see write_data) follow each other.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    Pairs = [(Country, Region) for Region, Codes in COUNTRIES.items() for Country in Codes]
+    pair = rng.choice(len(Pairs), n, p = COUNTRY_WEIGHTS / COUNTRY_WEIGHTS.sum())
+
+    total = n if total is None else total
+    period = np.searchsorted(np.cumsum(PERIOD_WEIGHTS)[:-1] * total, start + np.arange(n), side = 'right')
+
+    DATA = pd.DataFrame({
+        'Country': np.array([Country for Country, Region in Pairs])[pair],
+        'Region': np.array([Region for Country, Region in Pairs])[pair],
+        'PER': np.array(PERIODS)[period]
+        })
+
+    DATA['DIL'] = np.where(rng.random(n) < 0.02, 0, np.round(rng.gamma(2, 0.3, n), 4))
+    DATA['IDX'] = (rng.random(n) < 0.3).astype(int)
+    DATA['ISC'] = np.where(rng.random(n) < 0.01, 0, np.round(rng.gamma(2, 0.5, n), 4))
+    DATA['CAP'] = np.round(rng.lognormal(5, 1, n), 2)
+    DATA['OUT'] = (rng.random(n) < 0.03).astype(int)
+
+    for Variable in ('GEN', 'ACQ', 'INV', 'REF'):
+        DATA[Variable] = (rng.random(n) < 0.25).astype(int)
+
+    sector = rng.choice(len(SECTORS), n, p = SECTOR_WEIGHTS)
+
+    for s, Sector in enumerate(SECTORS):
+        DATA[Sector] = (sector == s).astype(int)
+
+    ARR = 0.01 + 0.02 * DATA['DIL'] - 0.01 * DATA['IDX'] + 0.05 * rng.standard_t(4, n)
+
+    DATA['ARR'] = np.where(rng.random(n) < 0.01, np.nan, np.round(ARR, 6))
+    DATA['ARB'] = (DATA['ARR'] > 0.02).astype(int)
+
+    return DATA
+
+def write_data(path, n, seed = 0, chunk = 10**6):
+    """
+    Writes n synthetic offerings in a data file with the format of the article (';' as delimiter).
+    The offerings are generated in chunks of chunk rows, each with its own seed, so that the memory used does not grow with n;
+    the periods follow the position of each offering in the whole file.
+    """
+
+    Seeds = np.random.SeedSequence(seed).spawn(max(1, -(-n // chunk)))
+
+    for c, Seed in enumerate(Seeds):
+        DATA = synthetic_data(min(chunk, n - c * chunk), seed = Seed, start = c * chunk, total = n)
+        DATA.to_csv(path, sep = ';', index = False, header = c == 0, mode = 'w' if c == 0 else 'a')
+
+COUNTRIES = {
+    'AFR': ['EGY', 'SAU', 'TUN'],
+    'AME': ['BRA', 'CAN', 'USA'],
+    'ASI': ['AUS', 'HKG', 'IND', 'MYS', 'NZL', 'PAK', 'SGP', 'LKA'],
+    'EUR': ['AUT', 'BEL', 'DNK', 'FIN', 'FRA', 'DEU', 'GRC', 'ITA', 'NOR', 'POL', 'ESP', 'SWE', 'GBR']
+    }
+
+COUNTRY_WEIGHTS = np.array([2, 3, 1, 2, 8, 4, 12, 6, 8, 6, 2, 3, 4, 2, 1, 2, 2, 2, 4, 4, 3, 6, 3, 4, 4, 4, 8], dtype = float)   # Relative size of each country.
+
+PERIODS = ('PER1', 'PER2', 'PER3')     # Periods of the article, in chronological order.
+
+PERIOD_WEIGHTS = np.array([0.3, 0.3, 0.4])      # Share of the offerings in each period.
+
+SECTORS = ('ACA', 'BAS', 'CYC', 'NCY', 'ENE', 'FIN', 'GOV', 'HEA', 'IND', 'EST', 'TEC', 'UTI')     # Economic sectors.
+
+SECTOR_WEIGHTS = np.array([0.01, 0.1, 0.1, 0.1, 0.1, 0.15, 0.01, 0.1, 0.1, 0.08, 0.1, 0.05])      # Share of each economic sector.
+
+#################### END OF COMPLEMENTARY FUNCTIONS ####################
+
+#################### START OF THE CODE ####################
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Synthetic data with the format of the data file of the article.')
+    parser.add_argument('rows', type = int, help = 'Number of offerings (e.g. from 1000 to 10000000).')
+    parser.add_argument('--path', default = 'Verdu_Carchano_Ruiz_2025_Data.csv', help = 'Data file to write.')
+    parser.add_argument('--seed', type = int, default = 0, help = 'Seed of the generator.')
+    ARGS = parser.parse_args()
+
+    write_data(ARGS.path, ARGS.rows, seed = ARGS.seed)
+
+#################### END OF THE CODE ####################
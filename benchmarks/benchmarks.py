@@ -0,0 +1,105 @@
+# ======================================================================================================================================================
+
+# Benchmarks (asv) of the 3 parts of the code for the article Manuel Verdú, Óscar Carchano & Jesús Ruiz (2025) Detecting, characterizing, and predicting
+# arbitrage opportunities in international rights issues, Research in International Business and Finance, 74, 102719.
+
+# ======================================================================================================================================================
+
+# Every benchmark runs on synthetic data (see Verdu_Carchano_Ruiz_2025_Synthetic.py) of several sizes, and is timed (time_) and
+# measured in peak memory (peakmem_), so that the scaling of each step and its regressions between commits are visible.
+
+#   asv run                 (every commit of the branch)
+#   asv run --quick         (a single repetition of each benchmark)
+#   asv compare HEAD~1 HEAD
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import numpy as np                      # Allows to work with Series.
+
+from Verdu_Carchano_Ruiz_2025_Synthetic import synthetic_data
+from Verdu_Carchano_Ruiz_2025_Store import clean_mask
+
+import Verdu_Carchano_Ruiz_2025_Code1 as Code1
+import Verdu_Carchano_Ruiz_2025_Code2 as Code2
+import Verdu_Carchano_Ruiz_2025_Code3 as Code3
+
+#################### START OF THE BENCHMARKS ####################
+
+class CalculateStats:
+    """
+    Descriptive statistics, tests and bootstrap of the clean sample (Code1).
+    """
+
+    params = [1000, 10000, 100000]
+    param_names = ['rows']
+    timeout = 600
+
+    def setup(self, n):
+        DATA = synthetic_data(n)
+        self.data = DATA[clean_mask(DATA)]
+
+    def time_calculate_stats(self, n):
+        Code1.calculate_stats(self.data)
+
+    def peakmem_calculate_stats(self, n):
+        Code1.calculate_stats(self.data)
+
+class EstimateRegion:
+    """
+    OLS, FGLS and FOGLS models of a region, with their restricted models and KW tests (Code2).
+    """
+
+    params = [1000, 10000, 100000]
+    param_names = ['rows']
+    timeout = 600
+
+    def setup(self, n):
+        self.data = Code2.region_sample(synthetic_data(n), 'EUR')
+
+    def time_estimate_region(self, n):
+        Code2.estimate_region(self.data, 'ARR ~ DIL + IDX + ISC + CAP', (1, 0, 1), ['DIL', 'IDX'])
+
+    def peakmem_estimate_region(self, n):
+        Code2.estimate_region(self.data, 'ARR ~ DIL + IDX + ISC + CAP', (1, 0, 1), ['DIL', 'IDX'])
+
+class PredictMod:
+    """
+    Search of the model that best predicts the arbitrages of a sample (Code3).
+    """
+
+    params = ([1000, 10000], ['LGT', 'PRT'])
+    param_names = ['rows', 'model']
+    timeout = 1200
+
+    def setup(self, n, Model):
+        DATA = synthetic_data(n)
+        self.data = DATA[clean_mask(DATA)]
+
+    def time_predict_mod(self, n, Model):
+        Code3.predict_mod(self.data, Model)
+
+    def peakmem_predict_mod(self, n, Model):
+        Code3.predict_mod(self.data, Model)
+
+class Success:
+    """
+    Success of the predictions of a fitted model (Code3).
+    """
+
+    params = [1000, 100000, 10000000]
+    param_names = ['rows']
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.FIT = rng.standard_normal(n)
+        self.DEP = (rng.random(n) < 0.4).astype(float)
+
+    def time_success(self, n):
+        Code3.success(self.FIT, self.DEP)
+
+    def peakmem_success(self, n):
+        Code3.success(self.FIT, self.DEP)
+
+#################### END OF THE BENCHMARKS ####################
@@ -0,0 +1,39 @@
+# ======================================================================================================================================================
+
+# Tests of the 3 parts of the code for the article Manuel Verdú, Óscar Carchano & Jesús Ruiz (2025) Detecting, characterizing, and predicting
+# arbitrage opportunities in international rights issues, Research in International Business and Finance, 74, 102719.
+
+# ======================================================================================================================================================
+
+# Every test runs on synthetic data (see Verdu_Carchano_Ruiz_2025_Synthetic.py), opened through the typed store as the scripts do.
+
+#   python -m pytest tests
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import os                               # Allows to find the scripts of the repository.
+import sys                              # Allows to import the scripts of the repository.
+
+import pytest                           # Allows to share the data between the tests.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Verdu_Carchano_Ruiz_2025_Synthetic import write_data
+from Verdu_Carchano_Ruiz_2025_Store import load_data
+
+#################### START OF THE FIXTURES ####################
+
+@pytest.fixture(scope = 'session')
+def DATA(tmp_path_factory):
+    """
+    Synthetic offerings written as a data file and opened through its typed cache.
+    """
+
+    path = str(tmp_path_factory.mktemp('data') / 'Verdu_Carchano_Ruiz_2025_Data.csv')
+    write_data(path, 3000, seed = 0)
+
+    return load_data(path)
+
+#################### END OF THE FIXTURES ####################
@@ -0,0 +1,87 @@
+# ======================================================================================================================================================
+
+# Tests of the descriptive statistics (Verdu_Carchano_Ruiz_2025_Code1.py).
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import numpy as np                      # Allows to work with Series.
+
+import Verdu_Carchano_Ruiz_2025_Code1 as Code1
+
+from Verdu_Carchano_Ruiz_2025_Synthetic import write_data
+from Verdu_Carchano_Ruiz_2025_Store import load_data
+
+#################### START OF THE TESTS ####################
+
+def test_update_grid_serves_a_new_selection(DATA, tmp_path):
+    """
+    A state ingested with one selection serves a wider one (new groups, on new offerings) as a full run does.
+    """
+
+    path = str(tmp_path / 'state.json')
+    Samples = list(Code1.Sample_Cells)
+
+    Code1.update_grid(DATA.iloc[:len(DATA) // 2], ['EUR'], [], Samples, path, n_bootstrap = 99, total = False)
+    STATS = Code1.update_grid(DATA, ['EUR', 'AFR'], ['ESP'], Samples, path, n_bootstrap = 99)
+    FULL = Code1.describe_grid(DATA, ['EUR', 'AFR'], ['ESP'], Samples, n_bootstrap = 99)
+
+    Numeric = [Column for Column in FULL.columns if Column not in ('Level', 'Code', 'Sample')]
+
+    assert (STATS[['Level', 'Code', 'Sample']].to_numpy() == FULL[['Level', 'Code', 'Sample']].to_numpy()).all()
+    np.testing.assert_allclose(STATS[Numeric].to_numpy(dtype = float), FULL[Numeric].to_numpy(dtype = float), rtol = 1e-10, atol = 1e-12)
+
+def test_describe_grid_counts_outliers_as_the_article(DATA):
+    """
+    The legacy outliers of the full samples are those of the article (0); otherwise they are the offerings with OUT == 1.
+    """
+
+    LEGACY = Code1.describe_grid(DATA, ['EUR'], [], ['F'], n_bootstrap = 99)
+    COUNTS = Code1.describe_grid(DATA, ['EUR'], [], ['F'], n_bootstrap = 99, legacy = False)
+
+    assert (LEGACY['Outliers'] == 0).all()
+    assert COUNTS['Outliers'].tolist() == [int((DATA['OUT'] == 1).sum()), int(((DATA['OUT'] == 1) & (DATA['Region'] == 'EUR')).sum())]
+
+def test_stream_grid_equals_describe_grid(tmp_path):
+    """
+    Read in chunks, the moments and tests of every cell are those of describe_grid; the medians of the cells larger
+    than the sketch are within its rank error (1.7 / k), and the Poisson bootstrap CIs within 0.75 standard errors of
+    the mean of those of describe_grid (about twice the distance between the CIs of describe_grid with two seeds).
+    """
+
+    path = str(tmp_path / 'data.csv')
+    write_data(path, 3000, seed = 0)
+
+    DATA, Samples, k = load_data(path), list(Code1.Sample_Cells), 200
+    FULL = Code1.describe_grid(DATA, ['EUR', 'AFR'], ['ESP'], Samples)
+    STREAM = Code1.stream_grid(path, ['EUR', 'AFR'], ['ESP'], Samples, chunksize = 400, k = k)
+
+    Exact = ['Outliers', 'N', 'ARB', 'R', 'Mean', 'Std', 'Maximum', 'Minimum', 'Skewness', 'Kurtosis', 'T-test p-value']
+
+    assert (STREAM[['Level', 'Code', 'Sample']].to_numpy() == FULL[['Level', 'Code', 'Sample']].to_numpy()).all()
+    np.testing.assert_allclose(STREAM[Exact].to_numpy(dtype = float), FULL[Exact].to_numpy(dtype = float), rtol = 1e-10, atol = 1e-12)
+    assert (FULL['N'] > k).any()
+
+    INDEX = Code1.partition_index(DATA)
+
+    for i, ROW in FULL.iterrows():
+
+        arr = Code1.index_cell(INDEX, ROW['Level'], ROW['Code'], ROW['Sample'])[0]
+        arr = np.sort(arr[~np.isnan(arr)])
+
+        if len(arr) == 0:
+            continue
+
+        if len(arr) <= k:
+            assert STREAM.loc[i, 'Median'] == ROW['Median']
+        else:
+            below, above = np.searchsorted(arr, STREAM.loc[i, 'Median'], side = 'left'), np.searchsorted(arr, STREAM.loc[i, 'Median'], side = 'right')
+            assert below / len(arr) - 1.7 / k <= 0.5 <= above / len(arr) + 1.7 / k
+
+        se = ROW['Std'] / np.sqrt(ROW['N'])
+
+        assert abs(STREAM.loc[i, 'Bootstrap CI Lower'] - ROW['Bootstrap CI Lower']) < 0.75 * se
+        assert abs(STREAM.loc[i, 'Bootstrap CI Upper'] - ROW['Bootstrap CI Upper']) < 0.75 * se
+
+#################### END OF THE TESTS ####################
@@ -0,0 +1,239 @@
+# ======================================================================================================================================================
+
+# Tests of the models of the returns (Verdu_Carchano_Ruiz_2025_Code2.py).
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import numpy as np                      # Allows to work with Series.
+import pandas as pd						# Allows to organize the Data.
+import pytest                           # Allows to repeat the tests over the regions and AR coefficients.
+
+from scipy import stats                 # Allows to work with statistical tests and distributions
+from scipy.linalg import toeplitz       # Allows to build the dense covariance matrices.
+
+import Verdu_Carchano_Ruiz_2025_Code2 as Code2
+
+#################### START OF THE TESTS ####################
+
+def test_update_accumulators_equals_full_refit(DATA, tmp_path):
+    """
+    The OLS models updated from the offerings appended since the last run are those fitted on every offering.
+    """
+
+    path = str(tmp_path / 'state.json')
+    Formula = 'ARR ~ DIL + IDX + ISC + CAP'
+
+    Code2.update_accumulators(DATA.iloc[:len(DATA) // 3], ['EUR'], Formula, path)
+    Code2.update_accumulators(DATA.iloc[:2 * len(DATA) // 3], ['EUR'], Formula, path)
+    FITS = Code2.update_accumulators(DATA, ['AFR', 'EUR'], Formula, path)
+
+    sm = Code2.statsmodels_api()
+
+    for Region in ('AFR', 'EUR'):
+
+        data = Code2.region_sample(DATA, Region)
+        res = sm.OLS.from_formula(Formula, data).fit(cov_type = 'HC1')
+
+        assert FITS[Region]['nobs'] == len(data)
+        np.testing.assert_allclose(FITS[Region]['params'], res.params.to_numpy(), rtol = 1e-8, atol = 1e-12)
+        np.testing.assert_allclose(FITS[Region]['bse'], res.bse.to_numpy(), rtol = 1e-6)
+
+def test_select_order_takes_the_ar_coefficient(DATA):
+    """
+    The rho of a differenced order (without constant, so that its second parameter is not an AR coefficient) is its ar.L1.
+    """
+
+    ARR = Code2.region_sample(DATA, 'EUR')['ARR'].reset_index(drop = True).astype(float)
+
+    for Order in ((2, 1, 0), (1, 1, 1)):
+
+        res = Code2.arima_fit(ARR, Order)
+        BEST = Code2.select_order(ARR, Grid = [Order])
+
+        assert BEST['order'] == Order
+        assert BEST['rho'] == float(res.params['ar.L1'])
+        assert BEST['rho'] != float(res.params.iloc[1])
+
+def test_select_order_chooses_the_differencing_first():
+    """
+    The order of differencing is that of the unit-root tests (levels for a stationary AR(1), differences for its
+    random walk), and the order is then selected among those with that differencing.
+    """
+
+    e = np.random.default_rng(0).standard_normal(400)
+    AR = np.zeros(400)
+
+    for t in range(1, 400):
+        AR[t] = 0.5 * AR[t - 1] + e[t]
+
+    for x, d in ((AR, 0), (np.cumsum(AR), 1)):
+
+        assert Code2.unit_root_order(x, 'kpss') == d
+        assert Code2.unit_root_order(x, 'adf') == d
+        assert Code2.select_order(x, top = 3)['order'][1] == d
+
+def test_update_accumulators_keeps_precision_at_large_levels(DATA, tmp_path):
+    """
+    With CAP moved to about 1e6 and ten appends, the incremental OLS is that of the data at its own level, with the
+    intercept moved back (y = X M b, M the identity minus 1e6 in the row of the intercept and the column of CAP).
+    """
+
+    path = str(tmp_path / 'state.json')
+    Formula = 'ARR ~ DIL + IDX + ISC + CAP'
+    LEVEL = DATA.assign(CAP = DATA['CAP'] + 1e6)
+
+    for m in range(1, 11):
+        FITS = Code2.update_accumulators(LEVEL.iloc[:len(DATA) * m // 10], ['EUR'], Formula, path)
+
+    res = Code2.statsmodels_api().OLS.from_formula(Formula, Code2.region_sample(DATA, 'EUR')).fit(cov_type = 'HC1')
+    M = np.eye(5)
+    M[0, 4] = -1e6
+
+    np.testing.assert_allclose(FITS['EUR']['params'], M @ res.params.to_numpy(), rtol = 1e-10)
+    np.testing.assert_allclose(FITS['EUR']['bse'], np.sqrt(np.diag(M @ res.cov_params().to_numpy() @ M.T)), rtol = 1e-10)
+
+@pytest.mark.parametrize('window', [100, None])
+def test_rolling_ols_equals_statsmodels(DATA, window):
+    """
+    The rolling (and expanding) OLS, with a refresh short enough to be crossed, are those of statsmodels' RollingOLS
+    (HCCM is HC0, taken to HC1), both on the data and with CAP moved to about 1e6 (where the intercept is moved back).
+    """
+
+    from patsy import dmatrices
+    from statsmodels.regression.rolling import RollingOLS
+
+    y, X = dmatrices('ARR ~ DIL + IDX + ISC + CAP', Code2.region_sample(DATA, 'EUR'), return_type = 'dataframe')
+    n, k = X.shape
+
+    res = RollingOLS(y, X, window = window or n, expanding = window is None, min_nobs = window or k + 1).fit(cov_type = 'HCCM')
+    nobs = res.nobs.to_numpy().astype(float)[:, None]
+    M = np.eye(k)
+    M[0, 4] = -1e6
+
+    PATH = Code2.rolling_ols(y.to_numpy(), X.to_numpy(), window, refresh = 50)
+    LEVEL = Code2.rolling_ols(y.to_numpy(), X.assign(CAP = X['CAP'] + 1e6).to_numpy(), window, refresh = 50)
+
+    np.testing.assert_allclose(PATH['params'], res.params.to_numpy(), rtol = 1e-8, atol = 1e-12)
+    np.testing.assert_allclose(PATH['bse'], res.bse.to_numpy() * np.sqrt(nobs / (nobs - k)), rtol = 1e-8)
+    np.testing.assert_allclose(LEVEL['params'], res.params.to_numpy() @ M.T, rtol = 1e-8, atol = 1e-12)
+
+@pytest.mark.parametrize('method', ['wild', 'pairs'])
+def test_bootstrap_region_does_not_depend_on_workers(DATA, method):
+    """
+    The bootstrap of a region, split into several blocks, gives the same results in one process and in a pool of two,
+    and other results for another region (key).
+    """
+
+    FITS = Code2.estimate_region(Code2.region_sample(DATA, 'EUR'), Order = Code2.ORDERS['EUR'])
+    max_bytes = 2 * 8 * len(FITS['OLS']['res'].resid) * 7 * 20     # Blocks of 40 replicates.
+
+    SERIAL = Code2.bootstrap_region(FITS, n_bootstrap = 99, method = method, key = 'EUR', workers = 1, max_bytes = max_bytes)
+    POOLED = Code2.bootstrap_region(FITS, n_bootstrap = 99, method = method, key = 'EUR', workers = 2, max_bytes = max_bytes)
+    OTHER = Code2.bootstrap_region(FITS, n_bootstrap = 99, method = method, key = 'AFR', workers = 1, max_bytes = max_bytes)
+
+    for Estimator in FITS:
+
+        for Name in ('bse', 'ci_lower', 'ci_upper', 'pvalues'):
+            assert (SERIAL[Estimator][Name] == POOLED[Estimator][Name]).all()
+
+        assert SERIAL[Estimator]['KW'] == POOLED[Estimator]['KW']
+        assert (SERIAL[Estimator]['bse'] != OTHER[Estimator]['bse']).any()
+
+def dense_sigma(phi, n):
+    """
+    Dense correlation matrix of n observations of a stationary AR(p) process (rho ** |i - j| for AR(1), as in the article).
+    """
+
+    from statsmodels.tsa.arima_process import arma_acf
+
+    return toeplitz(arma_acf(np.r_[1, -np.asarray(phi)], [1], lags = n))
+
+@pytest.mark.parametrize('phi', [[0.4], [0.3, -0.2]])
+def test_argls_equals_dense_gls(DATA, phi):
+    """
+    The Prais-Winsten ARGLS gives the estimates, HC1 standard errors, residuals and likelihood of sm.GLS with the dense sigma.
+    """
+
+    from patsy import dmatrices
+
+    sm = Code2.statsmodels_api()
+    y, X = dmatrices('ARR ~ DIL + IDX + ISC + CAP', Code2.region_sample(DATA, 'AME'), return_type = 'dataframe')
+
+    res = Code2.argls_class()(y, X, phi = phi).fit(cov_type = 'HC1')
+    dense = sm.GLS(y, X, sigma = dense_sigma(phi, len(y))).fit(cov_type = 'HC1')
+
+    np.testing.assert_allclose(res.params, dense.params, rtol = 1e-10, atol = 1e-12)
+    np.testing.assert_allclose(res.bse, dense.bse, rtol = 1e-10)
+    np.testing.assert_allclose(res.resid, dense.resid, atol = 1e-12)
+    assert res.llf == pytest.approx(dense.llf, rel = 1e-12)
+
+def test_restricted_fits_equal_refitted_models(DATA):
+    """
+    The restricted models obtained from the QR factorization of each full model are those estimated without the variable
+    (with the dense sigma for the FGLS).
+    """
+
+    sm = Code2.statsmodels_api()
+    FITS = Code2.estimate_region(Code2.region_sample(DATA, 'EUR'), Order = Code2.ORDERS['EUR'])
+
+    for Estimator, FIT in FITS.items():
+
+        model = FIT['res'].model
+
+        for Variable, RES in FIT['restricted'].items():
+
+            X = pd.DataFrame(model.exog, columns = model.exog_names).drop(columns = Variable)
+
+            if Estimator == 'FGLS':
+                res = sm.GLS(model.endog, X, sigma = dense_sigma(model.phi, len(X))).fit(cov_type = 'HC1')
+            else:
+                res = sm.OLS(model.endog, X).fit(cov_type = 'HC1')
+
+            np.testing.assert_allclose(RES['params'].to_numpy(), res.params.to_numpy(), rtol = 1e-10, atol = 1e-12)
+            np.testing.assert_allclose(RES['bse'].to_numpy(), res.bse.to_numpy(), rtol = 1e-9)
+            np.testing.assert_allclose(RES['resid'].to_numpy(), res.resid, atol = 1e-12)
+
+def test_estimate_groups_equals_estimate_region(DATA):
+    """
+    The grouped OLS, FGLS and FOGLS of every region and sample are those of estimate_region on the sample alone.
+    """
+
+    TABLE = Code2.estimate_groups(DATA, By = 'Region', Samples = ('F', '1'))
+
+    for Region in ('AFR', 'EUR'):
+        for Sample in ('F', '1'):
+
+            data = Code2.region_sample(DATA, Region)
+            FITS = Code2.estimate_region(data[Code2.sample_rows(data, Sample)], Order = Code2.ORDERS[Region])
+
+            for Estimator, FIT in FITS.items():
+
+                res = FIT['res']
+                GROUP = TABLE[(TABLE['Region'] == Region) & (TABLE['Sample'] == Sample) & (TABLE['Estimator'] == Estimator)].set_index('Term')
+
+                assert (GROUP['N'] == res.nobs).all()
+                np.testing.assert_allclose(GROUP.loc[res.params.index, 'Coefficient'], res.params, rtol = 1e-9, atol = 1e-12)
+                np.testing.assert_allclose(GROUP.loc[res.bse.index, 'Std. Error'], res.bse, rtol = 1e-9)
+
+@pytest.mark.parametrize('n1, n2', [(6, 7), (8, 9)])
+def test_kruskal_permutation_equals_scipy(n1, n2):
+    """
+    The exact permutation KW test (with ties) gives the statistic of stats.kruskal and the p-value of
+    stats.permutation_test over every permutation; the Monte Carlo one is within 4 standard errors of it.
+    """
+
+    rng = np.random.default_rng(3)
+    A, B = np.round(rng.normal(0, 1, n1), 1), np.round(rng.normal(0.5, 1, n2), 1)
+
+    EXACT = Code2.kruskal_permutation(A, B, n_permutations = 30000)
+    SAMPLED = Code2.kruskal_permutation(A, B, n_permutations = 999)
+    SCIPY = stats.permutation_test((A, B), lambda a, b: stats.kruskal(a, b)[0], permutation_type = 'independent', alternative = 'greater', n_resamples = np.inf)
+
+    assert EXACT['exact'] and not SAMPLED['exact']
+    assert EXACT['statistic'] == pytest.approx(stats.kruskal(A, B)[0], rel = 1e-12)
+    assert EXACT['pvalue'] == pytest.approx(SCIPY.pvalue, rel = 1e-12)
+    assert abs(SAMPLED['pvalue'] - EXACT['pvalue']) < 4 * SAMPLED['error']
+
+#################### END OF THE TESTS ####################
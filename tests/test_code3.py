@@ -0,0 +1,196 @@
+# ======================================================================================================================================================
+
+# Tests of the prediction of the arbitrages (Verdu_Carchano_Ruiz_2025_Code3.py).
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import numpy as np                      # Allows to work with Series.
+import pytest                           # Allows to repeat the tests over the samples and models.
+
+import Verdu_Carchano_Ruiz_2025_Code3 as Code3
+
+#################### START OF THE TESTS ####################
+
+def article_success(FIT, DEP):
+    """
+    Success of a fit as the code of the article obtained it (one offering at a time), the reference of score_batch.
+    """
+
+    pos = sum(1 for a in DEP if a == 1)
+    neg = sum(1 for a in DEP if a == 0)
+
+    PRD_P = sum(1 for f in range(len(FIT)) if DEP[f] == 1 and FIT[f] >= 2/3)
+    PRD_N = sum(1 for f in range(len(FIT)) if DEP[f] == 0 and FIT[f] <= 1/3)
+
+    return (PRD_P + PRD_N) / len(DEP), PRD_P / pos, PRD_N / neg
+
+def article_search(X, y, Model):
+    """
+    Search of the article over the columns of the design matrix: statsmodels fits of every candidate, the failed ones
+    with a success of 0, and the first candidate with the highest success on ARB at each step.
+    """
+
+    sm = pytest.importorskip('statsmodels.api')
+
+    def suc_p(Cols):
+        try:
+            res = (sm.Logit if Model == 'LGT' else sm.Probit)(y, X[:, Cols]).fit(cov_type = 'HC1', disp = 0, warn_convergence = False)
+            return article_success(res.fittedvalues, y)[1]
+        except Exception:
+            return 0
+
+    Formulas1, Columns1 = Code3.main_candidates()
+    SUC_P1 = [suc_p(Cols) for Cols in Columns1]
+    FormulaS = Formulas1[SUC_P1.index(max(SUC_P1))]
+
+    Formulas2, Columns2 = Code3.interaction_candidates(FormulaS + ' + ', FormulaS[len('ARB ~ '):].split(' + '))
+    SUC_P2 = [suc_p(Cols) for Cols in Columns2]
+
+    return Formulas2[SUC_P2.index(max(SUC_P2))]
+
+@pytest.mark.parametrize('Model', ['LGT', 'PRT'])
+def test_fit_binary_batch_equals_statsmodels(DATA, Model):
+    """
+    On a sample without separation, the batched Newton fits and their scores are those of statsmodels' Logit and Probit
+    with the success of the article: parameters, linear predictor and success of every candidate.
+    """
+
+    sm = pytest.importorskip('statsmodels.api')
+
+    X, y = Code3.design_matrix(Code3.sample_data(DATA, 'GBR', 'F'))
+    Formulas1, Columns1 = Code3.main_candidates()
+    Formulas2, Columns2 = Code3.interaction_candidates('ARB ~ DIL + IDX + CAP + ', ['DIL', 'IDX', 'CAP'])
+    Candidates = Columns1[::5] + Columns2[::101]
+
+    FITS = Code3.fit_binary_batch(X, y, Model, Candidates)
+    SCORE = Code3.score_batch(FITS['linear'], y)
+
+    for m, Cols in enumerate(Candidates):
+
+        res = (sm.Logit if Model == 'LGT' else sm.Probit)(y, X[:, Cols]).fit(disp = 0, warn_convergence = False)
+
+        assert FITS['converged'][m] == res.mle_retvals['converged']
+
+        if not FITS['converged'][m]:     # Quasi-separated by a small sector: no estimates to compare.
+            continue
+
+        assert FITS['success'][m]
+        np.testing.assert_allclose(FITS['params'][m, :len(Cols)], res.params, rtol = 1e-6, atol = 1e-8)
+        np.testing.assert_allclose(FITS['linear'][m], res.fittedvalues, rtol = 1e-6, atol = 1e-8)
+        assert (SCORE['suc'][m, 0], SCORE['suc_p'][m, 0], SCORE['suc_n'][m, 0]) == pytest.approx(article_success(res.fittedvalues, y), abs = 1e-12)
+
+@pytest.mark.parametrize('Country, Model', [('GBR', 'LGT'), ('GBR', 'PRT'), ('ESP', 'LGT')])
+def test_predict_mod_selects_the_article_formula(DATA, Country, Model):
+    """
+    On samples without separation, the search selects the formula that the statsmodels search of the article selects.
+    """
+
+    data = Code3.sample_data(DATA, Country, 'F')
+
+    assert Code3.predict_mod(data, Model)[0] == article_search(*Code3.design_matrix(data), Model)
+
+@pytest.mark.parametrize('Country, Sample, Model', [('ESP', '1', 'PRT'), ('NOR', '2', 'LGT'), ('NOR', '3', 'PRT'), ('GRC', '3', 'PRT')])
+def test_warm_starts_select_the_same_model(DATA, Country, Sample, Model):
+    """
+    Under the legacy policy the warm starts select the model of the search without them, with the same successes,
+    on small samples where singular or quasi-separated candidates tie at the highest success.
+    """
+
+    data = Code3.sample_data(DATA, Country, Sample)
+
+    COLD = Code3.predict_mod(data, Model, policy = 'legacy')
+    WARM = Code3.predict_mod(data, Model, policy = 'legacy', warm = True)
+
+    assert WARM[0] == COLD[0]
+    assert WARM[2:] == COLD[2:]
+    assert WARM[1] == pytest.approx(COLD[1], abs = 1e-8)
+
+def test_candidates_drop_their_own_missing_rows(DATA):
+    """
+    With missing values in some columns, every candidate is scored on the rows where its own columns are present,
+    as the formula fitted by statsmodels (through patsy) on the sample.
+    """
+
+    smf = pytest.importorskip('statsmodels.formula.api')
+
+    data = Code3.sample_data(DATA, 'NOR', 'F')
+    data.loc[data.index[::7], 'CAP'] = np.nan
+    data.loc[data.index[3::11], 'GEN'] = np.nan
+
+    X, y = Code3.design_matrix(data)
+    Formulas, Columns = Code3.main_candidates()
+    SCORES = Code3.score_candidates(X, y, 'LGT', Columns[:40])
+
+    for Formula, SCORE in zip(Formulas[:40], SCORES):
+
+        res = smf.logit(Formula, data).fit(disp = 0)
+        ARB = data.loc[res.fittedvalues.index, 'ARB']
+
+        assert SCORE[1:] == pytest.approx(Code3.success(res.fittedvalues.to_numpy(), ARB), abs = 1e-12)
+
+def test_separated_fits_succeed_by_rank(DATA):
+    """
+    A separated fit (whose linear predictor classifies every row) succeeds if and only if its columns are linearly independent,
+    so that the first of the candidates tied at a perfect success with independent columns is selected (the search of
+    the article selected 'ARB ~ DIL + IDX + CAP + ACQ + REF + DIL * CYC + DIL * GOV', whose columns are dependent here).
+    """
+
+    data = Code3.sample_data(DATA, 'NOR', '1')
+    X, y = Code3.design_matrix(data)
+
+    Formulas, Columns = Code3.main_candidates()
+    FormulaS, TermsS = Code3.best_main(Formulas, Code3.score_candidates(X, y, 'PRT', Columns))
+    Formulas, Columns = Code3.interaction_candidates(FormulaS, TermsS)
+
+    FITS = Code3.fit_binary_batch(X, y, 'PRT', Columns)
+    separated = ((FITS['linear'] > 0) == (y == 1)).all(axis = 1)
+    rank = np.array([np.linalg.matrix_rank(X[:, Cols]) == len(Cols) for Cols in Columns])
+
+    assert separated.sum() > 0
+    assert (FITS['success'][separated] == rank[separated]).all()
+    assert Code3.predict_mod(data, 'PRT')[0] == 'ARB ~ DIL + IDX + CAP + ACQ + REF + DIL * CYC + DIL * IND'
+
+def test_dependent_columns_are_pruned_by_rank(DATA):
+    """
+    A candidate whose columns are dependent without being zero or pairwise proportional (the last one the sum of two
+    others) is found by its rank: fitted on its independent columns with policy 'reduce', scored 0 with 'fail'.
+    """
+
+    X, y = Code3.design_matrix(Code3.sample_data(DATA, 'GBR', 'F'))
+    X = np.column_stack([X, X[:, 1] + 2 * X[:, 3]])
+    Cols = [0, 1, 3, X.shape[1] - 1]
+    Alias = Code3.column_aliases(X)
+
+    assert (Alias[Cols] == Cols).all()
+    assert Code3.effective_columns(X, Alias, Cols, 'legacy') == (Cols, True)
+    assert Code3.effective_columns(X, Alias, Cols, 'fail') == (None, False)
+
+    Effective, _ = Code3.effective_columns(X, Alias, Cols, 'reduce')
+
+    assert len(Effective) == 3 and np.linalg.matrix_rank(X[:, Effective]) == 3
+    assert Code3.score_candidates(X, y, 'LGT', [Cols], policy = 'reduce') == Code3.score_candidates(X, y, 'LGT', [Effective])
+    assert Code3.score_candidates(X, y, 'LGT', [Cols], policy = 'fail') == [(0, 0, 0, 0)]
+
+def test_cv_scores_leave_out_the_unscored_candidates(DATA):
+    """
+    With the held-out arbitrages all equal the candidates are not scored (NaN, not a success of 0), and the selection
+    skips the candidates that are not scored.
+    """
+
+    X, y = Code3.design_matrix(Code3.sample_data(DATA, 'NOR', 'F'))
+    Formulas, Columns = Code3.main_candidates()
+
+    test = np.flatnonzero(y == 1)[:5]
+    train = np.setdiff1d(np.arange(len(y)), test)
+
+    SCORES = Code3.cv_scores(X, y, 'LGT', Columns[:3], [(train, test)])
+
+    assert np.isnan(SCORES).all()
+
+    SCORES = [(0.1, 0.5, np.nan, 0.5), (0.1, 0.5, 0.2, 0.5), (0.1, 0.5, 0.4, 0.5), (0.1, 0.5, 0.4, 0.5)]
+
+    assert Code3.best_model(Formulas[:4], SCORES)[0] == Formulas[2]
+
+#################### END OF THE TESTS ####################
@@ -0,0 +1,55 @@
+# ======================================================================================================================================================
+
+# Tests of the data store (Verdu_Carchano_Ruiz_2025_Store.py).
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import numpy as np                      # Allows to work with Series.
+import pandas as pd						# Allows to organize the Data.
+
+from Verdu_Carchano_Ruiz_2025_Synthetic import write_data
+from Verdu_Carchano_Ruiz_2025_Store import load_data, prefix_hash
+
+#################### START OF THE TESTS ####################
+
+def test_load_data_keeps_many_categories(tmp_path):
+    """
+    A column with more categories than int16 codes can keep is opened with its own values.
+    """
+
+    path = str(tmp_path / 'data.csv')
+    write_data(path, 40000, seed = 0)
+
+    RAW = pd.read_csv(path, delimiter = ';').assign(Country = [f'C{i:05d}' for i in range(40000)])
+    RAW.to_csv(path, sep = ';', index = False)
+
+    DATA = load_data(path)
+
+    assert (DATA['Country'].astype(str).to_numpy() == RAW['Country'].to_numpy()).all()
+    assert (DATA['Region'].astype(str).to_numpy() == RAW['Region'].to_numpy()).all()
+
+def test_prefix_hash_ignores_the_types_of_appended_rows(tmp_path):
+    """
+    The hash of the offerings already ingested does not change when the appended rows promote the types of the cache
+    (int8 to float, float32 to float64) or add categories, and it changes when one of those offerings changes.
+    """
+
+    path = str(tmp_path / 'data.csv')
+    write_data(path, 500, seed = 0)
+
+    RAW = pd.read_csv(path, delimiter = ';')
+    NEW = RAW.iloc[:3].assign(GEN = 0.5, CAP = np.pi, Country = 'XYZ')
+
+    pd.concat([RAW, NEW]).to_csv(str(tmp_path / 'appended.csv'), sep = ';', index = False)
+    RAW.assign(ISC = RAW['ISC'].where(RAW.index != 7, 99.0)).to_csv(str(tmp_path / 'changed.csv'), sep = ';', index = False)
+
+    DATA = load_data(path)
+    APPENDED = load_data(str(tmp_path / 'appended.csv'))
+
+    assert APPENDED['GEN'].dtype != DATA['GEN'].dtype
+    assert prefix_hash(APPENDED, len(RAW)) == prefix_hash(DATA, len(RAW))
+    assert prefix_hash(load_data(str(tmp_path / 'changed.csv')), len(RAW)) != prefix_hash(DATA, len(RAW))
+
+#################### END OF THE TESTS ####################
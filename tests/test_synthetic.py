@@ -0,0 +1,28 @@
+# ======================================================================================================================================================
+
+# Tests of the synthetic data (Verdu_Carchano_Ruiz_2025_Synthetic.py).
+
+# ======================================================================================================================================================
+
+#################### LIBRARIES TO USE ####################
+
+import pandas as pd						# Allows to organize the Data.
+
+from Verdu_Carchano_Ruiz_2025_Synthetic import write_data
+
+#################### START OF THE TESTS ####################
+
+def test_write_data_is_chronological_across_chunks(tmp_path):
+    """
+    A file written in several chunks has its offerings in chronological order, with the periods in the shares of the whole file.
+    """
+
+    path = str(tmp_path / 'data.csv')
+    write_data(path, 1000, seed = 0, chunk = 300)
+
+    PER = pd.read_csv(path, delimiter = ';')['PER']
+
+    assert PER.is_monotonic_increasing
+    assert PER.value_counts().sort_index().tolist() == [300, 300, 400]
+
+#################### END OF THE TESTS ####################